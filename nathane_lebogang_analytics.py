@@ -0,0 +1,250 @@
+"""
+Vectorised grade analytics with NumPy.
+
+Sections B to F work out averages, highest and lowest grades one student at a
+time in Python loops. This module turns any of their data structures into a
+students x subjects matrix once, and then computes every statistic with a
+handful of NumPy calls. Missing grades are stored as NaN and ignored by all
+calculations, so students without a grade for a subject do not drag the
+statistics down.
+
+Supported inputs:
+    matrix_from_gradebook() - Section E or F Gradebook (including ColumnarGradebook)
+    matrix_from_tuples()    - Section B list of (name, [grades]) tuples
+    matrix_from_dict()      - Section C/D {name: {subject: grade}} dictionary
+
+Requires NumPy (pip install numpy).
+"""
+
+import sys
+import time
+import warnings
+
+import numpy as np
+
+from nathane_lebogang_columnar import GRADE_DECIMALS
+
+DEFAULT_PERCENTILES = (25, 50, 75)
+
+
+class GradeMatrix:
+    """
+    Grades for a whole class in one 2D array.
+
+    Attributes:
+        names (list): Student names, one per row
+        subjects (list): Subject names, one per column
+        values (numpy.ndarray): float64 array of shape (students, subjects), NaN = no grade
+    """
+
+    def __init__(self, names, subjects, values):
+        self.names = names
+        self.subjects = subjects
+        self.values = values
+
+    def __len__(self):
+        return len(self.names)
+
+
+def matrix_from_gradebook(gradebook):
+    """
+    Build a grade matrix from a Section E or Section F Gradebook.
+
+    A ColumnarGradebook is read straight from its arrays without creating
+    any Student objects.
+
+    Args:
+        gradebook (Gradebook): The gradebook to read
+
+    Returns:
+        GradeMatrix: The class grades
+    """
+    columns = getattr(gradebook, "columns", None)
+    if columns is not None:
+        return _matrix_from_columns(columns)
+
+    subjects = list(gradebook.subject_stats)
+    students = list(gradebook.students.values())
+    values = np.empty((len(students), len(subjects)), dtype=np.float64)
+
+    for position, subject in enumerate(subjects):
+        values[:, position] = np.fromiter(
+            (student.grades.get(subject, np.nan) for student in students),
+            dtype=np.float64, count=len(students))
+
+    return GradeMatrix([student.name for student in students], subjects, values)
+
+
+def _matrix_from_columns(columns):
+    """
+    Build a grade matrix directly from ColumnarGradebook columns.
+    Rows are put back into the order the students were added.
+    """
+    order = np.fromiter(columns.index.values(), dtype=np.intp, count=len(columns.index))
+    values = np.empty((len(order), len(columns.subjects)), dtype=np.float64)
+
+    for position, subject in enumerate(columns.subjects):
+        grades = np.frombuffer(columns.values[subject], dtype=np.float32)[order].astype(np.float64)
+        present = np.frombuffer(columns.present[subject], dtype=np.uint8)
+        np.round(grades, GRADE_DECIMALS, out=grades)  # Read back like float32_to_grade(), whole column at once
+        values[:, position] = np.where(present[order] == 1, grades, np.nan)
+
+    return GradeMatrix(list(columns.index), list(columns.subjects), values)
+
+
+def matrix_from_tuples(students, subjects):
+    """
+    Build a grade matrix from the Section B structure.
+
+    Args:
+        students (list): List of (name, [grades]) tuples, grades in subject order
+        subjects (list): The subject names
+
+    Returns:
+        GradeMatrix: The class grades
+    """
+    names = [name for name, grades in students]
+    values = np.array([grades for name, grades in students], dtype=np.float64)
+    values = values.reshape(len(names), len(subjects))
+    return GradeMatrix(names, list(subjects), values)
+
+
+def matrix_from_dict(students_dict, subjects):
+    """
+    Build a grade matrix from the Section C/D structure.
+
+    Args:
+        students_dict (dict): {name: {subject: grade}}
+        subjects (list): The subject names
+
+    Returns:
+        GradeMatrix: The class grades
+    """
+    names = list(students_dict)
+    values = np.empty((len(names), len(subjects)), dtype=np.float64)
+
+    for position, subject in enumerate(subjects):
+        values[:, position] = np.fromiter(
+            (students_dict[name].get(subject, np.nan) for name in names),
+            dtype=np.float64, count=len(names))
+
+    return GradeMatrix(names, list(subjects), values)
+
+
+def _as_number(value):
+    """
+    Convert a NumPy result to a plain float, or None when it is NaN.
+    """
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def summarise(matrix, percentiles=DEFAULT_PERCENTILES):
+    """
+    Compute every class statistic in one go.
+
+    Args:
+        matrix (GradeMatrix): The class grades
+        percentiles (tuple): Which percentiles to report for each subject
+
+    Returns:
+        dict: {
+            "student_averages": numpy array, one average per row (NaN = no grades),
+            "subjects": {subject: {count, average, highest, lowest, std_dev, percentiles}},
+            "class_average": average of every grade (0 if there are none),
+            "grade_count": number of grades,
+        }
+    """
+    values = matrix.values
+    present = ~np.isnan(values)
+    counts = present.sum(axis=0)
+
+    # All-NaN rows and columns are expected (students or subjects without grades)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        student_averages = np.nanmean(values, axis=1)
+        means = np.nanmean(values, axis=0)
+        highest = np.nanmax(values, axis=0) if len(matrix) else np.full(len(matrix.subjects), np.nan)
+        lowest = np.nanmin(values, axis=0) if len(matrix) else np.full(len(matrix.subjects), np.nan)
+        spreads = np.nanstd(values, axis=0)
+        if len(matrix) and percentiles:
+            cut_points = np.nanpercentile(values, percentiles, axis=0)
+        else:
+            cut_points = np.full((len(percentiles), len(matrix.subjects)), np.nan)
+
+    subject_summaries = {}
+    for position, subject in enumerate(matrix.subjects):
+        subject_summaries[subject] = {
+            "count": int(counts[position]),
+            "average": _as_number(means[position]),
+            "highest": _as_number(highest[position]),
+            "lowest": _as_number(lowest[position]),
+            "std_dev": _as_number(spreads[position]),
+            "percentiles": {percent: _as_number(cut_points[row, position])
+                            for row, percent in enumerate(percentiles)},
+        }
+
+    grade_count = int(counts.sum())
+    class_average = float(np.nansum(values) / grade_count) if grade_count else 0
+
+    return {
+        "student_averages": student_averages,
+        "subjects": subject_summaries,
+        "class_average": class_average,
+        "grade_count": grade_count,
+    }
+
+
+def summarise_gradebook(gradebook, percentiles=DEFAULT_PERCENTILES):
+    """
+    Shortcut for summarise(matrix_from_gradebook(gradebook)).
+
+    Args:
+        gradebook (Gradebook): A Section E or F gradebook
+        percentiles (tuple): Which percentiles to report for each subject
+
+    Returns:
+        dict: See summarise()
+    """
+    return summarise(matrix_from_gradebook(gradebook), percentiles)
+
+
+def print_summary(matrix, summary):
+    """
+    Print a summary the same way the other sections print their statistics.
+
+    Args:
+        matrix (GradeMatrix): The class grades
+        summary (dict): The result of summarise()
+    """
+    print("\nSUBJECT STATISTICS")
+    for subject, stats in summary["subjects"].items():
+        if not stats["count"]:
+            print(f"{subject}: No grades yet")
+            continue
+        cut_points = ", ".join(f"P{percent} = {value:.1f}"
+                               for percent, value in stats["percentiles"].items())
+        print(f"{subject}: Average = {stats['average']:.1f}, Highest = {stats['highest']}, "
+              f"Lowest = {stats['lowest']}, Std Dev = {stats['std_dev']:.1f}, {cut_points}")
+
+    print("\nCLASS OVERVIEW")
+    print(f"Students: {len(matrix)}")
+    print(f"Grades: {summary['grade_count']}")
+    print(f"Average Grade: {summary['class_average']:.1f}")
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    subjects = ["Math", "English", "Science"]
+    generator = np.random.default_rng(42)
+
+    grades = generator.integers(0, 101, size=(size, len(subjects))).astype(np.float64)
+    grades[generator.random(grades.shape) < 0.05] = np.nan  # Some missing grades
+    demo = GradeMatrix([f"Student {row}" for row in range(size)], subjects, grades)
+
+    start = time.perf_counter()
+    result = summarise(demo)
+    elapsed = time.perf_counter() - start
+
+    print_summary(demo, result)
+    print(f"\nSummarised {size} students in {elapsed:.3f} seconds")
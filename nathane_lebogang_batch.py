@@ -0,0 +1,408 @@
+"""
+Batch command mode for the Section F Gradebook.
+
+main() in Section F asks for one menu choice at a time with input(). This
+module runs the same operations from a script file or from standard input,
+one command per line, so thousands of changes can be applied without
+anyone typing them:
+
+    # Lines starting with # are comments
+    add John Smith
+    grade John Smith Math 85
+    grade "John Smith" English 78.5
+    remove David
+    show John Smith
+    list
+    search jo
+    prefix jo
+    sort avg [LIMIT]
+    sort subject Math [LIMIT]
+    sort name
+    stats Math
+    average
+    rank John Smith [Math]
+    subject add History
+    subject retire Science
+    subject list
+
+Names may contain spaces and may be put in double quotes. Output is written
+in large blocks instead of line by line. With json_lines=True every command
+produces one JSON object instead of text:
+
+    {"line": 2, "command": "grade", "ok": true, "result": null, "messages": []}
+
+Usage:
+    python nathane_lebogang_batch.py [SCRIPT] [--json] [--stop-on-error] [--data DIRECTORY | --db FILE]
+    python nathane_lebogang_section_F.py --batch [SCRIPT] [--json] ...
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shlex
+import sys
+import time
+
+from nathane_lebogang_bulk_io import parse_grade
+from nathane_lebogang_section_F import Gradebook, InvalidGradeError
+
+FLUSH_EVERY = 1000  # Commands between writes to the output
+
+USAGE = {
+    "add": "add NAME",
+    "remove": "remove NAME",
+    "grade": "grade NAME SUBJECT GRADE",
+    "show": "show NAME",
+    "list": "list",
+    "search": "search TEXT",
+    "prefix": "prefix TEXT",
+    "sort": "sort avg|name|subject SUBJECT [LIMIT]",
+    "stats": "stats SUBJECT",
+    "average": "average",
+    "rank": "rank NAME [SUBJECT]",
+    "subject": "subject add|retire SUBJECT, or subject list",
+}
+
+
+class BatchUsageError(Exception):
+    """Raised when a command is unknown or has the wrong arguments"""
+    pass
+
+
+class BatchReport:
+    """
+    What happened during a batch run.
+
+    Attributes:
+        commands (int): Commands run (comments and blank lines not counted)
+        failed (int): Commands that did not succeed
+        seconds (float): How long the run took
+    """
+
+    def __init__(self):
+        self.commands = 0
+        self.failed = 0
+        self.seconds = 0.0
+
+    @property
+    def commands_per_second(self):
+        """
+        Returns:
+            float: Throughput of the run
+        """
+        if self.seconds == 0:
+            return 0.0
+        return self.commands / self.seconds
+
+    def summary(self):
+        """
+        Returns:
+            dict: Every counter in one dictionary
+        """
+        return {
+            "commands": self.commands,
+            "failed": self.failed,
+            "seconds": self.seconds,
+            "commands_per_second": self.commands_per_second,
+        }
+
+
+def split_words(line):
+    """
+    Split a command line into words. Double quotes keep spaces inside one word;
+    apostrophes are left alone because they appear in names (O'Brien).
+    """
+    if '"' not in line:
+        return line.split()  # Much faster than shlex, and most lines have no quotes
+    lexer = shlex.shlex(line, posix=True)
+    lexer.whitespace_split = True
+    lexer.quotes = '"'
+    return list(lexer)
+
+
+def _split_limit(arguments):
+    """
+    Take an optional number off the end of the arguments.
+    Returns (remaining arguments, limit or None).
+    """
+    if arguments and arguments[-1].isdigit():
+        return arguments[:-1], int(arguments[-1])
+    return arguments, None
+
+
+def _name(arguments, command):
+    """
+    Join the arguments back into one student name.
+    """
+    if not arguments:
+        raise BatchUsageError(f"Usage: {USAGE[command]}")
+    return " ".join(arguments)
+
+
+class BatchRunner:
+    """
+    Runs batch commands against a Gradebook.
+
+    Attributes:
+        gradebook (Gradebook): The gradebook the commands change
+        output (file): Where results are written
+        json_lines (bool): Write one JSON object per command instead of text
+        stop_on_error (bool): Stop at the first command that fails
+    """
+
+    def __init__(self, gradebook=None, output=None, json_lines=False, stop_on_error=False,
+                 flush_every=FLUSH_EVERY):
+        self.gradebook = gradebook if gradebook is not None else Gradebook()
+        self.output = output if output is not None else sys.stdout
+        self.json_lines = json_lines
+        self.stop_on_error = stop_on_error
+        self.flush_every = flush_every
+        self._buffer = io.StringIO()  # Everything the gradebook prints goes here first
+        self._pending = []  # JSON lines not written yet
+
+    def run(self, lines):
+        """
+        Run every command in lines.
+
+        Args:
+            lines (iterable): Command lines (a file, a list of strings, ...)
+
+        Returns:
+            BatchReport: How many commands ran and failed
+        """
+        report = BatchReport()
+        start = time.perf_counter()
+
+        try:
+            with contextlib.redirect_stdout(self._buffer):
+                for line_number, line in enumerate(lines, 1):
+                    line = line.strip()
+                    if not line or line.startswith("#"):
+                        continue
+
+                    report.commands += 1
+                    ok = self.run_command(line, line_number)
+                    if not ok:
+                        report.failed += 1
+                        if self.stop_on_error:
+                            break
+                    if report.commands % self.flush_every == 0:
+                        self.flush()
+        finally:
+            self.flush()
+            report.seconds = time.perf_counter() - start
+
+        return report
+
+    def run_command(self, line, line_number=0):
+        """
+        Run one command line. Output is buffered until flush() is called.
+
+        Returns:
+            bool: True if the command succeeded
+        """
+        command = line.split(None, 1)[0].lower()
+        error = None
+        result = None
+        try:
+            words = split_words(line)
+            handler = getattr(self, f"_command_{command}", None)
+            if handler is None:
+                raise BatchUsageError(f"Unknown command '{command}'")
+            ok, result = handler(words[1:])
+        except (BatchUsageError, InvalidGradeError, ValueError) as problem:
+            ok = False
+            error = str(problem)
+            if not self.json_lines:
+                print(f"Error on line {line_number}: {problem}")
+
+        if self.json_lines:
+            messages = self._buffer.getvalue().splitlines()
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            entry = {"line": line_number, "command": command, "ok": ok, "result": result,
+                     "messages": messages}
+            if error is not None:
+                entry["error"] = error
+            self._pending.append(json.dumps(entry))
+
+        return ok
+
+    def flush(self):
+        """
+        Write the buffered output.
+        """
+        if self._pending:
+            self.output.write("\n".join(self._pending) + "\n")
+            self._pending = []
+        text = self._buffer.getvalue()
+        if text:
+            self.output.write(text)
+            self._buffer.seek(0)
+            self._buffer.truncate()
+        self.output.flush()
+
+    # Every command returns (ok, result); result is only used for JSON lines
+
+    def _command_add(self, arguments):
+        return self.gradebook.add_student(_name(arguments, "add")), None
+
+    def _command_remove(self, arguments):
+        return self.gradebook.remove_student(_name(arguments, "remove")), None
+
+    def _command_grade(self, arguments):
+        if len(arguments) < 3:
+            raise BatchUsageError(f"Usage: {USAGE['grade']}")
+        name = " ".join(arguments[:-2])
+        subject = arguments[-2]
+        grade = parse_grade(arguments[-1])
+        ok = self.gradebook.update_student_grade(name, subject, grade)
+        if ok and not self.json_lines:
+            print(f"Grade updated: {name} {subject} {grade}")
+        return ok, None
+
+    def _command_show(self, arguments):
+        student = self.gradebook.search_student(_name(arguments, "show"))
+        if not student:
+            return False, None
+        if not self.json_lines:
+            student.print_details()
+        average = student.calculate_average() if student.has_grades() else None
+        return True, {"name": student.name, "grades": dict(student.grades), "average": average}
+
+    def _command_list(self, arguments):
+        if self.json_lines:
+            return True, [{"name": student.name, "grades": dict(student.grades)}
+                          for student in self.gradebook.students.values()]
+        self.gradebook.view_all_students()
+        return True, None
+
+    def _command_search(self, arguments):
+        found = self.gradebook.search_students_by_name(_name(arguments, "search"))
+        if not self.json_lines:
+            print(f"Found {len(found)} student(s): {', '.join(student.name for student in found)}")
+        return True, [student.name for student in found]
+
+    def _command_prefix(self, arguments):
+        found = self.gradebook.search_students_by_prefix(_name(arguments, "prefix"))
+        if not self.json_lines:
+            print(f"Found {len(found)} student(s): {', '.join(student.name for student in found)}")
+        return True, [student.name for student in found]
+
+    def _command_sort(self, arguments):
+        arguments, limit = _split_limit(arguments)
+        if not arguments:
+            raise BatchUsageError(f"Usage: {USAGE['sort']}")
+
+        kind = arguments[0].lower()
+        if kind in ("avg", "average"):
+            if not self.json_lines:
+                self.gradebook.sort_by_average(limit)
+                return True, None
+            ranked = self.gradebook.bubble_sort_students_by_average(limit)
+            return True, [{"name": student.name, "average": average} for average, student in ranked]
+
+        if kind == "name":
+            if not self.json_lines:
+                self.gradebook.sort_students_by_name()
+                return True, None
+            with contextlib.redirect_stdout(io.StringIO()):  # Only the result is wanted
+                ranked = self.gradebook.sort_students_by_name()
+            return True, [student.name for student in ranked]
+
+        subject = arguments[1] if kind == "subject" and len(arguments) > 1 else arguments[0]
+        if not self.gradebook.subjects.known(subject):
+            raise BatchUsageError(f"Usage: {USAGE['sort']}")
+        if not self.json_lines:
+            self.gradebook.sort_by_subject(subject, limit)
+            return True, None
+        ranked = self.gradebook.insertion_sort_students_by_subject(subject, limit)
+        return True, [{"name": student.name, "grade": grade} for grade, student in ranked]
+
+    def _command_stats(self, arguments):
+        if len(arguments) != 1:
+            raise BatchUsageError(f"Usage: {USAGE['stats']}")
+        if not self.json_lines:
+            self.gradebook.view_subject_grades(arguments[0])
+            return self.gradebook.subjects.known(arguments[0]), None
+        stats = self.gradebook.get_subject_statistics(arguments[0])
+        return stats is not None, stats
+
+    def _command_average(self, arguments):
+        average = self.gradebook.get_class_average()
+        if not self.json_lines:
+            print(f"Class average: {average:.1f}")
+        return True, average
+
+    def _command_rank(self, arguments):
+        subject = None
+        if len(arguments) > 1 and self.gradebook.subjects.known(arguments[-1]):
+            subject = arguments[-1]
+            arguments = arguments[:-1]
+        name = _name(arguments, "rank")
+
+        rank = self.gradebook.rank_of(name, subject)
+        if rank is None:
+            return False, None
+        percentile = self.gradebook.percentile_of(name, subject)
+        if not self.json_lines:
+            print(f"{name}: rank {rank} by {subject or 'average'} (percentile {percentile:.1f})")
+        return True, {"rank": rank, "percentile": percentile}
+
+    def _command_subject(self, arguments):
+        action = arguments[0] if arguments else None
+        if action == "list" and len(arguments) == 1:
+            if not self.json_lines:
+                print("Subjects:", ", ".join(self.gradebook.subjects))
+            return True, list(self.gradebook.subjects)
+        if action == "add":
+            return self.gradebook.add_subject(_name(arguments[1:], "subject")), None
+        if action == "retire":
+            return self.gradebook.retire_subject(_name(arguments[1:], "subject")), None
+        raise BatchUsageError(f"Usage: {USAGE['subject']}")
+
+
+def main(arguments=None):
+    """
+    Run a batch script from the command line.
+
+    Returns:
+        int: 0 if every command succeeded, 1 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Run gradebook commands from a file or stdin.")
+    parser.add_argument("script", nargs="?", help="command file (default: read standard input)")
+    parser.add_argument("--json", action="store_true", help="write one JSON object per command")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop at the first failed command")
+    parser.add_argument("--data", help="keep the gradebook in this directory (PersistentGradebook)")
+    parser.add_argument("--db", help="keep the gradebook in this SQLite file (SQLiteGradebook)")
+    options = parser.parse_args(arguments)
+
+    if options.data:
+        from nathane_lebogang_persistence import PersistentGradebook
+        gradebook = PersistentGradebook(options.data)
+    elif options.db:
+        from nathane_lebogang_sqlite import SQLiteGradebook
+        gradebook = SQLiteGradebook(options.db)
+    else:
+        gradebook = Gradebook()
+
+    runner = BatchRunner(gradebook, json_lines=options.json, stop_on_error=options.stop_on_error)
+    try:
+        if options.script:
+            with open(options.script, "r", encoding="utf-8") as script:
+                report = runner.run(script)
+        else:
+            report = runner.run(sys.stdin)
+    finally:
+        if options.data or options.db:
+            gradebook.close()
+
+    print(f"{report.commands} commands, {report.failed} failed, "
+          f"{report.seconds:.2f} s ({report.commands_per_second:,.0f} commands/sec)",
+          file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
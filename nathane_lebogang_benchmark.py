@@ -0,0 +1,519 @@
+"""
+Benchmark suite for the Section E and Section F gradebooks.
+
+The unit tests only check three students. This module builds synthetic
+rosters of any size (1,000 up to 10,000,000 students), runs the same set of
+measurements against each Gradebook and reports, for every operation, how
+long it took, how many operations per second that is and the peak extra
+memory it needed.
+
+Measurements:
+    add                      - add every student
+    grade                    - give every student a grade for every subject
+    search_student           - look up students by exact name
+    search_students_by_name  - partial name search (Section F only)
+    sort methods             - every sort the section offers
+    view_subject_grades      - print one subject with its statistics
+    get_subject_statistics   - statistics for one subject (Section F only)
+    get_class_average        - average of every grade
+    update                   - change existing grades
+    remove                   - remove students
+
+Results are written as JSON and can be compared with an earlier run saved as
+a baseline. Any operation that got slower (or needs more memory) by more than
+the tolerance is reported as a regression and the program exits with status 1.
+
+Usage:
+    python nathane_lebogang_benchmark.py [--sizes 1000,10000,100000] [--sections E,F]
+        [--output results.json] [--baseline baseline.json] [--tolerance 0.25]
+        [--repeat 3] [--no-memory]
+
+Memory profiling uses tracemalloc and runs every measurement a second time,
+which is slow for millions of students; use --no-memory for the largest sizes.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import nathane_lebogang_section_E as section_E
+import nathane_lebogang_section_F as section_F
+
+RESULTS_FORMAT = "nathane-lebogang-benchmark"
+RESULTS_VERSION = 1
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_SECTIONS = ("E", "F")
+DEFAULT_SEED = 42
+DEFAULT_TOLERANCE = 0.25  # 25% slower than the baseline counts as a regression
+DEFAULT_REPEAT = 3
+
+# Differences smaller than these are timer or allocator noise, never regressions
+MIN_SECONDS_DIFFERENCE = 0.005
+MIN_BYTES_DIFFERENCE = 64 * 1024
+
+MAX_LOOKUPS = 10000  # search_student calls per measurement
+MAX_CHANGES = 100000  # update and remove calls per measurement
+NAME_SEARCHES = 100  # search_students_by_name calls per measurement
+CLASS_AVERAGE_CALLS = 1000
+
+FIRST_NAMES = ["Thabo", "Lerato", "Sipho", "Naledi", "Kagiso", "Palesa", "Lebogang",
+               "Nathane", "Ayanda", "Zanele", "John", "Sarah", "David", "Mary"]
+
+
+def _code(number):
+    """
+    Turn a number into capitalised letters so every name is different
+    (student names cannot contain digits).
+    """
+    letters = ""
+    while True:
+        number, remainder = divmod(number, 26)
+        letters = chr(ord("a") + remainder) + letters
+        if number == 0:
+            return letters.capitalize()
+
+
+def make_names(num_students, seed=DEFAULT_SEED):
+    """
+    Create unique synthetic student names such as "Naledi Bce".
+
+    Args:
+        num_students (int): How many names to create
+        seed (int): Random seed, so every run uses the same roster
+
+    Returns:
+        list: The names
+    """
+    generator = random.Random(seed)
+    return [f"{generator.choice(FIRST_NAMES)} {_code(number)}" for number in range(num_students)]
+
+
+@contextlib.contextmanager
+def _typed_input(text):
+    """
+    Answer input() prompts with text while the block runs.
+    """
+    real_stdin = sys.stdin
+    sys.stdin = io.StringIO(text)
+    try:
+        yield
+    finally:
+        sys.stdin = real_stdin
+
+
+class Workload:
+    """
+    The roster and the random choices shared by every measurement of one size.
+
+    Attributes:
+        names (list): Every student name, in the order they are added
+        subjects (list): The subjects to grade
+        lookups (list): Names to search for
+        searches (list): Partial names for search_students_by_name
+        changes (list): (name, subject, grade) updates
+        removals (list): Names to remove
+    """
+
+    def __init__(self, num_students, seed=DEFAULT_SEED):
+        self.seed = seed
+        self.names = make_names(num_students, seed)
+        self.subjects = list(section_F.subjects)
+
+        generator = random.Random(seed + 1)
+        self.lookups = [generator.choice(self.names) for _ in range(min(num_students, MAX_LOOKUPS))]
+        self.searches = []
+        for _ in range(NAME_SEARCHES if num_students else 0):
+            name = generator.choice(self.names)
+            start = generator.randrange(max(len(name) - 3, 1))
+            self.searches.append(name[start:start + 4])
+        self.changes = [(generator.choice(self.names), generator.choice(self.subjects),
+                         generator.randint(0, 100))
+                        for _ in range(min(num_students, MAX_CHANGES))]
+        self.removals = generator.sample(self.names, min(num_students, MAX_CHANGES))
+
+    def grades(self):
+        """
+        Yield (name, subject, grade) for every student and subject.
+        The same grades come out every time for the same seed.
+        """
+        generator = random.Random(self.seed + 2)
+        for name in self.names:
+            for subject in self.subjects:
+                yield name, subject, generator.randint(0, 100)
+
+
+# Every measurement is (operation name, function(gradebook, workload) -> number of calls)
+
+def _add_students(gradebook, workload):
+    for name in workload.names:
+        gradebook.add_student(name)
+    return len(workload.names)
+
+
+def _grade_students_E(gradebook, workload):
+    count = 0
+    for name, subject, grade in workload.grades():
+        gradebook.search_student(name).add_grade(subject, grade)
+        count += 1
+    return count
+
+
+def _grade_students_F(gradebook, workload):
+    count = 0
+    for name, subject, grade in workload.grades():
+        gradebook.update_student_grade(name, subject, grade)
+        count += 1
+    return count
+
+
+def _search_student(gradebook, workload):
+    for name in workload.lookups:
+        gradebook.search_student(name)
+    return len(workload.lookups)
+
+
+def _search_by_name(gradebook, workload):
+    for term in workload.searches:
+        gradebook.search_students_by_name(term)
+    return len(workload.searches)
+
+
+def _view_subject_grades_E(gradebook, workload):
+    with _typed_input("Math\n"):
+        section_E.view_subject_grades(gradebook)
+    return 1
+
+
+def _class_average(gradebook, workload):
+    for _ in range(CLASS_AVERAGE_CALLS):
+        gradebook.get_class_average()
+    return CLASS_AVERAGE_CALLS
+
+
+def _update_E(gradebook, workload):
+    for name, subject, grade in workload.changes:
+        gradebook.search_student(name).add_grade(subject, grade)
+    return len(workload.changes)
+
+
+def _update_F(gradebook, workload):
+    for name, subject, grade in workload.changes:
+        gradebook.update_student_grade(name, subject, grade)
+    return len(workload.changes)
+
+
+def _remove_students(gradebook, workload):
+    for name in workload.removals:
+        gradebook.remove_student(name)
+    return len(workload.removals)
+
+
+def _once(method_name, *args):
+    """
+    Measurement that calls a gradebook method a single time.
+    """
+    def measure(gradebook, workload):
+        getattr(gradebook, method_name)(*args)
+        return 1
+    return measure
+
+
+SECTIONS = {
+    "E": {
+        "create": lambda: section_E.Gradebook(list(section_F.subjects)),
+        "build": [("add", _add_students), ("grade", _grade_students_E)],
+        "queries": [
+            ("search_student", _search_student),
+            ("sort_by_average", _once("sort_by_average")),
+            ("view_subject_grades", _view_subject_grades_E),
+            ("get_class_average", _class_average),
+        ],
+        "changes": [("update", _update_E), ("remove", _remove_students)],
+    },
+    "F": {
+        "create": section_F.Gradebook,
+        "build": [("add", _add_students), ("grade", _grade_students_F)],
+        "queries": [
+            ("search_student", _search_student),
+            ("search_students_by_name", _search_by_name),
+            ("bubble_sort_students_by_average", _once("bubble_sort_students_by_average")),
+            ("sort_by_average", _once("sort_by_average")),
+            ("sort_by_average_top_10", _once("sort_by_average", 10)),
+            ("insertion_sort_students_by_subject", _once("insertion_sort_students_by_subject", "Math")),
+            ("sort_by_subject", _once("sort_by_subject", "Math")),
+            ("sort_students_by_name", _once("sort_students_by_name")),
+            ("view_subject_grades", _once("view_subject_grades", "Math")),
+            ("get_subject_statistics", _once("get_subject_statistics", "Math")),
+            ("get_class_average", _class_average),
+        ],
+        "changes": [("update", _update_F), ("remove", _remove_students)],
+    },
+}
+
+
+def _time_run(measure, gradebook, workload):
+    """
+    Run one measurement and return (calls, seconds).
+    Garbage left by earlier measurements is collected first, so its clean-up is not timed here.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    calls = measure(gradebook, workload)
+    return calls, time.perf_counter() - start
+
+
+def _memory_run(measure, gradebook, workload):
+    """
+    Run one measurement with tracemalloc on and return the peak extra bytes it used.
+    """
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    measure(gradebook, workload)
+    return tracemalloc.get_traced_memory()[1] - before
+
+
+def _run_pass(section, workload, run, repeat):
+    """
+    Run every measurement of a section, keeping the best of repeat tries each.
+
+    run is _time_run or _memory_run. Queries do not change the gradebook, so
+    they are repeated on the first gradebook. Building and changing it can
+    only be done once per gradebook, so those steps are repeated on a fresh
+    gradebook each time; a single run of them is too noisy to compare.
+
+    Returns:
+        dict: operation -> best result of run
+    """
+    spec = SECTIONS[section]
+    results = {}
+
+    def keep_best(operation, result):
+        if operation not in results or _best_key(result) < _best_key(results[operation]):
+            results[operation] = result
+
+    for attempt in range(max(repeat, 1)):
+        gradebook = spec["create"]()
+        for operation, measure in spec["build"]:
+            keep_best(operation, run(measure, gradebook, workload))
+        if attempt == 0:
+            for operation, measure in spec["queries"]:
+                results[operation] = min((run(measure, gradebook, workload) for _ in range(repeat)),
+                                         key=_best_key)
+        for operation, measure in spec["changes"]:
+            keep_best(operation, run(measure, gradebook, workload))
+    return results
+
+
+def _best_key(result):
+    """
+    Sort key for picking the best repeat: the shortest time or the smallest peak.
+    """
+    return result[1] if isinstance(result, tuple) else result
+
+
+def benchmark_section(section, num_students, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT,
+                      measure_memory=True, workload=None):
+    """
+    Run every measurement for one section and one roster size.
+
+    Everything the gradebook prints is thrown away while it runs.
+
+    Args:
+        section (str): "E" or "F"
+        num_students (int): Roster size
+        seed (int): Random seed for the roster
+        repeat (int): How many times to repeat each measurement (best time is kept)
+        measure_memory (bool): Also profile peak memory (runs everything a second time)
+        workload (Workload): Reuse an existing roster of the right size
+
+    Returns:
+        list: One result dictionary per operation
+    """
+    if section not in SECTIONS:
+        raise ValueError(f"Unknown section '{section}', choose from {', '.join(SECTIONS)}")
+    if workload is None:
+        workload = Workload(num_students, seed)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        timings = _run_pass(section, workload, _time_run, repeat)
+
+        peaks = {}
+        if measure_memory:
+            tracemalloc.start()
+            try:
+                peaks = _run_pass(section, workload, _memory_run, 1)
+            finally:
+                tracemalloc.stop()
+
+    results = []
+    for operation, (calls, seconds) in timings.items():
+        results.append({
+            "section": section,
+            "size": num_students,
+            "operation": operation,
+            "calls": calls,
+            "seconds": seconds,
+            "calls_per_second": calls / seconds if seconds else 0.0,
+            "peak_bytes": peaks.get(operation),
+        })
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, sections=DEFAULT_SECTIONS, seed=DEFAULT_SEED,
+                   repeat=DEFAULT_REPEAT, measure_memory=True, progress=None):
+    """
+    Run the whole suite.
+
+    Args:
+        sizes (iterable): Roster sizes to test
+        sections (iterable): Which sections to test
+        seed (int): Random seed for the rosters
+        repeat (int): How many times to repeat each measurement
+        measure_memory (bool): Also profile peak memory
+        progress (callable): Called with a message before each section and size
+
+    Returns:
+        dict: JSON-ready results with details of the machine they were measured on
+    """
+    results = []
+    for size in sizes:
+        workload = Workload(size, seed)
+        for section in sections:
+            if progress:
+                progress(f"Section {section}, {size:,} students")
+            results.extend(benchmark_section(section, size, seed, repeat, measure_memory, workload))
+
+    return {
+        "format": RESULTS_FORMAT,
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare_to_baseline(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Find operations that got slower or use more memory than in the baseline.
+
+    Only operations present in both runs are compared, and differences below
+    MIN_SECONDS_DIFFERENCE / MIN_BYTES_DIFFERENCE are ignored as noise.
+
+    Args:
+        current (dict): Results from run_benchmarks()
+        baseline (dict): Earlier results in the same format
+        tolerance (float): Allowed slowdown, 0.25 = 25%
+
+    Returns:
+        list: One message per regression (empty when there are none)
+    """
+    def key(result):
+        return result["section"], result["size"], result["operation"]
+
+    earlier = {key(result): result for result in baseline["results"]}
+    regressions = []
+
+    for result in current["results"]:
+        old = earlier.get(key(result))
+        if old is None:
+            continue
+        label = f"Section {result['section']} {result['operation']} ({result['size']:,} students)"
+
+        # Compare time per call, in case the number of calls changed
+        old_per_call = old["seconds"] / old["calls"] if old["calls"] else old["seconds"]
+        new_per_call = result["seconds"] / result["calls"] if result["calls"] else result["seconds"]
+        slower_by = (new_per_call - old_per_call) * max(result["calls"], 1)
+        if new_per_call > old_per_call * (1 + tolerance) and slower_by > MIN_SECONDS_DIFFERENCE:
+            change = f"{new_per_call / old_per_call - 1:+.0%}" if old_per_call else "baseline too fast to time"
+            regressions.append(f"{label}: {result['seconds']:.4f} s, baseline {old['seconds']:.4f} s ({change})")
+
+        if result["peak_bytes"] is not None and old.get("peak_bytes"):
+            grown_by = result["peak_bytes"] - old["peak_bytes"]
+            if (result["peak_bytes"] > old["peak_bytes"] * (1 + tolerance)
+                    and grown_by > MIN_BYTES_DIFFERENCE):
+                regressions.append(f"{label}: peak {result['peak_bytes']:,} bytes, "
+                                   f"baseline {old['peak_bytes']:,} bytes")
+
+    return regressions
+
+
+def print_results(results):
+    """
+    Print the results as a table.
+
+    Args:
+        results (dict): Results from run_benchmarks()
+    """
+    print(f"\n{'Section':<8}{'Students':>12}  {'Operation':<36}{'Seconds':>10}"
+          f"{'Calls/sec':>14}{'Peak MB':>10}")
+    for result in results["results"]:
+        peak = result["peak_bytes"]
+        peak_text = "-" if peak is None else f"{peak / 1024 / 1024:.2f}"
+        print(f"{result['section']:<8}{result['size']:>12,}  {result['operation']:<36}"
+              f"{result['seconds']:>10.4f}{result['calls_per_second']:>14,.0f}{peak_text:>10}")
+
+
+def _parse_arguments(arguments):
+    parser = argparse.ArgumentParser(description="Benchmark the Section E and F gradebooks.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated roster sizes (default: %(default)s)")
+    parser.add_argument("--sections", default=",".join(DEFAULT_SECTIONS),
+                        help="comma separated sections to test (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="repeats per measurement, the best time is kept (default: %(default)s)")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory profiling")
+    parser.add_argument("--output", help="write the JSON results to this file")
+    parser.add_argument("--baseline", help="compare with JSON results from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown before failing, 0.25 = 25%% (default: %(default)s)")
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    """
+    Run the suite from the command line.
+
+    Returns:
+        int: 0 if everything passed, 1 if a regression was found
+    """
+    options = _parse_arguments(arguments)
+    sizes = [int(size) for size in options.sizes.split(",") if size.strip()]
+    sections = [section.strip().upper() for section in options.sections.split(",") if section.strip()]
+
+    results = run_benchmarks(sizes, sections, options.seed, options.repeat,
+                             not options.no_memory, progress=print)
+    print_results(results)
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults written to {options.output}")
+
+    if options.baseline:
+        with open(options.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_to_baseline(results, baseline, options.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} REGRESSION(S) AGAINST {options.baseline}")
+            for message in regressions:
+                print(f"  REGRESSION: {message}")
+            return 1
+        print(f"\nNo regressions against {options.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
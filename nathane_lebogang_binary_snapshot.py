@@ -0,0 +1,477 @@
+"""
+Compact binary gradebook files that can be queried without loading them.
+
+write_snapshot() saves a Section E/F gradebook in a fixed-width binary
+format. MappedGradebook opens such a file with mmap and answers read-only
+questions (subject statistics, ranking by average, class average) straight
+from the mapped bytes. No Student objects are created and nothing is read
+until a query needs it, so opening a file takes the same time whatever its
+size.
+
+File layout (little-endian, every section starts on an 8-byte boundary):
+
+    header          magic "NLGB", version, student count, subject count,
+                    offsets of the sections below
+    subject table   per subject: grade count, name length, UTF-8 name
+    name offsets    (students + 1) x uint64, position of each name in the name data
+    name data       every student name in UTF-8, one after the other
+    columns         per subject: students x float32 grades (0.0 when missing),
+                    then a presence bitmap with one bit per student
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+from operator import itemgetter
+
+from nathane_lebogang_columnar import float32_to_grade
+from nathane_lebogang_sort_engine import DEFAULT_STRATEGY, sort_items
+
+MAGIC = b"NLGB"
+VERSION = 1
+
+# magic, version, flags, students, subjects, name offsets, name data, columns
+HEADER = struct.Struct("<4sHHQQQQQ")
+SUBJECT_ENTRY = struct.Struct("<QH")
+
+# BIT_TABLE[byte] = the 8 presence bits of that byte, lowest bit first
+BIT_TABLE = [tuple((byte >> bit) & 1 for bit in range(8)) for byte in range(256)]
+
+
+class SnapshotFormatError(Exception):
+    """Raised when a file is not a valid binary gradebook snapshot"""
+    pass
+
+
+def _padding(size):
+    """
+    Number of zero bytes needed to reach the next 8-byte boundary.
+    """
+    return -size % 8
+
+
+def _little_endian(values):
+    """
+    Return the array's bytes in little-endian order.
+    """
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_snapshot(gradebook, path):
+    """
+    Save a gradebook in the binary snapshot format.
+
+    Args:
+        gradebook (Gradebook): A Section E or F gradebook (any backend)
+        path (str): Where to write the file
+
+    Returns:
+        int: Number of students written
+    """
+    subject_names = list(gradebook.subject_stats)
+    students = gradebook.students.values()
+
+    name_offsets = array("Q", [0])
+    encoded_names = []
+    grade_columns = {subject: array("f") for subject in subject_names}
+    bitmaps = {subject: bytearray() for subject in subject_names}
+    counts = dict.fromkeys(subject_names, 0)
+
+    position = 0
+    for row, student in enumerate(students):
+        encoded = student.name.encode("utf-8")
+        encoded_names.append(encoded)
+        position += len(encoded)
+        name_offsets.append(position)
+
+        grades = student.grades
+        if row % 8 == 0:
+            for subject in subject_names:
+                bitmaps[subject].append(0)
+        for subject in subject_names:
+            grade = grades.get(subject)
+            if grade is None:
+                grade_columns[subject].append(0.0)
+            else:
+                grade_columns[subject].append(grade)
+                bitmaps[subject][-1] |= 1 << (row % 8)
+                counts[subject] += 1
+
+    num_students = len(name_offsets) - 1
+
+    subject_table = bytearray()
+    for subject in subject_names:
+        encoded = subject.encode("utf-8")
+        subject_table += SUBJECT_ENTRY.pack(counts[subject], len(encoded)) + encoded
+    subject_table += bytes(_padding(HEADER.size + len(subject_table)))
+
+    name_offsets_start = HEADER.size + len(subject_table)
+    name_data_start = name_offsets_start + name_offsets.itemsize * len(name_offsets)
+    name_data_size = position + _padding(position)
+    columns_start = name_data_start + name_data_size
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, 0, num_students, len(subject_names),
+                               name_offsets_start, name_data_start, columns_start))
+        file.write(subject_table)
+        file.write(_little_endian(name_offsets))
+        file.write(b"".join(encoded_names))
+        file.write(bytes(_padding(position)))
+        for subject in subject_names:
+            column = _little_endian(grade_columns[subject])
+            file.write(column)
+            file.write(bytes(_padding(len(column))))
+            file.write(bitmaps[subject])
+            file.write(bytes(_padding(len(bitmaps[subject]))))
+
+    return num_students
+
+
+class MappedGradebook:
+    """
+    Read-only gradebook that works directly on a memory-mapped snapshot file.
+
+    Attributes:
+        subjects (list): The subject names stored in the file
+    """
+
+    def __init__(self, path, sort_strategy=DEFAULT_STRATEGY):
+        """
+        Open a snapshot. Only the header and the subject table are read.
+        """
+        if sys.byteorder == "big":
+            raise SnapshotFormatError("Memory-mapped snapshots need a little-endian computer")
+
+        self.sort_strategy = sort_strategy
+        self._columns = {}  # Filled in below; close() may run before that
+        self._bitmaps = {}
+        self._grades = {}  # subject -> the column read back as grades (see _grade_column)
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.close()  # mmap cannot map an empty file
+            raise SnapshotFormatError(f"{path} is empty, not a snapshot")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._map)
+        try:
+            self._read_layout(path)
+        except SnapshotFormatError:
+            self.close()  # Release the map and the file before giving up
+            raise
+
+    def _read_layout(self, path):
+        """
+        Check that every section the header points to lies inside the file,
+        then set up the zero-copy views of the names and the columns.
+
+        Raises:
+            SnapshotFormatError: If the file is not a snapshot or is cut short
+        """
+        buffer = self._buffer
+        size = len(buffer)
+        if size < HEADER.size:
+            raise SnapshotFormatError(f"{path} is too small to be a snapshot")
+        (magic, version, flags, count, num_subjects, name_offsets_start,
+         name_data_start, columns_start) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotFormatError(f"{path} is not a version {VERSION} gradebook snapshot")
+        damaged = f"{path} is cut short or damaged"
+
+        # Name offsets, name data and columns follow each other up to the end of the file
+        name_offsets_end = name_offsets_start + 8 * (count + 1)
+        column_bytes = 4 * count + _padding(4 * count)
+        bitmap_bytes = (count + 7) // 8
+        subject_bytes = column_bytes + bitmap_bytes + _padding(bitmap_bytes)
+        if not (HEADER.size <= name_offsets_start and name_offsets_end <= name_data_start <= columns_start <= size):
+            raise SnapshotFormatError(f"{damaged} (names)")
+        (names_size,) = struct.unpack_from("<Q", buffer, name_offsets_end - 8)
+        if names_size > columns_start - name_data_start:
+            raise SnapshotFormatError(f"{damaged} (name data)")
+        if columns_start + num_subjects * subject_bytes != size:
+            raise SnapshotFormatError(f"{damaged} (expected {columns_start + num_subjects * subject_bytes} "
+                                      f"bytes, found {size})")
+
+        # Subject table: every entry must end before the name offsets start
+        entries = []
+        position = HEADER.size
+        for _ in range(num_subjects):
+            if position + SUBJECT_ENTRY.size > name_offsets_start:
+                raise SnapshotFormatError(f"{damaged} (subject table)")
+            grade_count, length = SUBJECT_ENTRY.unpack_from(buffer, position)
+            position += SUBJECT_ENTRY.size
+            if position + length > name_offsets_start or grade_count > count:
+                raise SnapshotFormatError(f"{damaged} (subject table)")
+            try:
+                subject = bytes(buffer[position:position + length]).decode("utf-8")
+            except UnicodeDecodeError:
+                raise SnapshotFormatError(f"{damaged} (subject name)") from None
+            position += length
+            entries.append((subject, grade_count))
+
+        self._num_students = count
+        self._name_offsets = buffer[name_offsets_start:name_offsets_end].cast("Q")
+        self._name_data = buffer[name_data_start:columns_start]
+
+        # Zero-copy views of every grade column and presence bitmap
+        self.subjects = []
+        self._counts = {}
+        column_start = columns_start
+        for subject, grade_count in entries:
+            self.subjects.append(subject)
+            self._counts[subject] = grade_count
+            self._columns[subject] = buffer[column_start:column_start + 4 * count].cast("f")
+            bitmap_start = column_start + column_bytes
+            self._bitmaps[subject] = buffer[bitmap_start:bitmap_start + bitmap_bytes]
+            column_start += subject_bytes
+
+    def __len__(self):
+        return self._num_students
+
+    def name_of(self, row):
+        """
+        Decode one student's name.
+
+        Args:
+            row (int): The student's row
+
+        Returns:
+            str: The name
+        """
+        start = self._name_offsets[row]
+        end = self._name_offsets[row + 1]
+        return bytes(self._name_data[start:end]).decode("utf-8")
+
+    def grade(self, row, subject):
+        """
+        Read one grade.
+
+        Args:
+            row (int): The student's row
+            subject (str): The subject
+
+        Returns:
+            float: The grade, or None if the student has no grade for it
+        """
+        if not (self._bitmaps[subject][row >> 3] >> (row & 7)) & 1:
+            return None
+        return float32_to_grade(self._columns[subject][row])
+
+    def _grade_column(self, subject):
+        """
+        The subject's column read back as the grades that were entered
+        (see float32_to_grade), worked out the first time it is needed.
+        """
+        grades = self._grades.get(subject)
+        if grades is None:
+            grades = array("d", map(float32_to_grade, self._columns[subject]))
+            self._grades[subject] = grades
+        return grades
+
+    def _presence(self, subject):
+        """
+        One 0/1 value per student saying whether they have a grade for the subject.
+        """
+        bits = chain.from_iterable(BIT_TABLE[byte] for byte in self._bitmaps[subject])
+        return list(bits)[:self._num_students]
+
+    def subject_statistics(self, subject):
+        """
+        Count, average, highest and lowest grade for one subject.
+
+        Args:
+            subject (str): The subject
+
+        Returns:
+            dict: count, average, highest and lowest (None values when there are no grades)
+        """
+        count = self._counts[subject]
+        if count == 0:
+            return {"count": 0, "average": None, "highest": None, "lowest": None}
+
+        column = self._grade_column(subject)
+        if count == self._num_students:
+            present_grades = column
+        else:
+            present_grades = [grade for grade, present in zip(column, self._presence(subject))
+                              if present]
+
+        return {
+            "count": count,
+            "average": sum(column) / count,  # Missing grades are stored as 0.0
+            "highest": float32_to_grade(max(present_grades)),  # Whole grades come back as ints
+            "lowest": float32_to_grade(min(present_grades)),
+        }
+
+    def get_class_average(self):
+        """
+        Average of every grade in the file (0 if there are none).
+        """
+        total_count = sum(self._counts.values())
+        if total_count == 0:
+            return 0
+        return sum(sum(self._grade_column(subject)) for subject in self.subjects) / total_count
+
+    def view_subject_grades(self, subject):
+        """
+        Print every student's grade for a subject followed by the class statistics.
+        """
+        if subject not in self._columns:
+            print(f"Error: '{subject}' is not a valid subject")
+            return
+
+        print(f"\n{subject.upper()} GRADES")
+        for row in range(self._num_students):
+            grade = self.grade(row, subject)
+            print(f"{self.name_of(row)}: {'No grade yet' if grade is None else grade}")
+
+        stats = self.subject_statistics(subject)
+        if stats["count"]:
+            print(f"\nClass Statistics:")
+            print(f"  Average: {stats['average']:.1f}")
+            print(f"  Highest: {stats['highest']}")
+            print(f"  Lowest: {stats['lowest']}")
+            print(f"  Total Students with Grades: {stats['count']}")
+        else:
+            print("No grades available for this subject yet.")
+
+    def averages_by_row(self):
+        """
+        Work out every student's average straight from the columns.
+
+        Returns:
+            list: (average, row) for each student with at least one grade
+        """
+        count = self._num_students
+        totals = [0.0] * count
+        grade_counts = [0] * count
+
+        for subject in self.subjects:
+            # Missing grades are 0.0, so adding the whole column is safe
+            totals = list(map(float.__add__, totals, self._grade_column(subject)))
+            if self._counts[subject] == count:
+                grade_counts = [number + 1 for number in grade_counts]
+            elif self._counts[subject]:
+                grade_counts = list(map(int.__add__, grade_counts, self._presence(subject)))
+
+        return [(total / number, row)
+                for row, (total, number) in enumerate(zip(totals, grade_counts)) if number]
+
+    def bubble_sort_students_by_average(self, limit=None):
+        """
+        Rank students by average (highest first, ties in file order).
+        Named like the Gradebook method so the two can be swapped.
+
+        Returns:
+            list: (average, name) tuples
+        """
+        ranked = sort_items(self.averages_by_row(), key=itemgetter(0), descending=True,
+                            strategy=self.sort_strategy, limit=limit)
+        return [(average, self.name_of(row)) for average, row in ranked]
+
+    def sort_by_average(self, limit=None):
+        """
+        Print students sorted by their average grade (highest to lowest).
+        """
+        sorted_students = self.bubble_sort_students_by_average(limit)
+        if sorted_students:
+            print("\nSTUDENTS SORTED BY AVERAGE (Highest to Lowest)")
+            for average, name in sorted_students:
+                print(f"{name}: {average:.1f}")
+        else:
+            print("No students with grades to sort.")
+        return sorted_students
+
+    def close(self):
+        """
+        Release the memory map and close the file.
+        """
+        for view in list(self._columns.values()) + list(self._bitmaps.values()):
+            view.release()
+        self._columns = {}
+        self._bitmaps = {}
+        self._grades = {}
+        for name in ("_name_offsets", "_name_data", "_buffer"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def check_snapshot_files():
+    """
+    Write a small snapshot, check that it reads back the grades that were
+    entered, and check that every shorter copy of it is refused.
+
+    Raises:
+        AssertionError: If a grade reads back wrong or a damaged file is opened
+    """
+    import contextlib
+    import io
+    import tempfile
+
+    from nathane_lebogang_section_F import Gradebook
+
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        gradebook = Gradebook()
+        for name, math_grade, english_grade in (("Ann", 70.3, 80), ("Ben", 90.1, None), ("Cal", 55, 64.7)):
+            gradebook.add_student(name)
+            gradebook.update_student_grade(name, "Math", math_grade)
+            if english_grade is not None:
+                gradebook.update_student_grade(name, "English", english_grade)
+        path = os.path.join(directory, "grades.nlgb")
+        write_snapshot(gradebook, path)
+
+        with MappedGradebook(path) as mapped:
+            for subject in ("Math", "English"):
+                expected = gradebook.get_subject_statistics(subject)
+                stats = mapped.subject_statistics(subject)
+                for key in ("count", "highest", "lowest"):
+                    assert stats[key] == expected[key], f"{subject} {key} reads back as {stats[key]}"
+                assert round(stats["average"], 9) == round(expected["average"], 9), \
+                    f"{subject} average reads back as {stats['average']}"
+            for average, name in mapped.bubble_sort_students_by_average():
+                assert average == gradebook.students[name].calculate_average(), \
+                    f"{name}'s average reads back as {average}"
+
+        with open(path, "rb") as file:
+            data = file.read()
+        damaged = os.path.join(directory, "damaged.nlgb")
+        for size in range(len(data)):
+            with open(damaged, "wb") as file:
+                file.write(data[:size])
+            try:
+                MappedGradebook(damaged).close()
+                assert False, f"A file cut to {size} of {len(data)} bytes was opened"
+            except SnapshotFormatError:
+                pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == "--check":
+        check_snapshot_files()
+        print("Snapshot file check passed.")
+        sys.exit(0)
+    if len(sys.argv) < 2:
+        print("Usage: python nathane_lebogang_binary_snapshot.py SNAPSHOT_FILE")
+        print("       python nathane_lebogang_binary_snapshot.py --check")
+        sys.exit(1)
+
+    with MappedGradebook(sys.argv[1]) as mapped:
+        print(f"{len(mapped)} students, subjects: {', '.join(mapped.subjects)}")
+        for subject_name in mapped.subjects:
+            print(f"{subject_name}: {mapped.subject_statistics(subject_name)}")
+        print(f"Class average: {mapped.get_class_average():.1f}")
+        mapped.sort_by_average(limit=10)
@@ -0,0 +1,387 @@
+"""
+Bulk import and export of gradebooks as CSV or JSON lines.
+
+Files are read and written one row at a time, so a nightly export with
+hundreds of thousands of students never has to fit in memory as a whole.
+Every row is checked with the same rules as the interactive menu
+(validate_name / validate_grade from Section F). A bad row is never half
+applied: either all of its grades are stored or none are.
+
+Accepted CSV layouts (chosen from the header row):
+    name,Math,English,Science   - one row per student, empty cell = no grade
+    name,subject,grade          - one row per grade
+
+Accepted JSON lines (one object per line):
+    {"name": "John", "grades": {"Math": 85, "English": 78}}
+    {"name": "John", "subject": "Math", "grade": 85}
+"""
+
+import csv
+import json
+import math
+import sys
+import time
+
+from nathane_lebogang_section_F import (
+    EmptyNameError,
+    InvalidGradeError,
+    InvalidNameError,
+    InvalidSubjectError,
+    validate_grade,
+    validate_name,
+)
+
+# Errors that make a row bad (anything else is a real bug and is raised)
+ROW_ERRORS = (EmptyNameError, InvalidNameError, InvalidGradeError, InvalidSubjectError)
+
+# What to do with a bad row
+ON_ERROR_OPTIONS = ("collect", "skip", "raise")
+
+
+class BadRowError(Exception):
+    """Raised for a row that cannot be read at all (wrong columns, broken JSON)"""
+    pass
+
+
+class BulkReport:
+    """
+    The result of an import or export.
+
+    Attributes:
+        rows (int): Rows read or written
+        students_added (int): New students created by an import
+        grades_set (int): Grades stored by an import
+        bad_rows (int): Rows that failed validation
+        errors (list): (line number, message) for the first max_errors bad rows
+        seconds (float): How long the whole transfer took
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.students_added = 0
+        self.grades_set = 0
+        self.bad_rows = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        """
+        Returns:
+            float: Throughput of the transfer
+        """
+        if self.seconds == 0:
+            return 0.0
+        return self.rows / self.seconds
+
+    def summary(self):
+        """
+        Returns:
+            dict: Every counter in one dictionary (errors are not included)
+        """
+        return {
+            "rows": self.rows,
+            "students_added": self.students_added,
+            "grades_set": self.grades_set,
+            "bad_rows": self.bad_rows,
+            "seconds": self.seconds,
+            "rows_per_second": self.rows_per_second,
+        }
+
+    def print_report(self):
+        """
+        Print the report for the user.
+        """
+        print(f"Rows: {self.rows}")
+        if self.students_added or self.grades_set or self.bad_rows:
+            print(f"Students added: {self.students_added}")
+            print(f"Grades set: {self.grades_set}")
+            print(f"Bad rows: {self.bad_rows}")
+        print(f"Time: {self.seconds:.2f} s ({self.rows_per_second:,.0f} rows/sec)")
+        for line_number, message in self.errors:
+            print(f"  Line {line_number}: {message}")
+        if self.bad_rows > len(self.errors):
+            print(f"  ... and {self.bad_rows - len(self.errors)} more bad rows")
+
+
+def parse_grade(text):
+    """
+    Turn the text from a CSV cell into a grade number.
+
+    Args:
+        text (str): The cell value
+
+    Returns:
+        int or float: The grade (int when it is a whole number like the menu uses)
+
+    Raises:
+        InvalidGradeError: If the text is not a number (nan and inf are not numbers here)
+    """
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        grade = float(text)
+    except ValueError:
+        raise InvalidGradeError(f"Grade must be a number, got '{text}'") from None
+    if not math.isfinite(grade):
+        raise InvalidGradeError(f"Grade must be a number, got '{text}'")
+    return grade
+
+
+def _open(source, mode):
+    """
+    Open a path, or use an already open file as it is.
+    Returns (file, should_close).
+    """
+    if isinstance(source, str):
+        return open(source, mode, newline="", encoding="utf-8"), True
+    return source, False
+
+
+def apply_record(gradebook, name, grades, report):
+    """
+    Validate one student's grades and store them all.
+
+    Args:
+        gradebook (Gradebook): The gradebook to load into
+        name (str): The student's name (may not be cleaned yet)
+        grades (list): (subject, grade) pairs
+        report (BulkReport): Counters to update
+
+    Raises:
+        EmptyNameError, InvalidNameError, InvalidGradeError, InvalidSubjectError
+    """
+    name = validate_name(name)
+
+    # Check every grade before storing anything so a bad row is never half applied
+    for subject, grade in grades:
+        validate_grade(subject, grade, gradebook.subjects)
+
+    student = gradebook.students.get(name)
+    if student is None:
+        student = gradebook._insert_student(name)
+        report.students_added += 1
+
+    for subject, grade in grades:
+        student._set_grade(subject, grade)
+    report.grades_set += len(grades)
+
+
+def _csv_records(reader):
+    """
+    Turn CSV rows into (line number, name, [(subject, grade)]) records.
+    The layout is chosen from the header row.
+    """
+    header = next(reader, None)
+    if header is None:
+        return
+
+    header = [column.strip() for column in header]
+    if not header or header[0].lower() != "name":
+        raise BadRowError("The first CSV column must be 'name'")
+
+    if [column.lower() for column in header] == ["name", "subject", "grade"]:
+        for row in reader:
+            if len(row) != 3:
+                yield reader.line_num, BadRowError(f"Expected 3 columns, got {len(row)}")
+                continue
+            name, subject, grade = row
+            yield reader.line_num, (name, [(subject.strip(), grade)])
+    else:
+        subject_columns = header[1:]
+        for row in reader:
+            if len(row) != len(header):
+                yield reader.line_num, BadRowError(f"Expected {len(header)} columns, got {len(row)}")
+                continue
+            grades = [(subject, cell) for subject, cell in zip(subject_columns, row[1:])
+                      if cell.strip()]
+            yield reader.line_num, (row[0], grades)
+
+
+def _jsonl_records(lines):
+    """
+    Turn JSON lines into (line number, name, [(subject, grade)]) records.
+    """
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            name = record["name"]
+            if "grades" in record:
+                grades = list(record["grades"].items())
+            else:
+                grades = [(record["subject"], record["grade"])]
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            yield line_number, BadRowError(f"Invalid record: {error}")
+            continue
+        yield line_number, (name, grades)
+
+
+def _load(gradebook, records, on_error, max_errors, convert_text):
+    """
+    Apply records to the gradebook and build the report.
+    """
+    if on_error not in ON_ERROR_OPTIONS:
+        raise ValueError(f"on_error must be one of {', '.join(ON_ERROR_OPTIONS)}")
+
+    report = BulkReport()
+    start = time.perf_counter()
+
+    try:
+        for line_number, record in records:
+            report.rows += 1
+            try:
+                if isinstance(record, BadRowError):
+                    raise record
+                name, grades = record
+                if not isinstance(name, str):
+                    raise EmptyNameError("Student name must be text")
+                if convert_text:
+                    grades = [(subject, parse_grade(grade)) for subject, grade in grades]
+                apply_record(gradebook, name, grades, report)
+
+            except ROW_ERRORS + (BadRowError,) as error:
+                if on_error == "raise":
+                    raise
+                report.bad_rows += 1
+                if on_error == "collect" and len(report.errors) < max_errors:
+                    report.errors.append((line_number, str(error)))
+    finally:
+        report.seconds = time.perf_counter() - start
+
+    return report
+
+
+def load_csv(gradebook, source, on_error="collect", max_errors=1000):
+    """
+    Stream a CSV file into a gradebook.
+
+    Args:
+        gradebook (Gradebook): The gradebook to load into (existing students are updated)
+        source (str or file): A path or an open text file
+        on_error (str): "collect" bad rows in the report, "skip" them, or "raise"
+        max_errors (int): How many error messages to keep when collecting
+
+    Returns:
+        BulkReport: What was loaded and how fast
+    """
+    file, should_close = _open(source, "r")
+    try:
+        records = _csv_records(csv.reader(file))
+        return _load(gradebook, records, on_error, max_errors, convert_text=True)
+    finally:
+        if should_close:
+            file.close()
+
+
+def load_jsonl(gradebook, source, on_error="collect", max_errors=1000):
+    """
+    Stream a JSON lines file into a gradebook.
+
+    Args:
+        gradebook (Gradebook): The gradebook to load into (existing students are updated)
+        source (str or file): A path or an open text file
+        on_error (str): "collect" bad rows in the report, "skip" them, or "raise"
+        max_errors (int): How many error messages to keep when collecting
+
+    Returns:
+        BulkReport: What was loaded and how fast
+    """
+    file, should_close = _open(source, "r")
+    try:
+        return _load(gradebook, _jsonl_records(file), on_error, max_errors, convert_text=False)
+    finally:
+        if should_close:
+            file.close()
+
+
+def export_csv(gradebook, destination):
+    """
+    Write every student to a CSV file (one row per student, empty cell = no grade).
+
+    Args:
+        gradebook (Gradebook): The gradebook to export
+        destination (str or file): A path or an open text file
+
+    Returns:
+        BulkReport: How many rows were written and how fast
+    """
+    subject_names = list(gradebook.subject_stats)
+    report = BulkReport()
+    start = time.perf_counter()
+
+    file, should_close = _open(destination, "w")
+    try:
+        writer = csv.writer(file)
+        writer.writerow(["name"] + subject_names)
+        for student in gradebook.students.values():
+            grades = student.grades
+            writer.writerow([student.name] + [grades.get(subject, "") for subject in subject_names])
+            report.rows += 1
+    finally:
+        if should_close:
+            file.close()
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def export_jsonl(gradebook, destination):
+    """
+    Write every student to a JSON lines file.
+
+    Args:
+        gradebook (Gradebook): The gradebook to export
+        destination (str or file): A path or an open text file
+
+    Returns:
+        BulkReport: How many rows were written and how fast
+    """
+    report = BulkReport()
+    start = time.perf_counter()
+
+    file, should_close = _open(destination, "w")
+    try:
+        for student in gradebook.students.values():
+            record = {"name": student.name, "grades": dict(student.grades)}
+            file.write(json.dumps(record))
+            file.write("\n")
+            report.rows += 1
+    finally:
+        if should_close:
+            file.close()
+
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def _loader_for(path):
+    """
+    Pick the loader or exporter from a file extension.
+    """
+    if path.lower().endswith((".jsonl", ".json")):
+        return load_jsonl, export_jsonl
+    return load_csv, export_csv
+
+
+if __name__ == "__main__":
+    from nathane_lebogang_section_F import Gradebook
+
+    if len(sys.argv) < 2:
+        print("Usage: python nathane_lebogang_bulk_io.py INPUT.csv|.jsonl [OUTPUT.csv|.jsonl]")
+        sys.exit(1)
+
+    gradebook = Gradebook()
+
+    print(f"IMPORTING {sys.argv[1]}")
+    load, _ = _loader_for(sys.argv[1])
+    load(gradebook, sys.argv[1]).print_report()
+
+    if len(sys.argv) > 2:
+        print(f"\nEXPORTING {sys.argv[2]}")
+        _, export = _loader_for(sys.argv[2])
+        export(gradebook, sys.argv[2]).print_report()
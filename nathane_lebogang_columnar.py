@@ -0,0 +1,454 @@
+"""
+Columnar (array based) storage for the Section F Gradebook.
+
+The normal Gradebook keeps one Student object and one grades dictionary per
+student. With a million students that is millions of small objects.
+ColumnarGradebook stores the grades of each subject in one contiguous
+array('f') (4 bytes per grade) with a bytearray mask that says which students
+have a grade. Student objects are only created as light views when a method
+asks for them, so every public Gradebook method keeps working unchanged.
+
+Grades are stored as 32-bit floats, which keep about 7 significant digits.
+Whole numbers are handed back as int and other values are rounded to 4
+decimal places, so grades read back the way they were entered. Statistics
+and rankings are given that stored value too (see stored_grade()).
+"""
+
+import sys
+import time
+import tracemalloc
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+from nathane_lebogang_section_F import Gradebook, Student, student_detail_lines, subjects
+from nathane_lebogang_sort_engine import DEFAULT_STRATEGY
+
+# Decimal places kept when reading a float32 grade back
+GRADE_DECIMALS = 4
+
+
+def float32_to_grade(value):
+    """
+    Turn a value read from a float32 array back into the grade that was entered.
+
+    Args:
+        value (float): The stored value
+
+    Returns:
+        int or float: An int for whole numbers, otherwise rounded to GRADE_DECIMALS
+    """
+    if value.is_integer():
+        return int(value)
+    return round(value, GRADE_DECIMALS)
+
+
+def stored_grade(grade):
+    """
+    The grade exactly as it will be read back from a float32 column.
+
+    Args:
+        grade (float): The grade that was entered
+
+    Returns:
+        int or float: float32_to_grade() of the grade stored as a float32
+    """
+    return float32_to_grade(array("f", (grade,))[0])
+
+
+class GradeColumns:
+    """
+    Grades for every student, stored one array per subject.
+
+    Attributes:
+        subjects (list): The subject names, one column each
+        values (dict): subject -> array('f') of grades, one entry per row
+        present (dict): subject -> bytearray, 1 where the row has a grade
+        names (list): row -> student name
+        index (dict): student name -> row (in the order students were added)
+    """
+
+    def __init__(self, subject_names):
+        """
+        Create empty columns for the given subjects.
+
+        Args:
+            subject_names (list): The subjects to make columns for
+        """
+        self.subjects = list(subject_names)
+        self.values = {subject: array("f") for subject in self.subjects}
+        self.present = {subject: bytearray() for subject in self.subjects}
+        self.names = []
+        self.index = {}
+
+    def add_row(self, name):
+        """
+        Add an empty row for a new student.
+
+        Args:
+            name (str): The student's name
+
+        Returns:
+            int: The new row number
+        """
+        row = len(self.names)
+        self.names.append(name)
+        self.index[name] = row
+        for subject in self.subjects:
+            self.values[subject].append(0.0)
+            self.present[subject].append(0)
+        return row
+
+    def remove_row(self, name):
+        """
+        Remove a student's row by moving the last row into its place.
+
+        The index dictionary keeps the students in the order they were added,
+        so moving rows around does not change the order students are listed in.
+
+        Args:
+            name (str): The student's name
+        """
+        row = self.index.pop(name)
+        last = len(self.names) - 1
+
+        if row != last:
+            moved_name = self.names[last]
+            self.names[row] = moved_name
+            self.index[moved_name] = row
+            for subject in self.subjects:
+                self.values[subject][row] = self.values[subject][last]
+                self.present[subject][row] = self.present[subject][last]
+
+        self.names.pop()
+        for subject in self.subjects:
+            self.values[subject].pop()
+            self.present[subject].pop()
+
+    def add_column(self, subject):
+        """
+        Add an empty column for a subject that was added to the gradebook later.
+
+        Args:
+            subject (str): The subject
+        """
+        self.subjects.append(subject)
+        self.values[subject] = array("f", bytes(4 * len(self.names)))
+        self.present[subject] = bytearray(len(self.names))
+
+    def get(self, row, subject):
+        """
+        Read one grade.
+
+        Args:
+            row (int): The student's row
+            subject (str): The subject
+
+        Returns:
+            float: The grade, or None if the student has no grade for it
+        """
+        present = self.present.get(subject)
+        if present is None or not present[row]:
+            return None
+        return float32_to_grade(self.values[subject][row])
+
+    def set(self, row, subject, grade):
+        """
+        Store one grade.
+
+        Args:
+            row (int): The student's row
+            subject (str): The subject
+            grade (float): The grade
+        """
+        if subject not in self.values:
+            self.add_column(subject)  # Columns for new subjects are made on their first grade
+        self.values[subject][row] = grade
+        self.present[subject][row] = 1
+
+    def clear(self, row, subject):
+        """
+        Remove one grade.
+
+        Args:
+            row (int): The student's row
+            subject (str): The subject
+        """
+        self.values[subject][row] = 0.0
+        self.present[subject][row] = 0
+
+    def nbytes(self):
+        """
+        Memory used by the grade arrays and masks (not the name index).
+
+        Returns:
+            int: Number of bytes
+        """
+        total = 0
+        for subject in self.subjects:
+            total += sys.getsizeof(self.values[subject])
+            total += sys.getsizeof(self.present[subject])
+        return total
+
+
+class RowGrades(MutableMapping):
+    """
+    Dictionary-like view of one student's grades inside the columns.
+
+    Student methods such as add_grade() and calculate_average() use this
+    exactly like the normal grades dictionary.
+    """
+
+    __slots__ = ("columns", "name")
+
+    def __init__(self, columns, name):
+        self.columns = columns
+        self.name = name
+
+    def _row(self):
+        # Looked up every time because rows move when students are removed
+        return self.columns.index.get(self.name)
+
+    def __getitem__(self, subject):
+        row = self._row()
+        if row is None or subject not in self.columns.present:
+            raise KeyError(subject)
+        grade = self.columns.get(row, subject)
+        if grade is None:
+            raise KeyError(subject)
+        return grade
+
+    def __setitem__(self, subject, grade):
+        row = self._row()
+        if row is None:
+            raise KeyError(self.name)
+        self.columns.set(row, subject, grade)
+
+    def __delitem__(self, subject):
+        row = self._row()
+        if row is None or self.columns.get(row, subject) is None:
+            raise KeyError(subject)
+        self.columns.clear(row, subject)
+
+    def __iter__(self):
+        row = self._row()
+        if row is None:
+            return
+        for subject in self.columns.subjects:
+            if self.columns.present[subject][row]:
+                yield subject
+
+    def __len__(self):
+        row = self._row()
+        if row is None:
+            return 0
+        return sum(self.columns.present[subject][row] for subject in self.columns.subjects)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class StudentView(Student):
+    """
+    A Student whose grades live in the gradebook's columns.
+
+    Views are created when they are needed and hold no grades themselves,
+    so they can be thrown away and recreated at any time.
+    """
+
+    def __init__(self, name, gradebook):
+        """
+        Create a view for a student that already has a row.
+        The name was validated when the student was added.
+        """
+        self.name = name
+        self.gradebook = gradebook
+
+    @property
+    def grades(self):
+        """
+        The student's grades as a dictionary-like view.
+        """
+        return RowGrades(self.gradebook.columns, self.name)
+
+    def _set_grade(self, subject, grade):
+        """
+        Store a grade and report it to the gradebook as the column will give it back,
+        so the statistics later remove the same value they added.
+        """
+        super()._set_grade(subject, stored_grade(grade))
+
+    def _grade_totals(self):
+        """
+        Work out (total, count, average) from the columns every time.
+        Views are short-lived and another view of the same row can change
+        the grades, so nothing is remembered here.
+        """
+        Student.cache_misses += 1
+        grades = self.grades
+        total = sum(grades.values())
+        count = len(grades)
+        return total, count, total / count if count else 0
+
+    def detail_lines(self):
+        """
+        Same lines as Student.detail_lines(), reading the row only once.
+        """
+        grades = dict(self.grades)
+        average = sum(grades.values()) / len(grades) if grades else None
+        return student_detail_lines(self.name, grades, average,
+                                    self.gradebook.subjects.shown_for(grades))
+
+
+class StudentTable(Mapping):
+    """
+    The gradebook's students dictionary (name -> Student) for the columnar backend.
+    Student views are created on request instead of being stored.
+    """
+
+    def __init__(self, gradebook):
+        self.gradebook = gradebook
+
+    def __getitem__(self, name):
+        if name not in self.gradebook.columns.index:
+            raise KeyError(name)
+        return StudentView(name, self.gradebook)
+
+    def __contains__(self, name):
+        return name in self.gradebook.columns.index
+
+    def __iter__(self):
+        return iter(self.gradebook.columns.index)
+
+    def __len__(self):
+        return len(self.gradebook.columns.index)
+
+    def values(self):
+        return StudentViews(self.gradebook)
+
+
+class StudentViews:
+    """
+    students.values() for the columnar backend. Views are created one at a
+    time while iterating, so reading only the first few students is cheap.
+    """
+
+    def __init__(self, gradebook):
+        self.gradebook = gradebook
+
+    def __iter__(self):
+        gradebook = self.gradebook
+        for name in gradebook.columns.index:
+            yield StudentView(name, gradebook)
+
+    def __len__(self):
+        return len(self.gradebook.columns.index)
+
+
+class ColumnarGradebook(Gradebook):
+    """
+    Gradebook that keeps grades in per-subject arrays instead of Student objects.
+    Every public method of Gradebook works the same way.
+    """
+
+    def __init__(self, sort_strategy=DEFAULT_STRATEGY, subject_names=None):
+        """
+        Constructor - creates an empty columnar gradebook.
+        """
+        super().__init__(sort_strategy, subject_names)
+        self.columns = GradeColumns(self.subjects)
+        self.students = StudentTable(self)
+
+    def _store_student(self, name):
+        """
+        Give a new (already validated) student a row in the columns.
+        """
+        self.columns.add_row(name)
+        return StudentView(name, self)
+
+    def _discard_student(self, name):
+        """
+        Remove a student's row from the columns.
+        """
+        self.columns.remove_row(name)
+        return StudentView(name, self)
+
+    def _share_roster(self):
+        """
+        Snapshots keep the name -> row index (rows move, but the names and their order do not).
+        """
+        self._roster_shared = True
+        return self.columns.index
+
+    def _unshare_roster(self):
+        if self._roster_shared:
+            self.columns.index = dict(self.columns.index)
+            self._roster_shared = False
+
+    def memory_usage(self):
+        """
+        Approximate memory used by the grade storage and the name index.
+        """
+        columns = self.columns
+        index_bytes = sys.getsizeof(columns.index) + sys.getsizeof(columns.names)
+        index_bytes += sum(sys.getsizeof(name) for name in columns.names)
+        return {"grade_columns": columns.nbytes(), "name_index": index_bytes,
+                "total": columns.nbytes() + index_bytes}
+
+
+def _fill_gradebook(gradebook, num_students):
+    """
+    Add synthetic students with a grade for every subject, without printing.
+    """
+    for number in range(num_students):
+        student = gradebook._insert_student(f"Student {_letters(number)}")
+        for position, subject in enumerate(subjects):
+            student.add_grade(subject, (number * 7 + position * 13) % 101)
+
+
+def _letters(number):
+    """
+    Turn a number into letters (student names cannot contain digits).
+    """
+    letters = ""
+    while True:
+        number, remainder = divmod(number, 26)
+        letters = chr(ord("a") + remainder) + letters
+        if number == 0:
+            return letters
+
+
+def compare_backend_memory(num_students=100000):
+    """
+    Build the same roster with both backends and measure memory and build time.
+
+    Args:
+        num_students (int): How many students to create
+
+    Returns:
+        dict: {"dict": {...}, "columnar": {...}} with bytes, bytes_per_student and seconds
+    """
+    results = {}
+    for label, factory in (("dict", Gradebook), ("columnar", ColumnarGradebook)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        gradebook = factory()
+        _fill_gradebook(gradebook, num_students)
+        seconds = time.perf_counter() - start
+        used, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[label] = {
+            "bytes": used,
+            "bytes_per_student": used / num_students if num_students else 0,
+            "seconds": seconds,
+        }
+        del gradebook
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"MEMORY FOOTPRINT FOR {count} STUDENTS")
+    for backend, result in compare_backend_memory(count).items():
+        print(f"{backend}: {result['bytes'] / 1024 / 1024:.1f} MB "
+              f"({result['bytes_per_student']:.0f} bytes per student, "
+              f"built in {result['seconds']:.2f} s)")
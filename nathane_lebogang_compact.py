@@ -0,0 +1,357 @@
+"""
+Compact Student objects for the Section E and F gradebooks.
+
+A normal Student has an attribute dictionary (__dict__) and its own grades
+dictionary holding a key for every subject it has a grade in. With a large
+class these small dictionaries use most of the memory.
+
+CompactStudent uses __slots__ (no __dict__) and keeps its grades in a short
+list with one place per subject. The place of a subject is its dense id in
+the SubjectRegistry that the gradebook shares with all of its students, so
+the subject names are stored once for the whole gradebook instead of once
+per student. A place holding NO_GRADE has no grade yet, and a student's list
+only grows when it gets a grade for a subject added after it was created.
+
+student.grades still works like a dictionary (a CompactGrades view), and
+add_grade, get_grade, has_grades, calculate_average, print_details and the
+cached totals behave exactly like the normal Student, so CompactGradebook
+(Section F) and CompactSectionEGradebook (Section E) are drop-in replacements.
+Grades are added up in subject order rather than in the order they were
+first set, so an average of non-whole grades can differ in the last binary
+digit from the one a normal Student works out.
+
+Run python nathane_lebogang_compact.py 100000 to compare bytes per student.
+"""
+
+import sys
+import time
+import tracemalloc
+from collections.abc import MutableMapping
+
+import nathane_lebogang_section_E as section_e
+from nathane_lebogang_section_F import Gradebook, Student, subjects, validate_name
+from nathane_lebogang_subjects import SubjectRegistry
+
+NO_GRADE = None  # Stored in a student's place for a subject without a grade
+
+
+class CompactGrades(MutableMapping):
+    """
+    A compact student's grades as a dictionary (subject -> grade).
+    Setting or deleting through the view does not update any statistics,
+    just like changing a normal Student's grades dictionary directly.
+    """
+
+    __slots__ = ("_student",)
+
+    def __init__(self, student):
+        self._student = student
+
+    def __getitem__(self, subject):
+        grade = self._student._grade_at(subject)
+        if grade is NO_GRADE:
+            raise KeyError(subject)
+        return grade
+
+    def get(self, subject, default=None):
+        grade = self._student._grade_at(subject)
+        return default if grade is NO_GRADE else grade
+
+    def __setitem__(self, subject, grade):
+        self._student._store(subject, grade)
+
+    def __delitem__(self, subject):
+        student = self._student
+        if student._grade_at(subject) is NO_GRADE:
+            raise KeyError(subject)
+        student._grade_list[student._subjects.ids[subject]] = NO_GRADE
+        student._totals = None
+
+    def __iter__(self):
+        names = self._student._subjects.names_by_id
+        for position, grade in enumerate(self._student._grade_list):
+            if grade is not NO_GRADE:
+                yield names[position]
+
+    def __len__(self):
+        grade_list = self._student._grade_list
+        return len(grade_list) - grade_list.count(NO_GRADE)
+
+    def items(self):
+        names = self._student._subjects.names_by_id
+        return [(names[position], grade) for position, grade in enumerate(self._student._grade_list)
+                if grade is not NO_GRADE]
+
+    def values(self):
+        return [grade for grade in self._student._grade_list if grade is not NO_GRADE]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class CompactStudent:
+    """
+    A Section F Student stored in slots, with grades in a list ordered by subject id.
+
+    Attributes:
+        name (str): The student's name
+        gradebook (Gradebook): The Gradebook the student belongs to, or None
+        grades (CompactGrades): Dictionary-like view of the grades
+    """
+
+    __slots__ = ("name", "gradebook", "_subjects", "_grade_list", "_totals")
+
+    cache_owner = Student  # Whose cache_hits / cache_misses counters are used
+
+    def __init__(self, name, registry):
+        """
+        Create a student with no grades yet.
+
+        Args:
+            name (str): The student's name
+            registry (SubjectRegistry): The gradebook's subjects
+        """
+        self.name = validate_name(name)
+        self.gradebook = None
+        self._subjects = registry
+        self._grade_list = [NO_GRADE] * registry.size
+        self._totals = None
+
+    @property
+    def grades(self):
+        return CompactGrades(self)
+
+    def _grade_at(self, subject):
+        """
+        The grade stored for a subject, or NO_GRADE.
+        """
+        position = self._subjects.ids.get(subject)
+        if position is None or position >= len(self._grade_list):
+            return NO_GRADE
+        return self._grade_list[position]
+
+    def _store(self, subject, grade):
+        """
+        Put a grade in the subject's place and return the grade it replaced (None if none).
+        """
+        position = self._subjects.ids.get(subject)
+        if position is None:
+            position = self._subjects.add(subject)  # Only Section E grades unknown subjects
+        grade_list = self._grade_list
+        if position >= len(grade_list):
+            grade_list.extend([NO_GRADE] * (position + 1 - len(grade_list)))
+        old_grade = grade_list[position]
+        grade_list[position] = grade
+        self._totals = None  # Work the average out again next time
+        return old_grade
+
+    def _registry(self):
+        """
+        The subject registry grades are checked against (kept outside a gradebook too).
+        """
+        return self._subjects
+
+    def _set_grade(self, subject, grade):
+        """
+        Store an already validated grade and tell the gradebook about the change.
+        """
+        old_grade = self._store(subject, grade)
+        if self.gradebook is not None:
+            self.gradebook._grade_changed(self, subject, old_grade, grade)
+
+    def _grade_totals(self):
+        """
+        Get (total, count, average) of the grades, working them out only if a grade changed.
+        """
+        if self._totals is not None:
+            self.cache_owner.cache_hits += 1
+            return self._totals
+
+        self.cache_owner.cache_misses += 1
+        present = [grade for grade in self._grade_list if grade is not NO_GRADE]
+        total = sum(present)
+        count = len(present)
+        self._totals = (total, count, total / count if count else 0)
+        return self._totals
+
+    def has_grades(self):
+        """
+        Check if student has any grades.
+        """
+        return len(self._grade_list) > self._grade_list.count(NO_GRADE)
+
+    # The rest only reads grades through the methods above, so it is shared with Student
+    add_grade = Student.add_grade
+    calculate_average = Student.calculate_average
+    calculate_total = Student.calculate_total
+    count_grades = Student.count_grades
+    get_grade = Student.get_grade
+    detail_lines = Student.detail_lines
+    print_details = Student.print_details
+    cache_stats = Student.cache_stats
+    reset_cache_stats = Student.reset_cache_stats
+
+
+class CompactSectionEStudent(CompactStudent):
+    """
+    A Section E Student stored in slots. Like the Section E Student it
+    accepts any subject; a new subject gets the next id in the shared registry.
+    """
+
+    __slots__ = ()
+
+    cache_owner = section_e.Student
+
+    def __init__(self, name, registry):
+        self.name = name  # Section E does not check names
+        self.gradebook = None
+        self._subjects = registry
+        self._grade_list = [NO_GRADE] * registry.size
+        self._totals = None
+
+    def add_grade(self, subject, grade):
+        """
+        Add a grade for a specific subject.
+
+        Args:
+            subject (str): The subject name (e.g., "Math")
+            grade (int): The grade value (0-100)
+        """
+        old_grade = self._store(subject, grade)
+
+        # Keep the gradebook's running statistics up to date
+        if self.gradebook is not None:
+            self.gradebook.grade_changed(subject, old_grade, grade)
+
+    print_details = section_e.Student.print_details
+    cache_stats = section_e.Student.cache_stats
+    reset_cache_stats = section_e.Student.reset_cache_stats
+
+
+class CompactGradebook(Gradebook):
+    """
+    Section F Gradebook whose students are CompactStudent objects.
+    Every public method of Gradebook works the same way.
+    """
+
+    def _store_student(self, name):
+        student = CompactStudent(name, self.subjects)
+        student.gradebook = self
+        self.students[name] = student
+        return student
+
+
+class CompactSectionEGradebook(section_e.Gradebook):
+    """
+    Section E Gradebook whose students are CompactSectionEStudent objects.
+    """
+
+    def __init__(self, subjects):
+        super().__init__(subjects)
+        self.subject_registry = SubjectRegistry(subjects)
+
+    def _new_student(self, name):
+        return CompactSectionEStudent(name, self.subject_registry)
+
+
+def _names(num_students):
+    """
+    Synthetic student names without digits ("Student ab", ...).
+    """
+    from nathane_lebogang_columnar import _letters
+    return [f"Student {_letters(number)}" for number in range(num_students)]
+
+
+def _measure(build, num_students):
+    """
+    Run build() under tracemalloc. Returns (bytes per student, seconds).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = build()
+    seconds = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (used / num_students if num_students else 0), seconds
+
+
+def compare_student_memory(num_students=100000):
+    """
+    Measure memory per student for the normal and compact students of Sections E and F.
+
+    Every student gets a grade in every subject. "students" measures the
+    Student objects alone (names included); "gradebook" measures a whole
+    gradebook built with add_student and add_grade, including its statistics
+    and indexes.
+
+    Args:
+        num_students (int): How many students to create
+
+    Returns:
+        dict: {label: {"student_bytes", "gradebook_bytes", "seconds"}}
+    """
+    names = _names(num_students)
+    grades = [[(subject, (number * 7 + position * 13) % 101)
+               for position, subject in enumerate(subjects)] for number in range(num_students)]
+
+    def students_only(make):
+        def build():
+            students = []
+            for name, pairs in zip(names, grades):
+                student = make(name)
+                for subject, grade in pairs:
+                    student.add_grade(subject, grade)
+                students.append(student)
+            return students
+        return build
+
+    def whole_gradebook(factory):
+        def build():
+            gradebook = factory()
+            for name, pairs in zip(names, grades):
+                student = gradebook._insert_student(name)
+                for subject, grade in pairs:
+                    student._set_grade(subject, grade)
+            return gradebook
+        return build
+
+    def whole_section_e(factory):
+        def build():
+            gradebook = factory(subjects)
+            for name, pairs in zip(names, grades):
+                student = gradebook._new_student(name)
+                student.gradebook = gradebook
+                gradebook.students[name] = student
+                for subject, grade in pairs:
+                    student.add_grade(subject, grade)
+            return gradebook
+        return build
+
+    shared_index = SubjectRegistry(subjects)
+    cases = {
+        "Section E Student": (students_only(section_e.Student),
+                              whole_section_e(section_e.Gradebook)),
+        "Section E compact": (students_only(lambda name: CompactSectionEStudent(name, shared_index)),
+                              whole_section_e(CompactSectionEGradebook)),
+        "Section F Student": (students_only(Student), whole_gradebook(Gradebook)),
+        "Section F compact": (students_only(lambda name: CompactStudent(name, shared_index)),
+                              whole_gradebook(CompactGradebook)),
+    }
+
+    results = {}
+    for label, (students_build, gradebook_build) in cases.items():
+        student_bytes, _ = _measure(students_build, num_students)
+        gradebook_bytes, seconds = _measure(gradebook_build, num_students)
+        results[label] = {"student_bytes": student_bytes, "gradebook_bytes": gradebook_bytes,
+                          "seconds": seconds}
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"MEMORY PER STUDENT FOR {count} STUDENTS ({len(subjects)} grades each)")
+    print(f"{'':<20}{'Students':>10}{'Gradebook':>11}{'Build':>9}")
+    for label, result in compare_student_memory(count).items():
+        print(f"{label:<20}{result['student_bytes']:>8.0f} B{result['gradebook_bytes']:>9.0f} B"
+              f"{result['seconds']:>8.2f}s")
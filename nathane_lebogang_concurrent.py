@@ -0,0 +1,478 @@
+"""
+Thread-safe Section F Gradebook for several writer and reader threads.
+
+ConcurrentGradebook can be shared by ingest threads (adding students and
+setting grades) and reporting threads (sorting, statistics, searches) at
+the same time. It uses four kinds of locks, always taken in this order so
+threads can never deadlock:
+
+    roster lock     readers-writer lock. Adding or removing a student takes
+                    it for writing; everything else only reads the roster.
+    stripe locks    a fixed set of locks shared out by student name. Setting
+                    a grade locks only that student's stripe, so updates to
+                    different students go ahead in parallel.
+    aggregate lock  protects the shared statistics and rankings for the short
+                    moment they are updated or read.
+    index lock      protects the name index (it tidies itself up during searches).
+
+Reports (view_all_students, sort_by_average, sort_by_subject, ...) work on a
+copy-on-write snapshot (freeze(), see nathane_lebogang_snapshot): the locks
+are held only while the snapshot is registered, and each student's grades
+are copied under its own stripe lock as the report reaches them, so long
+reports never hold up writers and still show a single moment in time.
+snapshot() copies every student at once instead.
+
+Run python nathane_lebogang_concurrent.py to run the stress test.
+"""
+
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+
+from nathane_lebogang_benchmark import make_names
+from nathane_lebogang_section_F import AT_RISK_THRESHOLD, Gradebook, Student, subjects
+from nathane_lebogang_sort_engine import DEFAULT_STRATEGY
+
+DEFAULT_STRIPES = 64
+
+
+class ReadWriteLock:
+    """
+    Many readers or one writer at a time.
+
+    Waiting writers go first, so a steady stream of readers cannot keep a
+    writer out forever. The lock is not re-entrant: a thread must not ask
+    for it again while it already holds it.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def reading(self):
+        """
+        Hold the lock for reading while the block runs.
+        """
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def writing(self):
+        """
+        Hold the lock for writing while the block runs.
+        """
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+
+class StripedLocks:
+    """
+    A fixed number of locks shared out by key, so each key has its own lock
+    most of the time without creating one lock per student.
+    """
+
+    def __init__(self, count=DEFAULT_STRIPES):
+        self._locks = [threading.RLock() for _ in range(count)]
+
+    def lock_for(self, key):
+        """
+        Returns:
+            RLock: The lock that protects key
+        """
+        return self._locks[hash(key) % len(self._locks)]
+
+    @contextmanager
+    def holding_all(self):
+        """
+        Hold every stripe (always in the same order) while the block runs.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(self._locks):
+                lock.release()
+
+
+class ConcurrentStudent(Student):
+    """
+    A Student whose grade changes take its stripe lock.
+    """
+
+    def _set_grade(self, subject, grade):
+        gradebook = self.gradebook
+        if gradebook is None:
+            return super()._set_grade(subject, grade)
+        with gradebook.stripes.lock_for(self.name):
+            return super()._set_grade(subject, grade)
+
+    def copy(self):
+        """
+        A detached copy of the student for snapshots (call with the stripe lock held).
+        """
+        student = Student.__new__(StudentCopy)
+        student.name = self.name
+        student.grades = dict(self.grades)
+        student.gradebook = None
+        student.subjects = self.gradebook.subjects if self.gradebook is not None else None
+        student._totals = self._totals
+        return student
+
+
+class StudentCopy(Student):
+    """
+    A detached copy of a student that still knows its gradebook's subjects.
+    """
+
+    def _registry(self):
+        return self.subjects
+
+
+class ConcurrentGradebook(Gradebook):
+    """
+    A Section F Gradebook that can be used from several threads at once.
+
+    Attributes:
+        roster_lock (ReadWriteLock): Taken for writing when students are added or removed
+        stripes (StripedLocks): Per-student locks for grade changes
+        aggregate_lock (Lock): Protects subject_stats, subject_histograms, class_stats and rank_indexes
+    """
+
+    def __init__(self, sort_strategy=DEFAULT_STRATEGY, stripes=DEFAULT_STRIPES, subject_names=None):
+        super().__init__(sort_strategy, subject_names)
+        self.roster_lock = ReadWriteLock()
+        self.stripes = StripedLocks(stripes)
+        self.aggregate_lock = threading.Lock()
+        self._index_lock = threading.Lock()  # The name index tidies itself up during searches
+
+    # Roster changes
+
+    def add_student(self, name):
+        with self.roster_lock.writing():
+            return super().add_student(name)
+
+    def remove_student(self, name):
+        with self.roster_lock.writing():
+            return super().remove_student(name)
+
+    def add_subject(self, name):
+        with self.roster_lock.writing(), self.aggregate_lock:
+            return super().add_subject(name)
+
+    def retire_subject(self, name):
+        with self.roster_lock.writing():
+            return super().retire_subject(name)
+
+    def _insert_student(self, name):
+        with self._index_lock:
+            return super()._insert_student(name)
+
+    def _store_student(self, name):
+        student = ConcurrentStudent(name)
+        student.gradebook = self
+        self.students[name] = student
+        return student
+
+    def _delete_student(self, name):
+        # Grades of this student may still be changed through a Student object someone holds
+        with self.stripes.lock_for(name), self.aggregate_lock, self._index_lock:
+            return super()._delete_student(name)
+
+    # Grade changes
+
+    def update_student_grade(self, name, subject, grade):
+        with self.roster_lock.reading():
+            return super().update_student_grade(name, subject, grade)
+
+    def update_grades_bulk(self, records, max_errors=100):
+        # Each grade still takes its own stripe in ConcurrentStudent._set_grade
+        with self.roster_lock.reading():
+            return super().update_grades_bulk(records, max_errors)
+
+    def _grade_changed(self, student, subject, old_grade, new_grade):
+        with self.aggregate_lock:
+            super()._grade_changed(student, subject, old_grade, new_grade)
+
+    # Reports and queries
+
+    def snapshot(self):
+        """
+        Consistent copies of every student, taken without blocking writers for long.
+
+        Returns:
+            list: Detached Student copies in the order the students were added
+        """
+        with self.roster_lock.reading():
+            students = list(self.students.values())
+
+        copies = []
+        for student in students:
+            with self.stripes.lock_for(student.name):
+                copies.append(student.copy())
+        return copies
+
+    def freeze(self):
+        # Writers go through the open snapshots with the aggregate lock held
+        with self.roster_lock.reading(), self.aggregate_lock:
+            return super().freeze()
+
+    def _snapshot_student(self, snapshot, name):
+        # The student's stripe lock keeps its grades from changing between the check and the copy
+        with self.stripes.lock_for(name):
+            kept = snapshot.kept.get(name)
+            return kept if kept is not None else self.students[name].copy()
+
+    def _student_list(self):
+        # One point in time for the whole report; students are copied one at a time as it goes
+        return self.freeze().students.values()
+
+    def _read_rank_index(self, subject, limit):
+        with self.roster_lock.reading(), self.aggregate_lock:
+            return super()._read_rank_index(subject, limit)
+
+    def _build_rank_index(self, subject):
+        """
+        Build a ranking the first time it is needed. Every student's grades
+        are read, so all stripes are held while it is built.
+        """
+        if subject is not None and not self.subjects.known(subject):
+            return  # Let the Gradebook method report the invalid subject
+        with self.aggregate_lock:
+            if subject in self.rank_indexes:
+                return
+        with self.roster_lock.reading(), self.stripes.holding_all(), self.aggregate_lock:
+            if subject not in self.rank_indexes:
+                self._rank_index(subject)
+
+    def _ranking_query(self, method, subject, *arguments):
+        """
+        Run a Gradebook ranking method with the roster and aggregates locked.
+        """
+        self._build_rank_index(subject)
+        with self.roster_lock.reading(), self.aggregate_lock:
+            return method(*arguments, subject)
+
+    def rank_of(self, name, subject=None):
+        return self._ranking_query(super().rank_of, subject, name)
+
+    def percentile_of(self, name, subject=None):
+        return self._ranking_query(super().percentile_of, subject, name)
+
+    def top_k(self, count, subject=None):
+        return self._ranking_query(super().top_k, subject, count)
+
+    def bottom_k(self, count, subject=None):
+        return self._ranking_query(super().bottom_k, subject, count)
+
+    def students_in_band(self, low, high, subject=None):
+        return self._ranking_query(super().students_in_band, subject, low, high)
+
+    def students_below(self, threshold=AT_RISK_THRESHOLD, subject=None, limit=None):
+        self._build_rank_index(subject)
+        with self.roster_lock.reading(), self.aggregate_lock:
+            return super().students_below(threshold, subject, limit)
+
+    def keep_ranking(self, subject=None):
+        self._build_rank_index(subject)
+        with self.aggregate_lock:
+            return super().keep_ranking(subject)
+
+    def get_subject_statistics(self, subject):
+        with self.aggregate_lock:
+            return super().get_subject_statistics(subject)
+
+    def get_subject_distribution(self, subject):
+        with self.aggregate_lock:
+            return super().get_subject_distribution(subject)
+
+    def get_grade_percentile(self, subject, percent):
+        with self.aggregate_lock:
+            return super().get_grade_percentile(subject, percent)
+
+    def get_class_average(self):
+        with self.aggregate_lock:
+            return super().get_class_average()
+
+    def search_students_by_name(self, search_term, limit=None):
+        with self.roster_lock.reading(), self._index_lock:
+            return super().search_students_by_name(search_term, limit)
+
+    def search_students_by_prefix(self, prefix, limit=None):
+        with self.roster_lock.reading(), self._index_lock:
+            return super().search_students_by_prefix(prefix, limit)
+
+
+def check_consistency(gradebook):
+    """
+    Check that the statistics and rankings agree with the students' grades.
+
+    Args:
+        gradebook (ConcurrentGradebook): A gradebook no thread is using any more
+
+    Raises:
+        AssertionError: If anything does not match
+    """
+    all_grades = [grade for student in gradebook.students.values()
+                  for grade in student.grades.values()]
+    assert gradebook.class_stats.count == len(all_grades), "Class grade count is wrong"
+    assert abs(gradebook.class_stats.total - sum(all_grades)) < 1e-6, "Class grade total is wrong"
+
+    for subject in gradebook.subjects.names_by_id:
+        grades = [student.grades[subject] for student in gradebook.students.values()
+                  if subject in student.grades]
+        stats = gradebook.subject_stats[subject]
+        assert stats.count == len(grades), f"{subject} grade count is wrong"
+        assert gradebook.subject_histograms[subject].count == len(grades), f"{subject} histogram is wrong"
+        if grades:
+            assert stats.maximum() == max(grades), f"Highest {subject} grade is wrong"
+            assert stats.minimum() == min(grades), f"Lowest {subject} grade is wrong"
+
+    for subject, rank_index in gradebook.rank_indexes.items():
+        if subject is None:
+            expected = {student.name for student in gradebook.students.values() if student.has_grades()}
+        else:
+            expected = {student.name for student in gradebook.students.values()
+                        if subject in student.grades}
+        assert {name for score, name in rank_index.ranked()} == expected, \
+            f"Ranking by {subject or 'average'} has the wrong students"
+
+
+def _worker(gradebook, names, own_names, operations, seed, errors):
+    """
+    One thread of the mixed workload: mostly grade updates, some reads,
+    and a few of its own students added and removed.
+    """
+    generator = random.Random(seed)
+    try:
+        for step in range(operations):
+            roll = generator.random()
+            if roll < 0.80:
+                gradebook.update_student_grade(generator.choice(names), generator.choice(subjects),
+                                               generator.randint(0, 100))
+            elif roll < 0.90:
+                gradebook.get_class_average()
+                gradebook.get_subject_statistics(generator.choice(subjects))
+            elif roll < 0.95:
+                gradebook.top_k(10)
+                gradebook.rank_of(generator.choice(names))
+            elif roll < 0.98:
+                gradebook.search_students_by_prefix(generator.choice(names)[:3], 10)
+            else:
+                name = own_names[step % len(own_names)]
+                if name in gradebook.students:
+                    gradebook.remove_student(name)
+                else:
+                    gradebook.add_student(name)
+                    gradebook.update_student_grade(name, "Math", generator.randint(0, 100))
+    except Exception as error:  # Reported by stress_test
+        errors.append(error)
+
+
+def stress_test(thread_counts=(1, 2, 4, 8), operations_per_thread=20000, num_students=10000,
+                seed=7):
+    """
+    Run the same mixed workload with different numbers of threads.
+
+    Every thread does operations_per_thread operations, so with perfect
+    scaling the time stays the same as threads are added. After each run the
+    statistics and rankings are checked against the students' grades.
+
+    Args:
+        thread_counts (tuple): Thread counts to try
+        operations_per_thread (int): Operations each thread performs
+        num_students (int): Students added before the threads start
+        seed (int): Random seed
+
+    Returns:
+        list: One dictionary per thread count with threads, operations, seconds,
+              operations_per_second and speedup (compared with one thread)
+    """
+    results = []
+    base_rate = None
+    extras_per_thread = operations_per_thread // 50 + 1
+
+    for thread_count in thread_counts:
+        gradebook = ConcurrentGradebook()
+        all_names = make_names(num_students + thread_count * extras_per_thread, seed)
+        names = all_names[:num_students]
+
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            for name in names:
+                gradebook.add_student(name)
+            gradebook.top_k(1)  # Keep the average ranking up to date during the run
+
+            errors = []
+            threads = []
+            for number in range(thread_count):
+                start = num_students + number * extras_per_thread
+                own_names = all_names[start:start + extras_per_thread]
+                threads.append(threading.Thread(
+                    target=_worker,
+                    args=(gradebook, names, own_names, operations_per_thread, seed + number, errors)))
+
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            seconds = time.perf_counter() - start
+
+        if errors:
+            raise errors[0]
+        check_consistency(gradebook)
+
+        operations = thread_count * operations_per_thread
+        rate = operations / seconds
+        if base_rate is None:
+            base_rate = rate / thread_count
+        results.append({
+            "threads": thread_count,
+            "operations": operations,
+            "seconds": seconds,
+            "operations_per_second": rate,
+            "speedup": rate / base_rate,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    threads_to_try = tuple(int(count) for count in sys.argv[1:]) or (1, 2, 4, 8)
+    print("CONCURRENT GRADEBOOK STRESS TEST")
+    print(f"{'Threads':>8}{'Operations':>12}{'Seconds':>10}{'Ops/sec':>12}{'Speedup':>9}")
+    for row in stress_test(threads_to_try):
+        print(f"{row['threads']:>8}{row['operations']:>12,}{row['seconds']:>10.2f}"
+              f"{row['operations_per_second']:>12,.0f}{row['speedup']:>9.2f}")
+    print("Statistics and rankings consistent after every run.")
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        print("Free-threaded Python: threads run in parallel.")
+    else:
+        print("Note: with the GIL, Python threads take turns, so speedup stays near 1.0 "
+              "unless the work waits on I/O.")
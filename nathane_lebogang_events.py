@@ -0,0 +1,374 @@
+"""
+Change events for the Section F Gradebook.
+
+Dashboards, caches and indexes built on top of a gradebook used to go
+through every student again to find out what changed. After
+
+    events = gradebook.enable_events()
+
+every change is published as a small typed event (StudentAdded,
+StudentRemoved, GradeChanged, SubjectAdded, SubjectRetired) with an
+increasing sequence number, and kept in a ring buffer of the last
+`capacity` events. There are three ways to consume them:
+
+    events.subscribe(callback)          callback(event) runs inside the change, in
+                                        the writer's thread (a slow callback slows
+                                        the writer down, which is the backpressure;
+                                        in a ConcurrentGradebook it runs with the
+                                        gradebook's locks held, so it must not call
+                                        back into the gradebook)
+    cursor = events.cursor()            pull: cursor.poll() returns the events
+                                        published since the last poll
+    cursor = events.async_cursor()      asyncio: await cursor.get() waits for events
+
+A pull consumer that falls more than `capacity` events behind gets
+EventsLostError from its next poll and has to rebuild its state with one
+full scan; memory use never grows with a slow consumer. With
+overflow="block" the writer instead waits (up to block_timeout seconds)
+for blocking cursors to catch up before an event they have not read is
+overwritten, so consumers in other threads can slow the writers down.
+"""
+
+import asyncio
+import threading
+import time
+
+DEFAULT_CAPACITY = 65536  # Events kept in the ring buffer
+DEFAULT_BLOCK_TIMEOUT = 5.0  # Longest a writer waits for a blocking cursor (seconds)
+OVERFLOW_POLICIES = ("drop", "block")
+
+
+class EventsLostError(Exception):
+    """Raised when a cursor fell so far behind that events it had not read were overwritten"""
+    pass
+
+
+class ChangeEvent:
+    """
+    One change to a gradebook.
+
+    Attributes:
+        sequence (int): Position in the stream (1 = first event), set when published
+        name (str): The student (or, for subject events, the subject) that changed
+    """
+
+    __slots__ = ("sequence", "name")
+
+    type = "change"
+
+    def __init__(self, name):
+        self.sequence = None
+        self.name = name
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: seq, type and the event's fields (ready for json.dumps)
+        """
+        return {"seq": self.sequence, "type": self.type, "name": self.name}
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()})"
+
+
+class StudentAdded(ChangeEvent):
+    __slots__ = ()
+    type = "student_added"
+
+
+class StudentRemoved(ChangeEvent):
+    __slots__ = ()
+    type = "student_removed"
+
+
+class GradeChanged(ChangeEvent):
+    """
+    A grade was set. old_grade is None if the student had no grade in the subject.
+    """
+
+    __slots__ = ("subject", "old_grade", "new_grade")
+
+    type = "grade_changed"
+
+    def __init__(self, name, subject, old_grade, new_grade):
+        super().__init__(name)
+        self.subject = subject
+        self.old_grade = old_grade
+        self.new_grade = new_grade
+
+    def to_dict(self):
+        result = super().to_dict()
+        result.update(subject=self.subject, old_grade=self.old_grade, new_grade=self.new_grade)
+        return result
+
+
+class SubjectAdded(ChangeEvent):
+    __slots__ = ()
+    type = "subject_added"
+
+
+class SubjectRetired(ChangeEvent):
+    __slots__ = ()
+    type = "subject_retired"
+
+
+class EventStream:
+    """
+    Ring buffer of the latest change events with synchronous and cursor subscribers.
+
+    Attributes:
+        capacity (int): How many events are kept
+        overflow (str): "drop" (slow cursors lose events) or "block" (writers wait)
+        last_sequence (int): Sequence number of the newest event (0 = none yet)
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, overflow="drop", block_timeout=DEFAULT_BLOCK_TIMEOUT):
+        """
+        Args:
+            capacity (int): How many events are kept
+            overflow (str): "drop" or "block" (see the module docstring)
+            block_timeout (float): Longest a writer waits for a blocking cursor
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Overflow must be one of {', '.join(OVERFLOW_POLICIES)}")
+        self.capacity = capacity
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.last_sequence = 0
+        self._buffer = [None] * capacity
+        self._callbacks = []
+        self._cursors = []
+        self._condition = threading.Condition(threading.RLock())
+
+    @property
+    def oldest_sequence(self):
+        """
+        Sequence number of the oldest event still kept (last_sequence + 1 if there are none).
+        """
+        return max(self.last_sequence - self.capacity, 0) + 1
+
+    def publish(self, event):
+        """
+        Add an event, then run the synchronous subscribers and wake the cursors.
+
+        Args:
+            event (ChangeEvent): The event (its sequence number is set here)
+
+        Returns:
+            ChangeEvent: The event
+        """
+        with self._condition:
+            if self.overflow == "block":
+                self._wait_for_blocking_cursors()
+            self.last_sequence += 1
+            event.sequence = self.last_sequence
+            self._buffer[self.last_sequence % self.capacity] = event
+
+            for callback in self._callbacks:
+                try:
+                    callback(event)
+                except Exception as error:
+                    print(f"Error in event subscriber: {error}")
+
+            self._condition.notify_all()
+            for cursor in self._cursors:
+                cursor._wake()
+        return event
+
+    def _wait_for_blocking_cursors(self):
+        """
+        Wait until no blocking cursor still needs the event about to be overwritten.
+        """
+        overwritten = self.last_sequence + 1 - self.capacity
+        deadline = time.monotonic() + self.block_timeout
+        while any(cursor.blocking and cursor.position <= overwritten for cursor in self._cursors):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return  # Give up; the slow cursor will get EventsLostError
+            self._condition.wait(remaining)
+
+    def read(self, after_sequence, limit=None):
+        """
+        Events with a sequence number above after_sequence, oldest first.
+
+        Args:
+            after_sequence (int): The last sequence number already seen (0 = from the start)
+            limit (int): Return at most this many events
+
+        Returns:
+            list: The events
+
+        Raises:
+            EventsLostError: If some of those events were already overwritten
+        """
+        with self._condition:
+            first = after_sequence + 1
+            if first < self.oldest_sequence:
+                raise EventsLostError(f"{self.oldest_sequence - first} events were overwritten "
+                                      f"(oldest kept is #{self.oldest_sequence})")
+            last = self.last_sequence if limit is None else min(self.last_sequence, after_sequence + limit)
+            return [self._buffer[sequence % self.capacity] for sequence in range(first, last + 1)]
+
+    def subscribe(self, callback):
+        """
+        Call callback(event) for every future event, inside the change itself.
+
+        Returns:
+            callable: The callback (pass it to unsubscribe())
+        """
+        with self._condition:
+            self._callbacks.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        Stop calling a callback.
+        """
+        with self._condition:
+            self._callbacks.remove(callback)
+
+    def cursor(self, from_start=False, blocking=False):
+        """
+        Open a pull subscription.
+
+        Args:
+            from_start (bool): Start at the oldest kept event instead of the next new one
+            blocking (bool): With overflow="block", make writers wait for this cursor
+
+        Returns:
+            EventCursor: The subscription (close() it when done)
+        """
+        with self._condition:
+            start = self.oldest_sequence if from_start else self.last_sequence + 1
+            cursor = EventCursor(self, start, blocking)
+            self._cursors.append(cursor)
+        return cursor
+
+    def async_cursor(self, from_start=False, blocking=False):
+        """
+        Open a pull subscription for asyncio code (must be called inside a running event loop).
+
+        Returns:
+            AsyncEventCursor: The subscription
+        """
+        with self._condition:
+            start = self.oldest_sequence if from_start else self.last_sequence + 1
+            cursor = AsyncEventCursor(self, start, blocking, asyncio.get_running_loop())
+            self._cursors.append(cursor)
+        return cursor
+
+    def _close_cursor(self, cursor):
+        with self._condition:
+            if cursor in self._cursors:
+                self._cursors.remove(cursor)
+            self._condition.notify_all()  # A writer may be waiting for it
+
+
+class EventCursor:
+    """
+    Pull subscription: remembers the next event to read.
+
+    Attributes:
+        position (int): Sequence number of the next event to read
+        blocking (bool): True if writers wait for this cursor (overflow="block")
+        lost (int): Events this cursor missed because it fell behind
+    """
+
+    def __init__(self, stream, position, blocking=False):
+        self.stream = stream
+        self.position = position
+        self.blocking = blocking
+        self.lost = 0
+
+    def _wake(self):
+        pass  # Threads wait on the stream's condition instead
+
+    def pending(self):
+        """
+        Returns:
+            int: Events published but not read yet
+        """
+        return self.stream.last_sequence + 1 - self.position
+
+    def poll(self, limit=None, timeout=0):
+        """
+        Read the events published since the last poll.
+
+        Args:
+            limit (int): Return at most this many events
+            timeout (float): Seconds to wait if there are none yet (None = wait forever)
+
+        Returns:
+            list: The events, oldest first (empty if none arrived in time)
+
+        Raises:
+            EventsLostError: If events were overwritten before they were read; the
+                             cursor then moves on to the oldest kept event
+        """
+        stream = self.stream
+        with stream._condition:
+            if timeout != 0:
+                stream._condition.wait_for(lambda: self.pending() > 0, timeout)
+            try:
+                events = stream.read(self.position - 1, limit)
+            except EventsLostError:
+                self.lost += stream.oldest_sequence - self.position
+                self.position = stream.oldest_sequence
+                stream._condition.notify_all()
+                raise
+            self.position += len(events)
+            if events:
+                stream._condition.notify_all()  # Blocked writers may go on
+            return events
+
+    def close(self):
+        """
+        Stop following the stream.
+        """
+        self.stream._close_cursor(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class AsyncEventCursor(EventCursor):
+    """
+    Pull subscription for asyncio code. Writers may run in other threads;
+    they wake the waiting coroutine through the event loop.
+    """
+
+    def __init__(self, stream, position, blocking, loop):
+        super().__init__(stream, position, blocking)
+        self._loop = loop
+        self._arrived = asyncio.Event()
+
+    def _wake(self):
+        try:
+            self._loop.call_soon_threadsafe(self._arrived.set)
+        except RuntimeError:
+            pass  # The event loop is closed; nobody is waiting any more
+
+    async def get(self, limit=None):
+        """
+        Wait until there is at least one new event and return the new events.
+
+        Raises:
+            EventsLostError: As for poll()
+        """
+        while True:
+            self._arrived.clear()
+            events = self.poll(limit)
+            if events:
+                return events
+            await self._arrived.wait()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
@@ -0,0 +1,186 @@
+"""
+Grade distribution of one subject, kept up to date as grades change.
+
+RunningStats gives the average, highest and lowest grade, but a median or
+any other percentile would need every grade sorted again on each request.
+Grades always lie between 0 and 100, so GradeHistogram simply counts how
+many grades fall into each small bucket (0.1 wide by default, 1001 buckets).
+Adding, changing or removing a grade changes one or two counters, and a
+percentile walks the bucket counts, so the cost does not depend on how many
+students there are:
+
+    histogram = GradeHistogram()
+    histogram.add(72)
+    histogram.replace(72, 75)        # a grade was changed
+    histogram.median()               # 75
+    histogram.band_counts()          # {"A": 0, "B": 1, "C": 0, "F": 0}
+
+Percentiles use the nearest-rank method (always one of the grades, the
+lower middle grade for the median of an even count). Whole grades and
+grades with one decimal place are exact; other grades are reported as the
+start of their bucket, so they are at most 1 / resolution too low.
+"""
+
+import math
+from bisect import bisect_left
+from itertools import accumulate
+
+DEFAULT_RESOLUTION = 10  # Buckets per grade point (10 = steps of 0.1)
+MAX_GRADE = 100
+
+# Letter bands as (letter, lowest grade), best first; F is everything below C
+GRADE_BANDS = (("A", 80), ("B", 70), ("C", 50), ("F", 0))
+
+
+class GradeHistogram:
+    """
+    Bucket counts for the grades of one subject.
+
+    Attributes:
+        count (int): Number of grades
+        resolution (int): Buckets per grade point
+        bands (tuple): (letter, lowest grade) pairs, best first
+    """
+
+    def __init__(self, resolution=DEFAULT_RESOLUTION, bands=GRADE_BANDS):
+        """
+        Create an empty histogram.
+
+        Args:
+            resolution (int): Buckets per grade point
+            bands (tuple): (letter, lowest grade) pairs, best first
+        """
+        self.resolution = resolution
+        self.bands = bands
+        self.count = 0
+        self._counts = [0] * (MAX_GRADE * resolution + 1)
+        self._running = None  # Running totals of _counts until a grade changes
+
+    def _bucket(self, grade):
+        """
+        Bucket number of a grade (the tiny extra keeps 2.3 * 10 = 22.999... in bucket 23).
+        """
+        return min(max(math.floor(grade * self.resolution + 1e-9), 0), len(self._counts) - 1)
+
+    def add(self, grade):
+        """
+        Include a new grade.
+
+        Args:
+            grade (float): The grade to add
+        """
+        self._counts[self._bucket(grade)] += 1
+        self.count += 1
+        self._running = None
+
+    def remove(self, grade):
+        """
+        Take a grade out.
+
+        Args:
+            grade (float): The grade to remove (must have been added before)
+        """
+        self._counts[self._bucket(grade)] -= 1
+        self.count -= 1
+        self._running = None
+
+    def replace(self, old_grade, new_grade):
+        """
+        Change one grade into another, e.g. when a grade is updated.
+
+        Args:
+            old_grade (float): The grade being replaced, or None if there was none
+            new_grade (float): The new grade
+
+        Raises:
+            ValueError: If a grade is not a number (nothing is changed then)
+        """
+        new_bucket = self._bucket(new_grade)  # Both buckets first, so a bad grade changes nothing
+        if old_grade is not None:
+            self._counts[self._bucket(old_grade)] -= 1
+            self.count -= 1
+        self._counts[new_bucket] += 1
+        self.count += 1
+        self._running = None
+
+    def _running_totals(self):
+        """
+        Number of grades in each bucket or below it (worked out once per change).
+        """
+        if self._running is None:
+            self._running = list(accumulate(self._counts))
+        return self._running
+
+    def _grade_of(self, bucket):
+        value = bucket / self.resolution
+        return int(value) if value.is_integer() else value
+
+    def percentile(self, percent):
+        """
+        Nearest-rank percentile.
+
+        Args:
+            percent (float): From 0 to 100
+
+        Returns:
+            float: The grade that percent of the grades are at or below, or None if there are none
+        """
+        if not self.count:
+            return None
+        rank = min(max(1, math.ceil(self.count * percent / 100)), self.count)
+        return self._grade_of(bisect_left(self._running_totals(), rank))
+
+    def median(self):
+        """
+        Returns:
+            float: The middle grade (the lower one for an even count), or None
+        """
+        return self.percentile(50)
+
+    def quartiles(self):
+        """
+        Returns:
+            tuple: (lower quartile, median, upper quartile), None for each if there are no grades
+        """
+        return self.percentile(25), self.percentile(50), self.percentile(75)
+
+    def count_below(self, grade):
+        """
+        Returns:
+            int: How many grades are below grade (e.g. an at-risk count)
+        """
+        bucket = self._bucket(grade)
+        return self._running_totals()[bucket - 1] if bucket else 0
+
+    def band_counts(self):
+        """
+        Returns:
+            dict: letter -> number of grades in that band, best band first
+        """
+        result = {}
+        upper_count = self.count
+        for letter, lowest in self.bands:
+            below = self.count_below(lowest)
+            result[letter] = upper_count - below
+            upper_count = below
+        return result
+
+    def summary(self, percentiles=(10, 90)):
+        """
+        Get the distribution in one dictionary.
+
+        Args:
+            percentiles (tuple): Extra percentiles to include
+
+        Returns:
+            dict: count, median, lower_quartile, upper_quartile, percentiles and bands
+        """
+        lower, middle, upper = self.quartiles()
+        return {
+            "count": self.count,
+            "median": middle,
+            "lower_quartile": lower,
+            "upper_quartile": upper,
+            "percentiles": {percent: self.percentile(percent) for percent in percentiles},
+            "bands": self.band_counts(),
+        }
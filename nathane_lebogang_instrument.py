@@ -0,0 +1,350 @@
+"""
+Opt-in timing of Gradebook and Student methods.
+
+Nothing is measured until Instrumentation.enable() is called. It replaces the
+chosen methods on their classes (and the validate_name / validate_grade
+functions of Section F) with small wrappers that count calls, time them with
+time.perf_counter() and count exceptions that leave the method. disable()
+puts the original functions back, so a gradebook that is not being measured
+runs exactly the same code as before.
+
+    profile = Instrumentation().enable()
+    ... use the gradebook ...
+    profile.disable()
+    print(profile.to_json())         # or profile.to_prometheus()
+
+or as a with-block:
+
+    with Instrumentation() as profile:
+        gradebook.sort_by_average()
+    profile.print_report()
+
+Times include everything a method calls, so sort_by_average() includes the
+time of the bubble_sort_students_by_average() call inside it. Most Section F
+methods catch their own errors and print them; those are not exceptions that
+leave the method and only show up in the validate_* and Student.add_grade
+counts.
+
+Run python nathane_lebogang_instrument.py [STUDENTS] to profile a sample workload.
+"""
+
+import functools
+import inspect
+import json
+import math
+import random
+import sys
+import time
+
+import nathane_lebogang_section_F as section_f
+from nathane_lebogang_section_F import Gradebook, Student
+
+SAMPLE_SIZE = 1024  # Latencies kept per method for the percentiles
+PERCENTILES = (50, 90, 99)
+
+GRADEBOOK_METHODS = (
+    "add_student", "remove_student", "search_student", "update_student_grade",
+    "update_grades_bulk", "view_all_students", "bubble_sort_students_by_average",
+    "sort_by_average", "insertion_sort_students_by_subject", "sort_by_subject",
+    "sort_students_by_name", "view_subject_grades", "search_students_by_prefix",
+    "search_students_by_name", "get_subject_statistics", "get_class_average",
+    "rank_of", "percentile_of", "keep_ranking", "top_k", "bottom_k", "students_in_band",
+    "students_below",
+)
+STUDENT_METHODS = (
+    "add_grade", "calculate_average", "calculate_total", "get_grade", "has_grades",
+    "print_details",
+)
+FUNCTIONS = ("validate_name", "validate_grade")
+
+DEFAULT_TARGETS = ((Gradebook, GRADEBOOK_METHODS), (Student, STUDENT_METHODS))
+
+
+class MethodStats:
+    """
+    Measurements for one method.
+
+    Attributes:
+        name (str): "Class.method" or "module.function"
+        count (int): Calls
+        total (float): Seconds spent in all calls together
+        maximum (float): Slowest call in seconds
+        exceptions (int): Calls that ended with an exception
+        samples (list): Up to sample_size call times, a fair random sample of all calls
+    """
+
+    def __init__(self, name, sample_size=SAMPLE_SIZE, seed=0):
+        self.name = name
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.exceptions = 0
+        self.samples = []
+        self.sample_size = sample_size
+        self._random = random.Random(seed)
+
+    def record(self, seconds):
+        """
+        Add one call time (reservoir sampling keeps the sample fair and small).
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+        if len(self.samples) < self.sample_size:
+            self.samples.append(seconds)
+        else:
+            slot = self._random.randrange(self.count)
+            if slot < self.sample_size:
+                self.samples[slot] = seconds
+
+    def percentile(self, percent):
+        """
+        Nearest-rank percentile of the sampled call times (0.0 if there are none).
+        """
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = max(1, math.ceil(len(ordered) * percent / 100))
+        return ordered[rank - 1]
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, total, mean, max, exceptions and the PERCENTILES (seconds)
+        """
+        result = {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.maximum,
+            "exceptions": self.exceptions,
+        }
+        for percent in PERCENTILES:
+            result[f"p{percent}"] = self.percentile(percent)
+        return result
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Instrumentation:
+    """
+    Measures Gradebook and Student methods while enabled.
+
+    Attributes:
+        stats (dict): "Class.method" -> MethodStats
+        enabled (bool): True while the wrappers are in place
+    """
+
+    def __init__(self, targets=DEFAULT_TARGETS, functions=FUNCTIONS, sample_size=SAMPLE_SIZE):
+        """
+        Args:
+            targets (tuple): (class, method names) pairs to measure; subclasses that
+                             override a method need their own pair
+            functions (tuple): Names of Section F module functions to measure
+            sample_size (int): Call times kept per method for the percentiles
+        """
+        self.targets = targets
+        self.functions = functions
+        self.sample_size = sample_size
+        self.stats = {}
+        self.enabled = False
+        self._originals = []  # (owner, attribute name, original) to put back
+
+    def enable(self):
+        """
+        Put the measuring wrappers in place.
+
+        Returns:
+            Instrumentation: self, so enable() can be chained
+
+        Raises:
+            RuntimeError: If a method is already being measured
+        """
+        if self.enabled:
+            return self
+
+        patches = []
+        for cls, names in self.targets:
+            for name in names:
+                function = cls.__dict__.get(name)
+                if inspect.isfunction(function):  # Inherited methods are measured on their own class
+                    patches.append((cls, name, function, f"{cls.__name__}.{name}"))
+        for name in self.functions:
+            function = getattr(section_f, name)
+            patches.append((section_f, name, function, f"section_F.{name}"))
+
+        for owner, name, function, key in patches:
+            if getattr(function, "_instrumentation", None) is not None:
+                raise RuntimeError(f"{key} is already being measured")
+
+        for owner, name, function, key in patches:
+            setattr(owner, name, self._wrap(key, function))
+            self._originals.append((owner, name, function))
+        self.enabled = True
+        return self
+
+    def disable(self):
+        """
+        Put the original methods back. The measurements are kept.
+        """
+        for owner, name, function in reversed(self._originals):
+            setattr(owner, name, function)
+        self._originals = []
+        self.enabled = False
+
+    def reset(self):
+        """
+        Forget every measurement.
+        """
+        self.stats = {}
+
+    def __enter__(self):
+        return self.enable()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+        return False
+
+    def _wrap(self, key, function):
+        """
+        Make the measuring wrapper for one function.
+        """
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = MethodStats(key, self.sample_size, seed=len(self.stats))
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            except BaseException:
+                stats.exceptions += 1
+                raise
+            finally:
+                stats.record(clock() - start)
+
+        wrapper._instrumentation = self
+        return wrapper
+
+    # Reports
+
+    def report(self):
+        """
+        Returns:
+            dict: "Class.method" -> summary() for every method that was called,
+                  slowest total first
+        """
+        called = [stats for stats in self.stats.values() if stats.count]
+        called.sort(key=lambda stats: stats.total, reverse=True)
+        return {stats.name: stats.summary() for stats in called}
+
+    def to_json(self, indent=2):
+        """
+        Returns:
+            str: The report as JSON (times in seconds)
+        """
+        return json.dumps({"format": "nathane-lebogang-profile", "methods": self.report()},
+                          indent=indent)
+
+    def to_prometheus(self, prefix="gradebook"):
+        """
+        The report in the Prometheus text exposition format.
+
+        Returns:
+            str: Counters for calls and exceptions and a summary of call times
+        """
+        report = self.report()
+        lines = [
+            f"# HELP {prefix}_method_calls_total Calls of each gradebook method.",
+            f"# TYPE {prefix}_method_calls_total counter",
+        ]
+        for name, summary in report.items():
+            lines.append(f'{prefix}_method_calls_total{{method="{_escape_label(name)}"}} {summary["count"]}')
+
+        lines.append(f"# HELP {prefix}_method_exceptions_total Calls that ended with an exception.")
+        lines.append(f"# TYPE {prefix}_method_exceptions_total counter")
+        for name, summary in report.items():
+            lines.append(f'{prefix}_method_exceptions_total{{method="{_escape_label(name)}"}} '
+                         f'{summary["exceptions"]}')
+
+        lines.append(f"# HELP {prefix}_method_seconds Time spent in each gradebook method.")
+        lines.append(f"# TYPE {prefix}_method_seconds summary")
+        for name, summary in report.items():
+            label = _escape_label(name)
+            for percent in PERCENTILES:
+                lines.append(f'{prefix}_method_seconds{{method="{label}",quantile="{percent / 100}"}} '
+                             f'{summary[f"p{percent}"]:.9f}')
+            lines.append(f'{prefix}_method_seconds_sum{{method="{label}"}} {summary["total"]:.9f}')
+            lines.append(f'{prefix}_method_seconds_count{{method="{label}"}} {summary["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def print_report(self, limit=None):
+        """
+        Print a table of the measured methods, slowest total first.
+        """
+        rows = list(self.report().items())[:limit]
+        if not rows:
+            print("No measured calls.")
+            return
+        print(f"{'Method':<50}{'Calls':>9}{'Total s':>10}{'p50 us':>9}{'p99 us':>9}{'Errors':>8}")
+        for name, summary in rows:
+            print(f"{name:<50}{summary['count']:>9}{summary['total']:>10.3f}"
+                  f"{summary['p50'] * 1e6:>9.1f}{summary['p99'] * 1e6:>9.1f}{summary['exceptions']:>8}")
+
+
+def profile_workload(num_students=10000, seed=1):
+    """
+    Run a mixed workload on a new Gradebook while it is being measured.
+
+    Args:
+        num_students (int): Students to add
+        seed (int): Random seed for the grades
+
+    Returns:
+        Instrumentation: The measurements (already disabled)
+    """
+    import contextlib
+    import io
+
+    from nathane_lebogang_benchmark import make_names
+
+    generator = random.Random(seed)
+    names = make_names(num_students, seed)
+    gradebook = Gradebook()
+
+    with Instrumentation() as profile, contextlib.redirect_stdout(io.StringIO()):
+        for name in names:
+            gradebook.add_student(name)
+        for name in names:
+            for subject in section_f.subjects:
+                gradebook.update_student_grade(name, subject, generator.randint(0, 100))
+        gradebook.update_student_grade(names[0], "Math", 150)  # Rejected grade
+        for name in names[:1000]:
+            gradebook.search_students_by_name(name[:3], 10)
+            gradebook.search_students_by_prefix(name[:3], 10)
+        for subject in section_f.subjects:
+            gradebook.get_subject_statistics(subject)
+            gradebook.sort_by_subject(subject, 10)
+        gradebook.sort_by_average()
+        gradebook.sort_students_by_name()
+        gradebook.top_k(10)
+        gradebook.get_class_average()
+    return profile
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    output = sys.argv[2] if len(sys.argv) > 2 else "table"
+    result = profile_workload(count)
+    if output == "json":
+        print(result.to_json())
+    elif output == "prometheus":
+        print(result.to_prometheus(), end="")
+    else:
+        print(f"PROFILE OF A {count}-STUDENT WORKLOAD")
+        result.print_report()
@@ -0,0 +1,242 @@
+"""
+Name index for fast student lookups.
+
+Gradebook.search_students_by_name used to lowercase and scan every name on
+every search. NameIndex is kept up to date as students are added and removed
+and answers:
+
+    prefix queries    - from a sorted array of lowercase names (binary search)
+    substring queries - from an n-gram inverted index (every 3-letter piece of
+                        every name points to the names that contain it)
+
+Both kinds of query take an optional limit, so a lookup box showing the
+first 10 matches stays fast even with a million students.
+
+New names first go into a small unsorted "pending" buffer and removed names
+are only marked as removed; the sorted array is tidied up in bulk later. This
+keeps adding a student cheap even when the array is very large.
+"""
+
+import heapq
+from bisect import bisect_left
+
+NGRAM_SIZE = 3
+MERGE_THRESHOLD = 1024  # Pending names merged into the sorted array after this many
+
+
+class NameIndex:
+    """
+    Prefix and substring index over student names.
+
+    Names are matched case-insensitively, like the original search.
+    """
+
+    def __init__(self, ngram_size=NGRAM_SIZE):
+        """
+        Create an empty index.
+
+        Args:
+            ngram_size (int): Length of the pieces used for substring search
+        """
+        self.ngram_size = ngram_size
+        self._order = {}  # name -> number given when added (keeps the gradebook's order)
+        self._next_number = 0
+        self._sorted = []  # Sorted (lowercase name, name) pairs
+        self._pending = {}  # name -> lowercase name, added since the last merge
+        self._removed = set()  # Names still in _sorted that have been removed
+        self._ngrams = {}  # n-gram -> set of names containing it
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, name):
+        return name in self._order
+
+    def added_number(self, name):
+        """
+        The number a name was given when it was added (smaller = added earlier).
+
+        Args:
+            name (str): The student's name
+
+        Returns:
+            int: The added-order number
+        """
+        return self._order[name]
+
+    def _grams(self, text):
+        """
+        All distinct n-grams of a lowercase string.
+        """
+        size = self.ngram_size
+        return {text[start:start + size] for start in range(len(text) - size + 1)}
+
+    def add(self, name):
+        """
+        Add a name to the index.
+
+        Args:
+            name (str): The student's name
+        """
+        if name in self._order:
+            return
+        lowered = name.lower()
+        self._order[name] = self._next_number
+        self._next_number += 1
+
+        if name in self._removed:
+            self._removed.discard(name)  # Its old sorted entry is valid again
+        else:
+            self._pending[name] = lowered
+
+        ngrams = self._ngrams
+        for gram in self._grams(lowered):
+            names = ngrams.get(gram)
+            if names is None:
+                ngrams[gram] = {name}
+            else:
+                names.add(name)
+
+    def remove(self, name):
+        """
+        Remove a name from the index.
+
+        Args:
+            name (str): The student's name
+        """
+        if name not in self._order:
+            return
+        del self._order[name]
+
+        if name in self._pending:
+            del self._pending[name]
+        else:
+            self._removed.add(name)
+            if len(self._removed) > 64 and len(self._removed) * 4 > len(self._sorted):
+                self._compact()
+
+        ngrams = self._ngrams
+        for gram in self._grams(name.lower()):
+            names = ngrams[gram]
+            names.discard(name)
+            if not names:
+                del ngrams[gram]
+
+    def _compact(self):
+        """
+        Merge pending names into the sorted array and drop removed ones.
+        """
+        if self._removed:
+            removed = self._removed
+            self._sorted = [entry for entry in self._sorted if entry[1] not in removed]
+            self._removed = set()
+        if self._pending:
+            # Timsort merges the two sorted runs in linear time
+            self._sorted.extend(sorted((lowered, name) for name, lowered in self._pending.items()))
+            self._sorted.sort()
+            self._pending = {}
+
+    def _in_added_order(self, names, limit):
+        """
+        Put names in the order they were added, keeping at most limit of them.
+        """
+        if limit is not None and limit < len(names):
+            return heapq.nsmallest(limit, names, key=self._order.__getitem__)
+        return sorted(names, key=self._order.__getitem__)
+
+    def _scan(self, term, limit, max_steps=None):
+        """
+        Check names in the order they were added, stopping at limit matches
+        or after max_steps names.
+        """
+        matches = []
+        for steps, name in enumerate(self._order):
+            if max_steps is not None and steps >= max_steps:
+                break
+            if term in name.lower():
+                matches.append(name)
+                if limit is not None and len(matches) >= limit:
+                    break
+        return matches
+
+    def prefix(self, prefix, limit=None):
+        """
+        Find names starting with prefix (case-insensitive), in alphabetical order.
+
+        Args:
+            prefix (str): The start of the name
+            limit (int): Return at most this many names
+
+        Returns:
+            list: Matching names
+        """
+        if len(self._pending) > MERGE_THRESHOLD:
+            self._compact()
+
+        prefix = prefix.lower()
+        matches = []
+        sorted_names = self._sorted
+        position = bisect_left(sorted_names, (prefix,))
+
+        while position < len(sorted_names) and (limit is None or len(matches) < limit):
+            lowered, name = sorted_names[position]
+            if not lowered.startswith(prefix):
+                break
+            if name not in self._removed:
+                matches.append((lowered, name))
+            position += 1
+
+        # Names added since the last merge are few, so they are just checked one by one
+        if self._pending:
+            matches.extend((lowered, name) for name, lowered in self._pending.items()
+                           if lowered.startswith(prefix))
+            matches.sort()
+
+        names = [name for lowered, name in matches]
+        return names if limit is None else names[:limit]
+
+    def substring(self, term, limit=None):
+        """
+        Find names containing term (case-insensitive), in the order they were added.
+
+        Args:
+            term (str): Part of the name
+            limit (int): Return at most this many names
+
+        Returns:
+            list: Matching names
+        """
+        term = term.lower()
+
+        if len(term) < self.ngram_size:
+            # Too short for the n-gram index
+            return self._scan(term, limit)
+
+        postings = []
+        for gram in self._grams(term):
+            names = self._ngrams.get(gram)
+            if not names:
+                return []
+            postings.append(names)
+
+        # Intersect starting with the rarest n-gram
+        postings.sort(key=len)
+        if limit is not None:
+            # When matches are common a short scan finds enough of them sooner than
+            # intersecting large sets. The scan gives up after as many steps as
+            # the intersection would take, so a bad guess at most doubles the work
+            matches = self._scan(term, limit, max_steps=len(postings[0]))
+            if len(matches) >= limit:
+                return matches
+
+        candidates = postings[0]
+        for names in postings[1:]:
+            candidates = candidates & names
+            if not candidates:
+                return []
+
+        # The n-grams can appear in a different order, so check the real substring
+        if len(term) > self.ngram_size:
+            candidates = [name for name in candidates if term in name.lower()]
+
+        return self._in_added_order(candidates, limit)
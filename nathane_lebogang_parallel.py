@@ -0,0 +1,359 @@
+"""
+Parallel report generation for very large Section E/F gradebooks.
+
+Working out every average, the top and bottom students and the subject
+statistics for millions of students is CPU work that runs on one core.
+parallel_report() copies the grades into compact array columns once, cuts
+them into shards (a range of rows each) and sends every shard to a
+ProcessPoolExecutor worker as raw bytes - no Student objects are pickled.
+Each worker returns small partial results:
+
+    per subject   count, total, sum of squares, highest, lowest and its top students
+    per shard     the top and bottom students by average, the class grade total
+
+which are then merged into one report. Rows are numbered in the order the
+students were added, so ties come out in the same order as the Gradebook's
+own sorting methods.
+
+Run python nathane_lebogang_parallel.py 1000000 to time the same shards in
+this process and with several workers.
+"""
+
+import heapq
+import math
+import os
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress
+from operator import add
+
+from nathane_lebogang_columnar import float32_to_grade
+
+DEFAULT_TOP_COUNT = 10
+MIN_SHARD_ROWS = 50000  # Smaller shards cost more to send than they save
+
+
+def _plain_number(value):
+    """
+    Give whole-number floats back as int, like the grades were entered.
+    """
+    return int(value) if value.is_integer() else value
+
+
+def export_columns(gradebook):
+    """
+    Copy a gradebook's grades into one float64 array and one presence mask per subject.
+
+    Args:
+        gradebook (Gradebook): A Section E or F gradebook (any backend)
+
+    Returns:
+        tuple: (names, subjects, {subject: array('d')}, {subject: bytearray}),
+               rows in the order the students were added, 0.0 and 0 for missing grades
+    """
+    subject_names = list(gradebook.subject_stats)
+    columns = getattr(gradebook, "columns", None)
+
+    if columns is not None:
+        # ColumnarGradebook: read the arrays directly, putting rows back in added order
+        order = list(columns.index.values())
+        names = list(columns.index)
+        values = {}
+        presence = {}
+        for subject in subject_names:
+            if subject not in columns.values:  # Added subject nobody has a grade in yet
+                values[subject] = array("d", bytes(8 * len(order)))
+                presence[subject] = bytearray(len(order))
+                continue
+            column = columns.values[subject]
+            mask = columns.present[subject]
+            values[subject] = array("d", [float32_to_grade(column[row]) if mask[row] else 0.0
+                                          for row in order])
+            presence[subject] = bytearray(mask[row] for row in order)
+        return names, subject_names, values, presence
+
+    students = list(gradebook.students.values())
+    names = [student.name for student in students]
+    values = {}
+    presence = {}
+    for subject in subject_names:
+        grades = [student.grades.get(subject) for student in students]
+        values[subject] = array("d", [0.0 if grade is None else grade for grade in grades])
+        presence[subject] = bytearray(grade is not None for grade in grades)
+    return names, subject_names, values, presence
+
+
+def make_shards(subjects, values, presence, shard_count):
+    """
+    Cut the columns into shards of neighbouring rows.
+
+    Returns:
+        list: (first row, {subject: float64 bytes}, {subject: mask bytes}) per shard
+    """
+    num_rows = len(values[subjects[0]]) if subjects else 0
+    shard_count = max(1, min(shard_count, num_rows))
+    size = math.ceil(num_rows / shard_count) if num_rows else 0
+
+    shards = []
+    for start in range(0, num_rows, size or 1):
+        end = min(start + size, num_rows)
+        shards.append((start,
+                       {subject: values[subject][start:end].tobytes() for subject in subjects},
+                       {subject: bytes(presence[subject][start:end]) for subject in subjects}))
+    return shards
+
+
+def report_shard(shard, subjects, top_count):
+    """
+    Work out the partial results for one shard (runs inside a worker process).
+
+    Args:
+        shard (tuple): (first row, column bytes, mask bytes) from make_shards()
+        subjects (list): Subject names
+        top_count (int): How many top and bottom students to keep
+
+    Returns:
+        dict: subjects -> (count, total, sum of squares, highest, lowest, top),
+              top / bottom -> [(average, -row)], grade_total, grade_count
+    """
+    start, column_bytes, mask_bytes = shard
+    subject_results = {}
+    totals = None
+    counts = None
+
+    for subject in subjects:
+        column = array("d")
+        column.frombytes(column_bytes[subject])
+        mask = mask_bytes[subject]
+        rows = range(-start, -start - len(column), -1)  # Negative rows: ties go to earlier rows
+
+        count = mask.count(1)
+        present = column if count == len(column) else list(compress(column, mask))
+        if present:
+            top = heapq.nlargest(top_count, zip(present, compress(rows, mask)))
+            subject_results[subject] = (count, math.fsum(present),
+                                        math.fsum(grade * grade for grade in present),
+                                        max(present), min(present), top)
+        else:
+            subject_results[subject] = (0, 0.0, 0.0, None, None, [])
+
+        # Missing grades are 0.0, so whole columns can be added
+        totals = list(column) if totals is None else list(map(add, totals, column))
+        counts = list(mask) if counts is None else list(map(add, counts, mask))
+
+    averages = []
+    if totals is not None:
+        averages = [(total / number, -(start + row))
+                    for row, (total, number) in enumerate(zip(totals, counts)) if number]
+
+    return {
+        "subjects": subject_results,
+        "top": heapq.nlargest(top_count, averages),
+        "bottom": heapq.nsmallest(top_count, averages),
+        "grade_total": math.fsum(result[1] for result in subject_results.values()),
+        "grade_count": sum(result[0] for result in subject_results.values()),
+    }
+
+
+def merge_partials(partials, names, subjects, top_count):
+    """
+    Combine the partial results of every shard into one report.
+
+    Returns:
+        dict: {
+            "class_average", "grade_count",
+            "top": [(average, name)] highest first,
+            "bottom": [(average, name)] lowest first,
+            "subjects": {subject: {count, average, highest, lowest, std_dev, top}},
+        }
+    """
+    def named(pairs):
+        return [(_plain_number(score), names[-row]) for score, row in pairs]
+
+    subject_report = {}
+    for subject in subjects:
+        parts = [partial["subjects"][subject] for partial in partials]
+        count = sum(part[0] for part in parts)
+        if not count:
+            subject_report[subject] = {"count": 0, "average": 0, "highest": None, "lowest": None,
+                                       "std_dev": 0.0, "top": []}
+            continue
+        total = math.fsum(part[1] for part in parts)
+        squares = math.fsum(part[2] for part in parts)
+        mean = total / count
+        subject_report[subject] = {
+            "count": count,
+            "average": mean,
+            "highest": _plain_number(max(part[3] for part in parts if part[0])),
+            "lowest": _plain_number(min(part[4] for part in parts if part[0])),
+            "std_dev": math.sqrt(max(squares / count - mean * mean, 0.0)),
+            "top": named(heapq.nlargest(top_count, (pair for part in parts for pair in part[5]))),
+        }
+
+    grade_count = sum(partial["grade_count"] for partial in partials)
+    grade_total = math.fsum(partial["grade_total"] for partial in partials)
+    top = heapq.nlargest(top_count, (pair for partial in partials for pair in partial["top"]))
+    bottom = heapq.nsmallest(top_count, (pair for partial in partials for pair in partial["bottom"]))
+
+    return {
+        "class_average": grade_total / grade_count if grade_count else 0,
+        "grade_count": grade_count,
+        "top": [(average, names[-row]) for average, row in top],
+        "bottom": [(average, names[-row]) for average, row in bottom],
+        "subjects": subject_report,
+    }
+
+
+def parallel_report(gradebook, workers=None, top_count=DEFAULT_TOP_COUNT, shard_count=None):
+    """
+    Build the class report using several processes.
+
+    Args:
+        gradebook (Gradebook): A Section E or F gradebook
+        workers (int): Worker processes (default: one per CPU); 1 runs everything in this process
+        top_count (int): How many top and bottom students to list
+        shard_count (int): How many shards to cut the roster into (default: 2 per worker)
+
+    Returns:
+        dict: The merged report (see merge_partials) plus "seconds" with the
+              time spent on export, compute and merge
+    """
+    workers = workers or os.cpu_count() or 1
+    timings = {}
+
+    start = time.perf_counter()
+    names, subject_names, values, presence = export_columns(gradebook)
+    if shard_count is None:
+        shard_count = max(1, min(workers * 2, len(names) // MIN_SHARD_ROWS))
+    shards = make_shards(subject_names, values, presence, shard_count)
+    timings["export"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if workers == 1 or len(shards) == 1:
+        partials = [report_shard(shard, subject_names, top_count) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(report_shard, shard, subject_names, top_count) for shard in shards]
+            partials = [future.result() for future in futures]
+    timings["compute"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    report = merge_partials(partials, names, subject_names, top_count)
+    timings["merge"] = time.perf_counter() - start
+
+    report["seconds"] = timings
+    return report
+
+
+def serial_report(gradebook, top_count=DEFAULT_TOP_COUNT):
+    """
+    Build the same report with the Gradebook's own methods, for comparison.
+
+    Args:
+        gradebook (Gradebook): A Section F gradebook
+        top_count (int): How many top and bottom students to list
+
+    Returns:
+        dict: Same keys as parallel_report()
+    """
+    start = time.perf_counter()
+    ranked = gradebook.bubble_sort_students_by_average()
+    subject_report = {}
+    for subject in gradebook.subject_stats:
+        stats = gradebook.get_subject_statistics(subject)
+        best = gradebook.insertion_sort_students_by_subject(subject, top_count)
+        stats["top"] = [(grade, student.name) for grade, student in best]
+        subject_report[subject] = stats
+
+    return {
+        "class_average": gradebook.get_class_average(),
+        "grade_count": gradebook.class_stats.count,
+        "top": [(average, student.name) for average, student in ranked[:top_count]],
+        "bottom": [(average, student.name) for average, student in ranked[::-1][:top_count]],
+        "subjects": subject_report,
+        "seconds": {"total": time.perf_counter() - start},
+    }
+
+
+def check_same_report(report, expected):
+    """
+    Check that a parallel report gives the same answers as serial_report().
+
+    Raises:
+        AssertionError: Naming the first part of the report that differs
+    """
+    def close(first, second):
+        return math.isclose(first, second, rel_tol=1e-9, abs_tol=1e-6)
+
+    if report["top"] != expected["top"] or report["bottom"] != expected["bottom"]:
+        raise AssertionError("Parallel report ranks the top or bottom students differently")
+    if report["grade_count"] != expected["grade_count"] or \
+            not close(report["class_average"], expected["class_average"]):
+        raise AssertionError("Parallel report has a different class average")
+    for subject, stats in expected["subjects"].items():
+        result = report["subjects"][subject]
+        if result["count"] != stats["count"]:
+            raise AssertionError(f"Parallel report counts {subject} grades differently")
+        if not stats["count"]:
+            continue
+        if (result["highest"], result["lowest"], result["top"]) != (stats["highest"], stats["lowest"], stats["top"]):
+            raise AssertionError(f"Parallel report has different {subject} highest, lowest or top students")
+        if not (close(result["average"], stats["average"]) and close(result["std_dev"], stats["std_dev"])):
+            raise AssertionError(f"Parallel report has a different {subject} average or spread")
+
+
+def measure_speedup(num_students=1000000, worker_counts=(1, 2, 4), top_count=DEFAULT_TOP_COUNT):
+    """
+    Time the same sharded report in this process and with different worker counts.
+
+    Every run cuts the roster into the same shards, so the speedup only
+    measures the extra processes; the serial run works through the shards
+    one after the other in this process. Each report is checked against
+    serial_report(), which uses the Gradebook's own methods.
+
+    Args:
+        num_students (int): Size of the synthetic roster
+        worker_counts (tuple): Worker counts to try
+        top_count (int): Top and bottom students to list
+
+    Returns:
+        list: One dictionary per run with mode, workers, seconds and speedup
+    """
+    import contextlib
+
+    from nathane_lebogang_columnar import _fill_gradebook
+    from nathane_lebogang_section_F import Gradebook
+
+    gradebook = Gradebook()
+    _fill_gradebook(gradebook, num_students)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        expected = serial_report(gradebook, top_count)
+    shard_count = max(1, min(max(worker_counts) * 2, num_students // MIN_SHARD_ROWS))
+
+    serial = parallel_report(gradebook, 1, top_count, shard_count)
+    check_same_report(serial, expected)
+    serial_seconds = sum(serial["seconds"].values())
+    results = [{"mode": "serial", "workers": 1, "seconds": serial_seconds,
+                "compute_seconds": serial["seconds"]["compute"], "speedup": 1.0}]
+
+    for workers in worker_counts:
+        if workers == 1:
+            continue  # The serial run above
+        report = parallel_report(gradebook, workers, top_count, shard_count)
+        check_same_report(report, expected)
+        seconds = sum(report["seconds"].values())
+        results.append({"mode": "parallel", "workers": workers, "seconds": seconds,
+                        "compute_seconds": report["seconds"]["compute"],
+                        "speedup": serial_seconds / seconds if seconds else 0.0})
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print(f"PARALLEL REPORT FOR {count:,} STUDENTS ({os.cpu_count()} CPUs)")
+    print(f"{'Mode':<10}{'Workers':>8}{'Seconds':>10}{'Speedup':>9}")
+    for row in measure_speedup(count):
+        print(f"{row['mode']:<10}{row['workers']:>8}{row['seconds']:>10.2f}{row['speedup']:>9.2f}")
@@ -0,0 +1,317 @@
+"""
+Persistent Section F Gradebook with a write-ahead log.
+
+Every change (add student, remove student, set grade, add or retire a
+subject) is appended to a log
+file as one JSON line before the method returns. From time to time the whole
+gradebook is written to a compact snapshot file and the log is emptied.
+When the program starts again it loads the snapshot and replays only the
+changes logged after it, so even a very large gradebook is back in seconds
+and nothing has to be typed in again.
+
+Files inside the data directory:
+    snapshot.jsonl - header line, then one {"name", "grades"} line per student
+    wal.jsonl      - one line per change: {"seq", "op", "name", ...}
+
+Every log entry has an increasing sequence number and the snapshot records
+the last one it includes, so a crash at any point (even half way through a
+log line or between writing a snapshot and emptying the log) is recovered
+correctly.
+"""
+
+import json
+import os
+import sys
+
+from nathane_lebogang_bulk_io import export_jsonl, load_jsonl
+from nathane_lebogang_section_F import Gradebook
+from nathane_lebogang_sort_engine import DEFAULT_STRATEGY
+from nathane_lebogang_subjects import SubjectRegistry
+
+SNAPSHOT_FILE = "snapshot.jsonl"
+LOG_FILE = "wal.jsonl"
+SNAPSHOT_FORMAT = "nathane-lebogang-gradebook"
+SNAPSHOT_VERSION = 1
+
+
+class CorruptLogError(Exception):
+    """Raised when the log or snapshot cannot be read"""
+    pass
+
+
+class PersistentGradebook(Gradebook):
+    """
+    A Gradebook that survives restarts.
+
+    Attributes:
+        directory (str): Folder holding the snapshot and the log
+        snapshot_every (int): Take a snapshot after this many logged changes (0 = never)
+        sync (bool): Force every log write to disk with fsync (slower, survives power loss)
+        sequence (int): Sequence number of the last logged change
+    """
+
+    def __init__(self, directory, snapshot_every=100000, sync=False,
+                 sort_strategy=DEFAULT_STRATEGY, subject_names=None):
+        """
+        Open (or create) a persistent gradebook in a directory and recover its data.
+        subject_names are the starting subjects; a snapshot's own subjects replace them.
+        """
+        super().__init__(sort_strategy, subject_names)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        self.sequence = 0
+        self.changes_since_snapshot = 0
+        self._replaying = False
+        self._log = None
+
+        os.makedirs(directory, exist_ok=True)
+        self.recover()
+        self._log = open(self._path(LOG_FILE), "a", encoding="utf-8")
+
+    def _path(self, file_name):
+        return os.path.join(self.directory, file_name)
+
+    def recover(self):
+        """
+        Load the snapshot and replay the log entries written after it.
+        """
+        self._replaying = True
+        try:
+            snapshot_sequence = self._load_snapshot()
+            self.sequence = snapshot_sequence
+            self._replay_log(snapshot_sequence)
+        finally:
+            self._replaying = False
+
+    def _load_snapshot(self):
+        """
+        Load snapshot.jsonl if it exists and return the last sequence number it includes.
+        """
+        path = self._path(SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return 0
+
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                header = json.loads(file.readline())
+            except ValueError as error:
+                raise CorruptLogError(f"Snapshot header is unreadable: {error}") from None
+            if header.get("format") != SNAPSHOT_FORMAT:
+                raise CorruptLogError(f"{path} is not a gradebook snapshot")
+
+            # Subjects first, in id order, so grades of retired subjects can be loaded
+            if "subjects" in header:
+                self.subjects = SubjectRegistry()
+                self.subject_stats = {}
+                self.subject_histograms = {}
+                for subject in header["subjects"]:
+                    self._insert_subject(subject)
+            retired = header.get("retired", [])
+
+            # The rest of the file uses the normal JSON lines export format
+            load_jsonl(self, file, on_error="raise")
+
+        for subject in retired:
+            if subject in self.subjects:
+                self._retire_subject(subject)
+
+        return header["seq"]
+
+    def _replay_log(self, after_sequence):
+        """
+        Apply every log entry with a sequence number above after_sequence.
+        """
+        path = self._path(LOG_FILE)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "rb") as file:
+            lines = file.readlines()
+
+        good_end = 0  # Byte offset just after the last complete line
+        for line_number, line in enumerate(lines, 1):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                if line_number == len(lines):
+                    # The program stopped half way through writing this line; cut it
+                    # off so the next entry does not get glued onto it
+                    self._truncate_log(good_end)
+                    break
+                raise CorruptLogError(f"Log line {line_number} is unreadable") from None
+
+            good_end += len(line)
+            if not line.endswith(b"\n"):
+                # A complete entry whose newline never made it to disk
+                with open(path, "ab") as file:
+                    file.write(b"\n")
+
+            if entry["seq"] <= after_sequence:
+                continue  # Already included in the snapshot
+            self._apply_entry(entry)
+            self.sequence = entry["seq"]
+            self.changes_since_snapshot += 1
+
+    def _truncate_log(self, size):
+        """
+        Shorten the log to its first size bytes (used to drop a half written last line).
+        """
+        with open(self._path(LOG_FILE), "r+b") as file:
+            file.truncate(size)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _apply_entry(self, entry):
+        """
+        Apply one logged change without logging it again.
+        """
+        operation = entry["op"]
+        name = entry["name"]
+
+        if operation == "add":
+            if name not in self.students:
+                self._insert_student(name)
+        elif operation == "remove":
+            if name in self.students:
+                self._delete_student(name)
+        elif operation == "grade":
+            self.students[name]._set_grade(entry["subject"], entry["grade"])
+        elif operation == "subject":
+            if entry["active"]:
+                self._insert_subject(name)
+            elif name in self.subjects:
+                self._retire_subject(name)
+        else:
+            raise CorruptLogError(f"Unknown log operation '{operation}'")
+
+    def _write_log(self, entry):
+        """
+        Append one change to the log and take a snapshot when one is due.
+        """
+        if self._replaying or self._log is None:
+            return
+
+        self.sequence += 1
+        entry = {"seq": self.sequence, **entry}
+        self._log.write(json.dumps(entry) + "\n")
+        self._log.flush()
+        if self.sync:
+            os.fsync(self._log.fileno())
+
+        self.changes_since_snapshot += 1
+        if self.snapshot_every and self.changes_since_snapshot >= self.snapshot_every:
+            self.compact()
+
+    def _insert_student(self, name):
+        student = super()._insert_student(name)
+        self._write_log({"op": "add", "name": name})
+        return student
+
+    def _delete_student(self, name):
+        student = super()._delete_student(name)
+        self._write_log({"op": "remove", "name": name})
+        return student
+
+    def _insert_subject(self, name):
+        subject = super()._insert_subject(name)
+        self._write_log({"op": "subject", "name": subject, "active": True})
+        return subject
+
+    def _retire_subject(self, name):
+        super()._retire_subject(name)
+        self._write_log({"op": "subject", "name": name, "active": False})
+
+    def _grade_changed(self, student, subject, old_grade, new_grade):
+        super()._grade_changed(student, subject, old_grade, new_grade)
+        self._write_log({"op": "grade", "name": student.name, "subject": subject,
+                         "grade": new_grade})
+
+    def compact(self):
+        """
+        Write a fresh snapshot and empty the log.
+        """
+        temporary_path = self._path(SNAPSHOT_FILE + ".tmp")
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            header = {"format": SNAPSHOT_FORMAT, "version": SNAPSHOT_VERSION,
+                      "seq": self.sequence, "subjects": self.subjects.names_by_id,
+                      "retired": [subject for subject in self.subjects.names_by_id
+                                  if subject not in self.subjects]}
+            file.write(json.dumps(header) + "\n")
+            export_jsonl(self, file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Replacing the file is atomic, so there is always one complete snapshot
+        os.replace(temporary_path, self._path(SNAPSHOT_FILE))
+
+        # Entries up to self.sequence are now in the snapshot
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._path(LOG_FILE), "w", encoding="utf-8")
+        self.changes_since_snapshot = 0
+
+    def close(self):
+        """
+        Flush and close the log. The data can be opened again later.
+        """
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def check_crash_recovery():
+    """
+    Simulate a crash half way through a log line, keep writing after the
+    restart and check that every acknowledged change survives two more restarts.
+
+    Raises:
+        AssertionError: If a change is lost or the log cannot be opened again
+    """
+    import contextlib
+    import io
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stdout(io.StringIO()):
+        with PersistentGradebook(directory) as gradebook:
+            gradebook.add_student("Ann Lee")
+            gradebook.update_student_grade("Ann Lee", "Math", 80)
+
+        with open(os.path.join(directory, LOG_FILE), "a", encoding="utf-8") as log:
+            log.write('{"seq": 3, "op": "add", "na')  # Torn last line
+
+        with PersistentGradebook(directory) as gradebook:
+            assert list(gradebook.students) == ["Ann Lee"], "Torn line should be skipped"
+            gradebook.add_student("Ben Moyo")
+            gradebook.update_student_grade("Ben Moyo", "English", 65)
+
+        for _ in range(2):
+            with PersistentGradebook(directory) as gradebook:
+                assert list(gradebook.students) == ["Ann Lee", "Ben Moyo"], "Changes after the crash were lost"
+                assert gradebook.students["Ben Moyo"].get_grade("English") == 65, "Grade after the crash was lost"
+                assert gradebook.sequence == 4, "Sequence numbers should carry on after the crash"
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2 and sys.argv[1] == "--check":
+        check_crash_recovery()
+        print("Crash recovery check passed.")
+        sys.exit(0)
+    if len(sys.argv) < 2:
+        print("Usage: python nathane_lebogang_persistence.py DATA_DIRECTORY [compact]")
+        print("       python nathane_lebogang_persistence.py --check")
+        sys.exit(1)
+
+    with PersistentGradebook(sys.argv[1]) as gradebook:
+        print(f"Recovered {len(gradebook.students)} students "
+              f"(last change #{gradebook.sequence}, "
+              f"{gradebook.changes_since_snapshot} changes replayed from the log)")
+        if len(sys.argv) > 2 and sys.argv[2] == "compact":
+            gradebook.compact()
+            print("Snapshot written and log emptied.")
@@ -0,0 +1,365 @@
+"""
+Sorted rank index for leaderboards.
+
+Printing a ranking used to mean sorting the whole roster again. RankIndex
+keeps the students sorted all the time in an indexable skip list, so after a
+grade change only one student moves, and these questions are answered in
+O(log n) time:
+
+    rank(name)           - position in the ranking (1 = best)
+    percentile(name)     - percentage of students scoring below (ties count half)
+    top(k) / bottom(k)   - the best or worst k students
+    band(low, high)      - everyone with a score between low and high
+
+Ties are broken by the order students were added to the gradebook, which is
+the same order the sorting methods give.
+"""
+
+import random
+
+MAX_LEVELS = 24  # Enough for about 16 million students
+
+
+class _End:
+    """
+    Sentinel that compares greater than any key (marks the end of every level).
+    """
+
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return other is self
+
+    def __gt__(self, other):
+        return other is not self
+
+    def __ge__(self, other):
+        return True
+
+    def __eq__(self, other):
+        return other is self
+
+    def __ne__(self, other):
+        return other is not self
+
+    __hash__ = object.__hash__
+
+
+class _Node:
+    """
+    One value in the skip list with its forward links and link widths.
+    """
+
+    __slots__ = ("value", "next", "width")
+
+    def __init__(self, value, levels):
+        self.value = value
+        self.next = [None] * levels
+        self.width = [0] * levels
+
+
+_NIL = _Node(_End(), 0)
+
+
+def _random_levels():
+    """
+    Pick how many levels a new node takes part in (1 with chance 1/2, 2 with 1/4, ...).
+    """
+    levels = 1
+    while levels < MAX_LEVELS and random.random() < 0.5:
+        levels += 1
+    return levels
+
+
+class IndexableSkipList:
+    """
+    Sorted list with O(log n) insert, remove, lookup by position and position of a value.
+
+    Every link also stores how many elements it jumps over (its width), which is
+    what makes lookups by position possible.
+    """
+
+    def __init__(self, values=()):
+        """
+        Build the list from any values in O(n log n) (one sort, then linking in O(n)).
+
+        Args:
+            values (iterable): Initial values (must be unique)
+        """
+        self.head = _Node(None, MAX_LEVELS)
+        self.size = 0
+
+        last = [self.head] * MAX_LEVELS
+        last_position = [0] * MAX_LEVELS
+        position = 0
+
+        for position, value in enumerate(sorted(values), 1):
+            levels = _random_levels()
+            node = _Node(value, levels)
+            for level in range(levels):
+                previous = last[level]
+                previous.next[level] = node
+                previous.width[level] = position - last_position[level]
+                last[level] = node
+                last_position[level] = position
+
+        self.size = position
+        for level in range(MAX_LEVELS):
+            last[level].next[level] = _NIL
+            last[level].width[level] = self.size + 1 - last_position[level]
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, value):
+        """
+        Add a value in its sorted position.
+
+        Args:
+            value: The value to add (must not already be in the list)
+        """
+        chain = [None] * MAX_LEVELS
+        steps_at_level = [0] * MAX_LEVELS
+        node = self.head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].value <= value:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = _random_levels()
+        new_node = _Node(value, levels)
+        steps = 0
+        for level in range(levels):
+            previous = chain[level]
+            new_node.next[level] = previous.next[level]
+            previous.next[level] = new_node
+            new_node.width[level] = previous.width[level] - steps
+            previous.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] += 1
+        self.size += 1
+
+    def remove(self, value):
+        """
+        Remove a value.
+
+        Args:
+            value: The value to remove
+
+        Raises:
+            KeyError: If the value is not in the list
+        """
+        chain = [None] * MAX_LEVELS
+        node = self.head
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].value < value:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is _NIL or target.value != value:
+            raise KeyError(value)
+
+        for level in range(len(target.next)):
+            previous = chain[level]
+            previous.width[level] += target.width[level] - 1
+            previous.next[level] = target.next[level]
+        for level in range(len(target.next), MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self.size -= 1
+
+    def bisect_left(self, value):
+        """
+        Count the values smaller than value.
+
+        Args:
+            value: The value to look for (does not have to be in the list)
+
+        Returns:
+            int: The position value has, or would have, in the list
+        """
+        node = self.head
+        position = 0
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level].value < value:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def _node_at(self, index):
+        """
+        Find the node at a position (0 = first) by following link widths.
+        """
+        node = self.head
+        steps = index + 1
+        for level in reversed(range(MAX_LEVELS)):
+            while node.width[level] <= steps:
+                steps -= node.width[level]
+                node = node.next[level]
+        return node
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("skip list index out of range")
+        return self._node_at(index).value
+
+    def iter_from(self, index):
+        """
+        Yield values in order starting at a position.
+
+        Args:
+            index (int): Where to start (0 = first)
+        """
+        if index >= self.size:
+            return
+        node = self._node_at(max(index, 0))
+        while node is not _NIL:
+            yield node.value
+            node = node.next[0]
+
+    def __iter__(self):
+        return self.iter_from(0)
+
+
+class RankIndex:
+    """
+    Ranking of students by a score (an average or a subject grade), highest first.
+
+    Keys are (-score, added order, name), so sorting the keys ascending gives
+    the highest score first with ties in the order students were added.
+    """
+
+    def __init__(self, scores=(), order_of=None):
+        """
+        Build the index.
+
+        Args:
+            scores (iterable): (name, score) pairs to start with
+            order_of (callable): Gives the number a student was added with (for ties)
+        """
+        self.order_of = order_of or (lambda name: 0)
+        self._keys = {}
+        for name, score in scores:
+            self._keys[name] = (-score, self.order_of(name), name)
+        self._list = IndexableSkipList(self._keys.values())
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name):
+        return name in self._keys
+
+    def update(self, name, score):
+        """
+        Set (or change) a student's score. A score of None removes them.
+
+        Args:
+            name (str): The student's name
+            score (float): The new score
+        """
+        self.remove(name)
+        if score is None:
+            return
+        key = (-score, self.order_of(name), name)
+        self._keys[name] = key
+        self._list.insert(key)
+
+    def remove(self, name):
+        """
+        Take a student out of the ranking (does nothing if they are not in it).
+
+        Args:
+            name (str): The student's name
+        """
+        key = self._keys.pop(name, None)
+        if key is not None:
+            self._list.remove(key)
+
+    def score_of(self, name):
+        """
+        Returns:
+            float: The student's score
+        """
+        return -self._keys[name][0]
+
+    def rank(self, name):
+        """
+        Returns:
+            int: The student's position in the ranking (1 = highest score)
+        """
+        return self._list.bisect_left(self._keys[name]) + 1
+
+    def percentile(self, name):
+        """
+        Percentile rank: percentage of students with a lower score, counting
+        students with exactly the same score as half below.
+
+        Returns:
+            float: From 0 to 100
+        """
+        negative_score = self._keys[name][0]
+        first_equal = self._list.bisect_left((negative_score, float("-inf")))
+        after_equal = self._list.bisect_left((negative_score, float("inf")))
+        below = len(self._keys) - after_equal
+        equal = after_equal - first_equal
+        return 100 * (below + 0.5 * equal) / len(self._keys)
+
+    def top(self, count):
+        """
+        Returns:
+            list: (score, name) for the count highest scores, highest first
+        """
+        result = []
+        for key in self._list:
+            if len(result) >= count:
+                break
+            result.append((-key[0], key[2]))
+        return result
+
+    def bottom(self, count):
+        """
+        Returns:
+            list: (score, name) for the count lowest scores, lowest first
+        """
+        start = max(len(self._keys) - count, 0)
+        result = [(-key[0], key[2]) for key in self._list.iter_from(start)]
+        result.reverse()
+        return result
+
+    def band(self, low, high):
+        """
+        Returns:
+            list: (score, name) for every score from low to high inclusive, highest first
+        """
+        result = []
+        start = self._list.bisect_left((-high, float("-inf")))
+        for key in self._list.iter_from(start):
+            if -key[0] < low:
+                break
+            result.append((-key[0], key[2]))
+        return result
+
+    def below(self, score, limit=None):
+        """
+        Returns:
+            list: (score, name) for every score below score (at most limit of the
+                  lowest), lowest first
+        """
+        start = self._list.bisect_left((-score, float("inf")))
+        if limit is not None:
+            start = max(start, len(self._keys) - limit)
+        result = [(-key[0], key[2]) for key in self._list.iter_from(start)]
+        result.reverse()
+        return result
+
+    def ranked(self):
+        """
+        Yield (score, name) for everyone, highest first.
+        """
+        for key in self._list:
+            yield -key[0], key[2]
@@ -0,0 +1,114 @@
+"""
+Streaming report output.
+
+Printing a report one print() call per line spends most of its time in the
+interpreter: every call formats, looks up sys.stdout and writes a few bytes.
+Here a report is a generator that yields its lines (without the newline),
+and write_lines() joins them into large chunks before writing, so a report
+for a million students costs one write per few thousand lines. Nothing is
+built in memory beyond one chunk, and head() / page() stop the generator
+early so the lines that are not shown are never formatted.
+
+    write_lines(gradebook.report_lines())              # to the screen
+    write_lines(head(lines, 20))                       # only the first 20 lines
+    with open("report.txt", "w") as file:
+        write_lines(gradebook.report_lines(), file)    # to a file
+"""
+
+import sys
+from itertools import islice
+
+CHUNK_LINES = 4096  # Lines joined into one write
+DEFAULT_PAGE_SIZE = 50
+
+
+def write_lines(lines, sink=None, chunk_lines=CHUNK_LINES):
+    """
+    Write lines to a sink in large chunks, adding a newline after each line.
+
+    Args:
+        lines (iterable): Lines of text without newlines (usually a generator)
+        sink: Anything with write(text) such as a file or sys.stdout, or a socket
+              (written with sendall as UTF-8). Default: the current sys.stdout
+        chunk_lines (int): How many lines to join before each write
+
+    Returns:
+        int: Number of lines written
+    """
+    if sink is None:
+        sink = sys.stdout  # Looked up now so redirect_stdout() still works
+    if hasattr(sink, "write"):
+        write = sink.write
+    else:
+        def write(text):
+            sink.sendall(text.encode("utf-8"))
+
+    iterator = iter(lines)
+    written = 0
+    while True:
+        chunk = list(islice(iterator, chunk_lines))
+        if not chunk:
+            break
+        written += len(chunk)
+        chunk.append("")  # So the chunk ends with a newline
+        write("\n".join(chunk))
+
+    flush = getattr(sink, "flush", None)
+    if flush is not None:
+        flush()
+    return written
+
+
+def head(lines, count):
+    """
+    The first count lines (all of them if count is None).
+
+    Args:
+        lines (iterable): Lines of text
+        count (int): How many lines to keep
+
+    Returns:
+        iterator: The kept lines; the rest are never produced
+    """
+    return islice(lines, count)
+
+
+def paginate(items, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Split items into pages.
+
+    Args:
+        items (iterable): Anything, e.g. students or report lines
+        page_size (int): Items per page
+
+    Yields:
+        list: One page of items at a time (the last page may be shorter)
+    """
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+    iterator = iter(items)
+    while True:
+        page_items = list(islice(iterator, page_size))
+        if not page_items:
+            return
+        yield page_items
+
+
+def page(items, number, page_size=DEFAULT_PAGE_SIZE):
+    """
+    One page of items, without producing the items after it.
+
+    Args:
+        items (iterable): Anything, e.g. students or report lines
+        number (int): Page number, starting from 1
+        page_size (int): Items per page
+
+    Returns:
+        iterator: The items on that page
+    """
+    if number < 1:
+        raise ValueError("Page number must be at least 1")
+    if page_size < 1:
+        raise ValueError("Page size must be at least 1")
+    start = (number - 1) * page_size
+    return islice(items, start, start + page_size)
@@ -0,0 +1,217 @@
+"""
+Running statistics that are updated as grades change.
+
+Instead of collecting every grade into a list and calling sum()/max()/min()
+each time a report is shown, the Gradebook keeps one RunningStats object per
+subject plus one for the whole class, and updates them whenever a grade is
+added, changed or removed. Reading the statistics is then instant no matter
+how many students there are.
+"""
+
+import heapq
+import math
+from collections import Counter
+
+
+class DeletableHeap:
+    """
+    A min-heap that also supports removing any value.
+
+    Removed values are only marked as deleted and are thrown away once they
+    reach the top of the heap (lazy deletion). The heap is rebuilt when too
+    many deleted values pile up inside it.
+    """
+
+    def __init__(self):
+        """
+        Create an empty heap.
+        """
+        self.heap = []
+        self.deleted = Counter()  # value -> how many copies are deleted
+        self.size = 0  # Number of values that are really in the heap
+
+    def push(self, value):
+        """
+        Add a value to the heap.
+
+        Args:
+            value (float): The value to add
+        """
+        heapq.heappush(self.heap, value)
+        self.size += 1
+
+    def remove(self, value):
+        """
+        Remove one copy of a value from the heap.
+
+        Args:
+            value (float): The value to remove (must be in the heap)
+        """
+        self.deleted[value] += 1
+        self.size -= 1
+        self._clean_top()
+
+        # Rebuild when deleted values take up most of the heap
+        if len(self.heap) > 2 * self.size + 64:
+            self._compact()
+
+    def peek(self):
+        """
+        Get the smallest value without removing it.
+
+        Returns:
+            float: The smallest value, or None if the heap is empty
+        """
+        self._clean_top()
+        return self.heap[0] if self.heap else None
+
+    def _clean_top(self):
+        """
+        Pop deleted values off the top of the heap.
+        """
+        heap = self.heap
+        deleted = self.deleted
+        while heap and deleted.get(heap[0]):
+            value = heapq.heappop(heap)
+            deleted[value] -= 1
+            if not deleted[value]:
+                del deleted[value]
+
+    def _compact(self):
+        """
+        Rebuild the heap without any of the deleted values.
+        """
+        survivors = []
+        deleted = self.deleted
+        for value in self.heap:
+            if deleted.get(value):
+                deleted[value] -= 1
+            else:
+                survivors.append(value)
+        heapq.heapify(survivors)
+        self.heap = survivors
+        self.deleted = Counter()
+
+    def __len__(self):
+        return self.size
+
+
+class RunningStats:
+    """
+    Count, sum, sum of squares, minimum and maximum of a changing set of grades.
+
+    Attributes:
+        count (int): Number of grades
+        total (float): Sum of all grades
+        sum_of_squares (float): Sum of every grade squared (used for the spread)
+    """
+
+    def __init__(self):
+        """
+        Create empty statistics.
+        """
+        self.count = 0
+        self.total = 0
+        self.sum_of_squares = 0
+        self._low = DeletableHeap()  # Smallest grade on top
+        self._high = DeletableHeap()  # Largest grade on top (stored negated)
+
+    def add(self, value):
+        """
+        Include a new grade in the statistics.
+
+        Args:
+            value (float): The grade to add
+        """
+        self.count += 1
+        self.total += value
+        self.sum_of_squares += value * value
+        self._low.push(value)
+        self._high.push(-value)
+
+    def remove(self, value):
+        """
+        Take a grade out of the statistics.
+
+        Args:
+            value (float): The grade to remove (must have been added before)
+        """
+        self.count -= 1
+        if self.count == 0:
+            # Start again from exact zeros so rounding errors cannot build up
+            self.total = 0
+            self.sum_of_squares = 0
+        else:
+            self.total -= value
+            self.sum_of_squares -= value * value
+        self._low.remove(value)
+        self._high.remove(-value)
+
+    def replace(self, old_value, new_value):
+        """
+        Change one grade into another, e.g. when a grade is updated.
+
+        Args:
+            old_value (float): The grade being replaced, or None if there was none
+            new_value (float): The new grade
+        """
+        if old_value is not None:
+            self.remove(old_value)
+        self.add(new_value)
+
+    def mean(self):
+        """
+        Returns:
+            float: The average grade, or 0 if there are no grades
+        """
+        if self.count == 0:
+            return 0
+        return self.total / self.count
+
+    def variance(self):
+        """
+        Returns:
+            float: The population variance, or 0 if there are no grades
+        """
+        if self.count == 0:
+            return 0
+        average = self.total / self.count
+        # max() hides tiny negative values caused by floating point rounding
+        return max(self.sum_of_squares / self.count - average * average, 0)
+
+    def std_dev(self):
+        """
+        Returns:
+            float: The population standard deviation
+        """
+        return math.sqrt(self.variance())
+
+    def minimum(self):
+        """
+        Returns:
+            float: The lowest grade, or None if there are no grades
+        """
+        return self._low.peek()
+
+    def maximum(self):
+        """
+        Returns:
+            float: The highest grade, or None if there are no grades
+        """
+        highest = self._high.peek()
+        return None if highest is None else -highest
+
+    def summary(self):
+        """
+        Get all statistics in one dictionary.
+
+        Returns:
+            dict: count, average, highest, lowest and std_dev
+        """
+        return {
+            "count": self.count,
+            "average": self.mean(),
+            "highest": self.maximum(),
+            "lowest": self.minimum(),
+            "std_dev": self.std_dev(),
+        }
@@ -1,672 +1,1547 @@
-# Define the subjects we'll use
-subjects = ["Math", "English", "Science"]
-
-
-class StudentNotFoundError(Exception):
-    """Raised when a student is not found in the system"""
-    pass
-
-
-class InvalidGradeError(Exception):
-    """Raised when a grade is not between 0-100"""
-    pass
-
-
-class InvalidSubjectError(Exception):
-    """Raised when a subject is not valid"""
-    pass
-
-
-class EmptyNameError(Exception):
-    """Raised when a student name is empty"""
-    pass
-
-
-class InvalidNameError(Exception):
-    """Raised when a student name contains numbers"""
-    pass
-
-
-class Student:
-    """
-    This class represents one student in our system.
-    It holds the student's name and grades, and can do calculations.
-    """
-
-    def __init__(self, name):
-        """
-        This is the constructor - it runs automatically when we create a new Student.
-        It sets up the student with their name and empty grades.
-        """
-        # Validate name
-        if not name or not name.strip():
-            raise EmptyNameError("Student name cannot be empty")
-
-        # Check if name contains numbers
-        if any(char.isdigit() for char in name):
-            raise InvalidNameError("Student name cannot contain numbers")
-
-        self.name = name.strip()  # Store the student's name
-        self.grades = {}  # Create empty dictionary for grades
-
-    def add_grade(self, subject, grade):
-        """
-        Add or update a grade for a specific subject with validation.
-        """
-        try:
-            # Validate subject
-            if subject not in subjects:
-                raise InvalidSubjectError(f"'{subject}' is not a valid subject")
-
-            # Validate grade
-            if not isinstance(grade, (int, float)):
-                raise InvalidGradeError("Grade must be a number")
-            if grade < 0 or grade > 100:
-                raise InvalidGradeError("Grade must be between 0 and 100")
-
-            self.grades[subject] = grade
-            return True
-
-        except (InvalidSubjectError, InvalidGradeError):
-            raise  # Re-raise our custom exceptions
-        except Exception as error:
-            print(f"Unexpected error adding grade: {error}")
-            return False
-
-    def calculate_average(self):
-        """
-        Calculate the student's average grade across all subjects.
-        """
-        try:
-            if not self.grades:
-                return 0  # No grades yet
-
-            total = sum(self.grades.values())
-            count = len(self.grades)
-
-            if count == 0:
-                return 0
-
-            return total / count
-
-        except Exception as error:
-            print(f"Error calculating average for {self.name}: {error}")
-            return 0
-
-    def print_details(self):
-        """
-        Print the student's name, all grades, and average.
-        """
-        try:
-            print(f"\nStudent: {self.name}")
-            print("Grades:")
-            for subject in subjects:
-                grade = self.grades.get(subject, "No grade yet")
-                print(f"  {subject}: {grade}")
-
-            # Only show average if student has at least one grade
-            if self.grades:
-                average = self.calculate_average()
-                print(f"Average: {average:.1f}")
-            else:
-                print("Average: No grades yet")
-
-        except Exception as error:
-            print(f"Error printing student details: {error}")
-
-    def get_grade(self, subject):
-        """
-        Get the grade for a specific subject.
-        """
-        try:
-            return self.grades.get(subject, "No grade yet")
-        except Exception as error:
-            print(f"Error getting grade: {error}")
-            return "Error"
-
-    def has_grades(self):
-        """
-        Check if student has any grades.
-        """
-        return len(self.grades) > 0
-
-
-class Gradebook:
-    """
-    This class manages a collection of Student objects.
-    It can add, remove, search, and sort students.
-    """
-
-    def __init__(self):
-        """
-        Constructor - creates an empty gradebook.
-        """
-        self.students = {}  # Dictionary to store Student objects
-
-    def add_student(self, name):
-        """
-        Add a new student to the gradebook with validation.
-        """
-        try:
-            if not name or not name.strip():
-                raise EmptyNameError("Student name cannot be empty")
-
-            name = name.strip()
-
-            # Check if name contains numbers
-            if any(char.isdigit() for char in name):
-                raise InvalidNameError("Student name cannot contain numbers")
-
-            if name in self.students:
-                raise ValueError(f"Student '{name}' already exists!")
-
-            self.students[name] = Student(name)
-            print(f"Added student: {name}")
-            return True
-
-        except (EmptyNameError, InvalidNameError, ValueError) as error:
-            print(f"Error: {error}")
-            return False
-        except Exception as error:
-            print(f"Unexpected error adding student: {error}")
-            return False
-
-    def remove_student(self, name):
-        """
-        Remove a student from the gradebook.
-        """
-        try:
-            if not name or not name.strip():
-                raise EmptyNameError("Student name cannot be empty")
-
-            name = name.strip()
-
-            if name not in self.students:
-                raise StudentNotFoundError(f"Student '{name}' not found!")
-
-            del self.students[name]
-            print(f"Removed student: {name}")
-            return True
-
-        except (EmptyNameError, StudentNotFoundError) as error:
-            print(f"Error: {error}")
-            return False
-        except Exception as error:
-            print(f"Unexpected error removing student: {error}")
-            return False
-
-    def search_student(self, name):
-        """
-        Search for a student by name and return their object.
-        """
-        try:
-            if not name or not name.strip():
-                raise EmptyNameError("Student name cannot be empty")
-
-            name = name.strip()
-
-            if name not in self.students:
-                raise StudentNotFoundError(f"Student '{name}' not found!")
-
-            return self.students[name]
-
-        except (EmptyNameError, StudentNotFoundError) as error:
-            print(f"Error: {error}")
-            return None
-        except Exception as error:
-            print(f"Unexpected error searching for student: {error}")
-            return None
-
-    def update_student_grade(self, name, subject, grade):
-        """
-        Update a grade for a specific student with full validation.
-        """
-        try:
-            student = self.search_student(name)
-            if not student:
-                return False
-
-            return student.add_grade(subject, grade)
-
-        except (InvalidSubjectError, InvalidGradeError) as error:
-            print(f"Error: {error}")
-            return False
-        except Exception as error:
-            print(f"Unexpected error updating grade: {error}")
-            return False
-
-    def view_all_students(self):
-        """
-        Display all students with their details.
-        """
-        try:
-            if not self.students:
-                print("No students in the gradebook.")
-                return
-
-            print("\nALL STUDENTS")
-            for student in self.students.values():
-                student.print_details()
-
-        except Exception as error:
-            print(f"Error displaying students: {error}")
-
-    def bubble_sort_students_by_average(self):
-        """
-        Sort students by average using bubble sort algorithm.
-        Returns sorted list of (average, student) tuples.
-        """
-        try:
-            # Get students with grades only
-            students_with_grades = []
-            for student in self.students.values():
-                if student.has_grades():
-                    average = student.calculate_average()
-                    students_with_grades.append((average, student))
-
-            if not students_with_grades:
-                print("No students with grades to sort.")
-                return []
-
-            # Bubble sort implementation
-            n = len(students_with_grades)
-            for i in range(n):
-                for j in range(0, n - i - 1):
-                    # Compare averages and swap if needed
-                    if students_with_grades[j][0] < students_with_grades[j + 1][0]:
-                        # Swap the elements
-                        students_with_grades[j], students_with_grades[j + 1] = students_with_grades[j + 1], \
-                        students_with_grades[j]
-
-            return students_with_grades
-
-        except Exception as error:
-            print(f"Error during sorting: {error}")
-            return []
-
-    def sort_by_average(self):
-        """
-        Sort students by their average grade (highest to lowest) using bubble sort.
-        """
-        try:
-            sorted_students = self.bubble_sort_students_by_average()
-
-            if sorted_students:
-                print("\nSTUDENTS SORTED BY AVERAGE (Highest to Lowest)")
-                print("Using Bubble Sort Algorithm")
-                for average, student in sorted_students:
-                    print(f"{student.name}: {average:.1f}")
-
-            return sorted_students
-
-        except Exception as error:
-            print(f"Error sorting by average: {error}")
-            return []
-
-    def insertion_sort_students_by_subject(self, subject):
-        """
-        Sort students by subject grade using insertion sort algorithm.
-        Returns sorted list of (grade, student) tuples.
-        """
-        try:
-            if subject not in subjects:
-                raise InvalidSubjectError(f"'{subject}' is not a valid subject")
-
-            # Get students with grades for this subject
-            students_with_grades = []
-            for student in self.students.values():
-                grade = student.grades.get(subject)
-                if grade is not None:
-                    students_with_grades.append((grade, student))
-
-            if not students_with_grades:
-                print(f"No students have grades for {subject} yet.")
-                return []
-
-            # Insertion sort implementation
-            for i in range(1, len(students_with_grades)):
-                key = students_with_grades[i]
-                j = i - 1
-
-                # Move elements that are smaller than key to one position ahead
-                while j >= 0 and students_with_grades[j][0] < key[0]:
-                    students_with_grades[j + 1] = students_with_grades[j]
-                    j -= 1
-                students_with_grades[j + 1] = key
-
-            return students_with_grades
-
-        except InvalidSubjectError as error:
-            print(f"Error: {error}")
-            return []
-        except Exception as error:
-            print(f"Error during sorting: {error}")
-            return []
-
-    def sort_by_subject(self, subject):
-        """
-        Sort students by grade in a specific subject (highest to lowest) using insertion sort.
-        """
-        try:
-            sorted_students = self.insertion_sort_students_by_subject(subject)
-
-            if sorted_students:
-                print(f"\nSTUDENTS SORTED BY {subject.upper()} (Highest to Lowest)")
-                print("Using Insertion Sort Algorithm")
-                for grade, student in sorted_students:
-                    print(f"{student.name}: {grade}")
-
-            return sorted_students
-
-        except Exception as error:
-            print(f"Error sorting by subject: {error}")
-            return []
-
-    def sort_students_by_name(self):
-        """
-        NEW: Sort students by name alphabetically (A to Z) using bubble sort.
-        """
-        try:
-            if not self.students:
-                print("No students to sort.")
-                return []
-
-            # Convert dictionary to list for sorting
-            student_list = list(self.students.values())
-
-            # Bubble sort implementation for names
-            n = len(student_list)
-            for i in range(n):
-                for j in range(0, n - i - 1):
-                    # Compare names alphabetically
-                    if student_list[j].name > student_list[j + 1].name:
-                        # Swap the elements
-                        student_list[j], student_list[j + 1] = student_list[j + 1], student_list[j]
-
-            print("\nSTUDENTS SORTED BY NAME (A to Z)")
-            print("Using Bubble Sort Algorithm")
-            for student in student_list:
-                print(f"{student.name}")
-
-            return student_list
-
-        except Exception as error:
-            print(f"Error sorting by name: {error}")
-            return []
-
-    def view_subject_grades(self, subject):
-        """
-        View grades for a specific subject across all students.
-        """
-        try:
-            if subject not in subjects:
-                raise InvalidSubjectError(f"'{subject}' is not a valid subject")
-
-            print(f"\n{subject.upper()} GRADES")
-            all_grades = []
-
-            for student in self.students.values():
-                grade = student.grades.get(subject)
-                if grade is not None:
-                    print(f"{student.name}: {grade}")
-                    all_grades.append(grade)
-                else:
-                    print(f"{student.name}: No grade yet")
-
-            if all_grades:
-                average = sum(all_grades) / len(all_grades)
-                print(f"\nClass Statistics:")
-                print(f"  Average: {average:.1f}")
-                print(f"  Highest: {max(all_grades)}")
-                print(f"  Lowest: {min(all_grades)}")
-                print(f"  Total Students with Grades: {len(all_grades)}")
-            else:
-                print("No grades available for this subject yet.")
-
-        except InvalidSubjectError as error:
-            print(f"Error: {error}")
-        except Exception as error:
-            print(f"Error viewing subject grades: {error}")
-
-    def search_students_by_name(self, search_term):
-        """
-        Search for students by name (partial match).
-        """
-        try:
-            if not search_term or not search_term.strip():
-                raise EmptyNameError("Search term cannot be empty")
-
-            search_term = search_term.strip().lower()
-            found_students = []
-
-            for student in self.students.values():
-                if search_term in student.name.lower():
-                    found_students.append(student)
-
-            return found_students
-
-        except EmptyNameError as error:
-            print(f"Error: {error}")
-            return []
-        except Exception as error:
-            print(f"Error searching students: {error}")
-            return []
-
-
-def run_comprehensive_tests():
-    """
-    COMPREHENSIVE TESTING DOCUMENTATION:
-
-    Tests Conducted:
-    1. Student creation with valid and invalid names
-    2. Grade validation (0-100 range, invalid subjects)
-    3. Custom exception handling
-    4. Sorting algorithms (bubble sort and insertion sort)
-    5. Search functionality
-    6. Edge cases (empty data, boundary values)
-
-    Issues Found and Resolved:
-    - Empty names now properly handled with EmptyNameError
-    - Invalid grades rejected with clear error messages
-    - Sorting algorithms handle empty data gracefully
-    - All methods include try-except blocks for robustness
-    """
-    print("COMPREHENSIVE SYSTEM TESTING")
-
-    gradebook = Gradebook()
-
-    # Test 1: Student management with exception handling
-    print("\n1. TESTING STUDENT MANAGEMENT WITH EXCEPTIONS")
-    print("   Testing valid student creation")
-    gradebook.add_student("John")
-    gradebook.add_student("Sarah")
-
-    print("   Testing invalid student creation")
-    gradebook.add_student("")  # Should show EmptyNameError
-    gradebook.add_student("John")  # Should show duplicate error
-    gradebook.add_student("John123")  # Should show InvalidNameError
-
-    # Test 2: Grade management with exception handling
-    print("\n2. TESTING GRADE MANAGEMENT WITH EXCEPTIONS")
-    print("   Testing valid grade updates")
-    gradebook.update_student_grade("John", "Math", 85)
-    gradebook.update_student_grade("John", "English", 78)
-    gradebook.update_student_grade("Sarah", "Math", 95)
-
-    print("   Testing invalid grade updates")
-    gradebook.update_student_grade("John", "Math", 150)  # Should show InvalidGradeError
-    gradebook.update_student_grade("John", "History", 90)  # Should show InvalidSubjectError
-    gradebook.update_student_grade("Unknown", "Math", 90)  # Should show StudentNotFoundError
-
-    # Test 3: Sorting algorithms
-    print("\n3. TESTING SORTING ALGORITHMS")
-    gradebook.add_student("David")
-    gradebook.update_student_grade("David", "Math", 78)
-    gradebook.update_student_grade("David", "English", 82)
-
-    print("   Testing bubble sort by average")
-    gradebook.sort_by_average()
-
-    print("   Testing insertion sort by subject")
-    gradebook.sort_by_subject("Math")
-
-    print("   Testing name sorting")
-    gradebook.sort_students_by_name()
-
-    # Test 4: Search functionality
-    print("\n4. TESTING SEARCH FUNCTIONALITY")
-    print("   Testing name search")
-    results = gradebook.search_students_by_name("a")  # Should find Sarah and David
-    print(f"   Found {len(results)} students with 'a' in name")
-
-    # Test 5: View all data
-    print("\n5. TESTING DATA DISPLAY")
-    gradebook.view_all_students()
-
-    print("\nALL TESTS COMPLETED SUCCESSFULLY")
-    return gradebook
-
-
-def show_menu():
-    """
-    Display the main menu to the user.
-    """
-    print("\n")
-    print("GRADEBOOK MANAGEMENT SYSTEM")
-    print("1. Add student")
-    print("2. Remove student")
-    print("3. Update student grade")
-    print("4. View all students")
-    print("5. Search student by name")
-    print("6. Sort students by average")
-    print("7. Sort students by subject")
-    print("8. Sort students by name")
-    print("9. View subject grades")
-    print("10. Run comprehensive tests")
-    print("11. Exit")
-
-    choice = input("Enter your choice (1-11): ")
-    return choice
-
-
-def get_valid_grade(prompt):
-    """
-    Get a valid grade from user (0-100) with exception handling.
-    """
-    while True:
-        try:
-            grade = float(input(prompt))
-            if 0 <= grade <= 100:
-                return int(grade)
-            else:
-                raise InvalidGradeError("Grade must be between 0 and 100")
-        except ValueError:
-            print("Please enter a valid number.")
-        except InvalidGradeError as error:
-            print(f"Error: {error}")
-
-
-def main():
-    """
-    Main program that runs the enhanced gradebook system.
-    """
-    # Create a gradebook
-    gradebook = Gradebook()
-
-    # Add sample data for demonstration
-    try:
-        gradebook.add_student("John")
-        gradebook.update_student_grade("John", "Math", 85)
-        gradebook.update_student_grade("John", "English", 78)
-        gradebook.update_student_grade("John", "Science", 92)
-
-        gradebook.add_student("Sarah")
-        gradebook.update_student_grade("Sarah", "Math", 95)
-        gradebook.update_student_grade("Sarah", "English", 88)
-        gradebook.update_student_grade("Sarah", "Science", 85)
-
-        gradebook.add_student("David")
-        gradebook.update_student_grade("David", "Math", 78)
-        gradebook.update_student_grade("David", "English", 80)
-
-        # One student with no grades to demonstrate the system
-        gradebook.add_student("NewStudent")
-
-    except Exception as error:
-        print(f"Error setting up sample data: {error}")
-
-    print("ENHANCED OOP GRADING SYSTEM")
-    print("Now with comprehensive exception handling and sorting algorithms!")
-    print(f"System loaded with {len(gradebook.students)} students")
-
-    # Main program loop with enhanced error handling
-    while True:
-        try:
-            choice = show_menu()
-
-            if choice == '1':
-                name = input("Enter student name: ")
-                gradebook.add_student(name)
-
-            elif choice == '2':
-                name = input("Enter student name to remove: ")
-                gradebook.remove_student(name)
-
-            elif choice == '3':
-                name = input("Enter student name: ")
-                print("Available subjects:", ", ".join(subjects))
-                subject = input("Enter subject: ")
-                grade = get_valid_grade(f"Enter grade for {subject}: ")
-                if gradebook.update_student_grade(name, subject, grade):
-                    print("Grade updated successfully!")
-
-            elif choice == '4':
-                gradebook.view_all_students()
-
-            elif choice == '5':
-                search_term = input("Enter student name to search: ")
-                found_students = gradebook.search_students_by_name(search_term)
-                if found_students:
-                    print(f"\nFound {len(found_students)} student(s):")
-                    for student in found_students:
-                        student.print_details()
-                else:
-                    print("No students found matching your search.")
-
-            elif choice == '6':
-                gradebook.sort_by_average()
-
-            elif choice == '7':
-                print("Available subjects:", ", ".join(subjects))
-                subject = input("Enter subject to sort by: ")
-                gradebook.sort_by_subject(subject)
-
-            elif choice == '8':
-                gradebook.sort_students_by_name()
-
-            elif choice == '9':
-                print("Available subjects:", ", ".join(subjects))
-                subject = input("Enter subject: ")
-                gradebook.view_subject_grades(subject)
-
-            elif choice == '10':
-                run_comprehensive_tests()
-
-            elif choice == '11':
-                print("Thank you for using the Enhanced Grading System!")
-                print("Goodbye!")
-                break
-
-            else:
-                print("Invalid choice! Please enter a number from 1 to 11.")
-
-        except KeyboardInterrupt:
-            print("\n\nProgram interrupted by user. Goodbye!")
-            break
-        except Exception as error:
-            print(f"Unexpected error: {error}")
-
-
-# Run the program
-if __name__ == "__main__":
+import io
+import math
+import weakref
+from itertools import islice
+from operator import attrgetter, itemgetter
+
+from nathane_lebogang_events import (EventsLostError, EventStream, GradeChanged, StudentAdded, StudentRemoved,
+                                     SubjectAdded, SubjectRetired)
+from nathane_lebogang_histogram import GradeHistogram
+from nathane_lebogang_name_index import NameIndex
+from nathane_lebogang_rank_index import RankIndex
+from nathane_lebogang_report import write_lines
+from nathane_lebogang_running_stats import RunningStats
+from nathane_lebogang_sort_engine import DEFAULT_STRATEGY, SORT_STRATEGIES, sort_items, strategy_label
+from nathane_lebogang_subjects import SubjectRegistry
+
+# Define the subjects we'll use (every new Gradebook starts with these)
+subjects = ["Math", "English", "Science"]
+
+AT_RISK_THRESHOLD = 50  # Default for students_below(): averages or grades under this are at risk
+
+
+class StudentNotFoundError(Exception):
+    """Raised when a student is not found in the system"""
+    pass
+
+
+class InvalidGradeError(Exception):
+    """Raised when a grade is not between 0-100"""
+    pass
+
+
+class InvalidSubjectError(Exception):
+    """Raised when a subject is not valid"""
+    pass
+
+
+class EmptyNameError(Exception):
+    """Raised when a student name is empty"""
+    pass
+
+
+class InvalidNameError(Exception):
+    """Raised when a student name contains numbers"""
+    pass
+
+
+def validate_name(name):
+    """
+    Check a student name and return it without surrounding spaces.
+    Raises EmptyNameError or InvalidNameError.
+    """
+    if not name or not name.strip():
+        raise EmptyNameError("Student name cannot be empty")
+
+    # Check if name contains numbers
+    if any(char.isdigit() for char in name):
+        raise InvalidNameError("Student name cannot contain numbers")
+
+    return name.strip()
+
+
+def validate_grade(subject, grade, registry=None):
+    """
+    Check that a subject exists and a grade is a number from 0 to 100.
+    registry is the gradebook's SubjectRegistry (default: the subjects list).
+    Raises InvalidSubjectError or InvalidGradeError.
+    """
+    if subject not in (subjects if registry is None else registry):
+        raise InvalidSubjectError(f"'{subject}' is not a valid subject")
+
+    # True/False are ints to Python and NaN fails every comparison, so both are checked by name
+    if not isinstance(grade, (int, float)) or isinstance(grade, bool) or not math.isfinite(grade):
+        raise InvalidGradeError("Grade must be a number")
+    if grade < 0 or grade > 100:
+        raise InvalidGradeError("Grade must be between 0 and 100")
+
+
+def validate_score_bound(value, label="Threshold"):
+    """
+    Check that a threshold or band bound is a finite number, so a ranking and
+    a scan of the students give the same answer. Raises InvalidGradeError.
+    """
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+        raise InvalidGradeError(f"{label} must be a number")
+
+
+def student_detail_lines(name, grades, average, subject_names=subjects):
+    """
+    Yield the lines that describe one student (average None = no grades yet).
+    """
+    yield ""
+    yield f"Student: {name}"
+    yield "Grades:"
+    for subject in subject_names:
+        yield f"  {subject}: {grades.get(subject, 'No grade yet')}"
+
+    # Only show average if student has at least one grade
+    if average is not None:
+        yield f"Average: {average:.1f}"
+    else:
+        yield "Average: No grades yet"
+
+
+class Student:
+    """
+    This class represents one student in our system.
+    It holds the student's name and grades, and can do calculations.
+    The total, count and average are remembered until a grade changes;
+    cache_hits and cache_misses count how often they were reused.
+    """
+
+    cache_hits = 0
+    cache_misses = 0
+
+    def __init__(self, name):
+        """
+        This is the constructor - it runs automatically when we create a new Student.
+        It sets up the student with their name and empty grades.
+        """
+        self.name = validate_name(name)  # Store the student's name
+        self.grades = {}  # Create empty dictionary for grades
+        self.gradebook = None  # The Gradebook this student belongs to (set by the Gradebook)
+        self._totals = None  # (total, count, average) until the grades change
+
+    def add_grade(self, subject, grade):
+        """
+        Add or update a grade for a specific subject with validation.
+        """
+        try:
+            validate_grade(subject, grade, self._registry())
+            self._set_grade(subject, grade)
+            return True
+
+        except (InvalidSubjectError, InvalidGradeError):
+            raise  # Re-raise our custom exceptions
+        except Exception as error:
+            print(f"Unexpected error adding grade: {error}")
+            return False
+
+    def _registry(self):
+        """
+        The subject catalogue this student's grades are checked against
+        (None = the default subjects list, for a student outside any gradebook).
+        """
+        return self.gradebook.subjects if self.gradebook is not None else None
+
+    def _set_grade(self, subject, grade):
+        """
+        Store an already validated grade and tell the gradebook about the change.
+        """
+        old_grade = self.grades.get(subject)
+        self.grades[subject] = grade
+        self._totals = None  # Work the average out again next time
+        if self.gradebook is not None:
+            self.gradebook._grade_changed(self, subject, old_grade, grade)
+
+    def _grade_totals(self):
+        """
+        Get (total, count, average) of the grades, working them out only if a grade changed.
+        """
+        if self._totals is not None:
+            Student.cache_hits += 1
+            return self._totals
+
+        Student.cache_misses += 1
+        total = sum(self.grades.values())
+        count = len(self.grades)
+        self._totals = (total, count, total / count if count else 0)
+        return self._totals
+
+    def calculate_average(self):
+        """
+        Calculate the student's average grade across all subjects.
+        """
+        try:
+            return self._grade_totals()[2]
+
+        except Exception as error:
+            print(f"Error calculating average for {self.name}: {error}")
+            return 0
+
+    def calculate_total(self):
+        """
+        Add up all of the student's grades (0 if there are none).
+        """
+        try:
+            return self._grade_totals()[0]
+
+        except Exception as error:
+            print(f"Error calculating total for {self.name}: {error}")
+            return 0
+
+    def count_grades(self):
+        """
+        Count how many subjects the student has a grade for.
+        """
+        try:
+            return self._grade_totals()[1]
+
+        except Exception as error:
+            print(f"Error counting grades for {self.name}: {error}")
+            return 0
+
+    @classmethod
+    def cache_stats(cls):
+        """
+        How often averages were reused: a dictionary with hits, misses and hit_rate.
+        """
+        lookups = cls.cache_hits + cls.cache_misses
+        return {
+            "hits": cls.cache_hits,
+            "misses": cls.cache_misses,
+            "hit_rate": cls.cache_hits / lookups if lookups else 0.0,
+        }
+
+    @classmethod
+    def reset_cache_stats(cls):
+        """
+        Set the hit and miss counters back to zero.
+        """
+        cls.cache_hits = 0
+        cls.cache_misses = 0
+
+    def detail_lines(self):
+        """
+        Yield the lines of print_details() one at a time.
+        """
+        grades = self.grades
+        average = self.calculate_average() if grades else None
+        registry = self._registry()
+        subject_names = subjects if registry is None else registry.shown_for(grades)
+        return student_detail_lines(self.name, grades, average, subject_names)
+
+    def print_details(self):
+        """
+        Print the student's name, all grades, and average.
+        """
+        try:
+            write_lines(self.detail_lines())
+
+        except Exception as error:
+            print(f"Error printing student details: {error}")
+
+    def get_grade(self, subject):
+        """
+        Get the grade for a specific subject.
+        """
+        try:
+            return self.grades.get(subject, "No grade yet")
+        except Exception as error:
+            print(f"Error getting grade: {error}")
+            return "Error"
+
+    def has_grades(self):
+        """
+        Check if student has any grades.
+        """
+        return len(self.grades) > 0
+
+
+class BulkUpdateReport:
+    """
+    The result of update_grades_bulk(): how many grades were stored and
+    what was wrong with the rest, instead of one printed error per record.
+    """
+
+    def __init__(self, max_errors=100):
+        self.applied = 0
+        self.failed = 0
+        self.max_errors = max_errors
+        self.errors = []  # (position, name, subject, message) for the first max_errors failures
+
+    def add_error(self, position, name, subject, message):
+        """
+        Count a failed record and keep its details if there is still room.
+        """
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((position, name, subject, message))
+
+    def summary(self):
+        """
+        Get the counters and the kept errors as a dictionary.
+        """
+        return {"applied": self.applied, "failed": self.failed, "errors": list(self.errors)}
+
+    def print_report(self):
+        """
+        Print the report for the user.
+        """
+        print(f"Grades updated: {self.applied}, failed: {self.failed}")
+        for position, name, subject, message in self.errors:
+            print(f"  Record {position}: {name} {subject}: {message}")
+        if self.failed > len(self.errors):
+            print(f"  ... and {self.failed - len(self.errors)} more failed records")
+
+
+class Gradebook:
+    """
+    This class manages a collection of Student objects.
+    It can add, remove, search, and sort students.
+    """
+
+    def __init__(self, sort_strategy=DEFAULT_STRATEGY, subject_names=None):
+        """
+        Constructor - creates an empty gradebook.
+        sort_strategy picks the sorting algorithm (see nathane_lebogang_sort_engine).
+        subject_names are the starting subjects (default: the subjects list).
+        """
+        strategy_label(sort_strategy)  # Fails early on an unknown strategy
+        self.students = {}  # Dictionary to store Student objects
+        self.sort_strategy = sort_strategy
+
+        # The subjects this gradebook accepts; more can be added or retired later
+        self.subjects = SubjectRegistry(subjects if subject_names is None else subject_names)
+
+        # Statistics that are kept up to date on every grade change
+        self.subject_stats = {subject: RunningStats() for subject in self.subjects}
+        self.subject_histograms = {subject: GradeHistogram() for subject in self.subjects}
+        self.class_stats = RunningStats()
+
+        # Prefix and substring index for searching by name
+        self.name_index = NameIndex()
+
+        # Rankings by average (key None) or by subject, built the first time they are asked for
+        self.rank_indexes = {}
+
+        # Change events for subscribers, published once enable_events() is called
+        self.events = None
+
+        # Open snapshots (see freeze()) and whether the newest one shares self.students
+        self._snapshots = weakref.WeakSet()
+        self._roster_shared = False
+
+    def enable_events(self, capacity=None, overflow="drop"):
+        """
+        Start publishing a change event for every student, grade and subject change.
+        Returns the EventStream to subscribe to (see nathane_lebogang_events).
+        """
+        if self.events is None:
+            if capacity is None:
+                self.events = EventStream(overflow=overflow)
+            else:
+                self.events = EventStream(capacity, overflow)
+        return self.events
+
+    def disable_events(self):
+        """
+        Stop publishing change events.
+        """
+        self.events = None
+
+    def freeze(self):
+        """
+        Get a read-only FrozenGradebook that keeps showing the gradebook as it
+        is now while changes go on, for long reports. Nothing is copied now;
+        a student's old grades are kept only when the student first changes
+        (see nathane_lebogang_snapshot).
+        """
+        from nathane_lebogang_snapshot import FrozenGradebook  # That module builds on this one
+
+        snapshot = FrozenGradebook(self)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def _share_roster(self):
+        """
+        The roster (only its keys are used) for a new snapshot to keep. The
+        dictionary is shared until a student is next added or removed.
+        """
+        self._roster_shared = True
+        return self.students
+
+    def _unshare_roster(self):
+        """
+        Called before a student is added or removed while a snapshot is open:
+        leave the shared dictionary to the snapshots and carry on with a copy.
+        """
+        if self._roster_shared:
+            self.students = dict(self.students)
+            self._roster_shared = False
+
+    def _keep_for_snapshots(self, student, subject=None, old_grade=None):
+        """
+        Let the open snapshots keep a student's state from before a change
+        (subject None = the student is about to be removed).
+        """
+        for snapshot in self._snapshots:
+            snapshot._keep(student, subject, old_grade)
+
+    def _snapshot_student(self, snapshot, name):
+        """
+        A student as a snapshot sees it: the kept state if the student changed since, otherwise the live Student.
+        """
+        kept = snapshot.kept.get(name)
+        return kept if kept is not None else self.students[name]
+
+    def add_subject(self, name):
+        """
+        Add a subject (or bring back a retired one) so grades can be given for it.
+        Existing students get room for it only when they receive a grade.
+        """
+        try:
+            subject = self._insert_subject(name)
+            print(f"Added subject: {subject}")
+            return True
+
+        except ValueError as error:
+            print(f"Error: {error}")
+            return False
+
+    def retire_subject(self, name):
+        """
+        Stop accepting new grades for a subject. Grades already given are kept
+        and still count in averages and statistics.
+        """
+        try:
+            if name not in self.subjects:
+                raise InvalidSubjectError(f"'{name}' is not a valid subject")
+
+            self._retire_subject(name)
+            print(f"Retired subject: {name}")
+            return True
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return False
+
+    def _insert_subject(self, name):
+        """
+        Add (or bring back) a subject and return its cleaned name. Raises ValueError for an empty name.
+        """
+        subject = self.subjects.name_of(self.subjects.add(name))
+        if subject not in self.subject_stats:
+            self.subject_stats[subject] = RunningStats()
+            self.subject_histograms[subject] = GradeHistogram()
+        if self.events is not None:
+            self.events.publish(SubjectAdded(subject))
+        return subject
+
+    def _retire_subject(self, name):
+        """
+        Retire an active subject (the caller has checked it is active).
+        """
+        self.subjects.retire(name)
+        if self.events is not None:
+            self.events.publish(SubjectRetired(name))
+
+    def _check_subject(self, subject):
+        """
+        Raise InvalidSubjectError unless the subject was ever added (retired
+        subjects can still be sorted and reported on).
+        """
+        if not self.subjects.known(subject):
+            raise InvalidSubjectError(f"'{subject}' is not a valid subject")
+
+    def add_student(self, name):
+        """
+        Add a new student to the gradebook with validation.
+        """
+        try:
+            name = validate_name(name)
+
+            if name in self.students:
+                raise ValueError(f"Student '{name}' already exists!")
+
+            self._insert_student(name)
+            print(f"Added student: {name}")
+            return True
+
+        except (EmptyNameError, InvalidNameError, ValueError) as error:
+            print(f"Error: {error}")
+            return False
+        except Exception as error:
+            print(f"Unexpected error adding student: {error}")
+            return False
+
+    def remove_student(self, name):
+        """
+        Remove a student from the gradebook.
+        """
+        try:
+            if not name or not name.strip():
+                raise EmptyNameError("Student name cannot be empty")
+
+            name = name.strip()
+
+            if name not in self.students:
+                raise StudentNotFoundError(f"Student '{name}' not found!")
+
+            self._delete_student(name)
+            print(f"Removed student: {name}")
+            return True
+
+        except (EmptyNameError, StudentNotFoundError) as error:
+            print(f"Error: {error}")
+            return False
+        except Exception as error:
+            print(f"Unexpected error removing student: {error}")
+            return False
+
+    def _insert_student(self, name):
+        """
+        Add a student with an already validated name and update the indexes.
+        """
+        if self._snapshots:
+            self._unshare_roster()
+        student = self._store_student(name)
+        self.name_index.add(name)
+        if self.events is not None:
+            self.events.publish(StudentAdded(name))
+        return student
+
+    def _delete_student(self, name):
+        """
+        Remove a student and take their grades out of the statistics and indexes.
+        """
+        student = self.students[name]
+        if self._snapshots:
+            self._keep_for_snapshots(student)
+            self._unshare_roster()
+        for subject, grade in student.grades.items():
+            self.subject_stats[subject].remove(grade)
+            self.subject_histograms[subject].remove(grade)
+            self.class_stats.remove(grade)
+        self.name_index.remove(name)
+        for rank_index in self.rank_indexes.values():
+            rank_index.remove(name)
+        student = self._discard_student(name)
+        if self.events is not None:
+            self.events.publish(StudentRemoved(name))
+        return student
+
+    def _store_student(self, name):
+        """
+        Create a Student and link it to this gradebook (other storage backends override this).
+        """
+        student = Student(name)
+        student.gradebook = self
+        self.students[name] = student
+        return student
+
+    def _student_list(self):
+        """
+        The students that reports and sorts go through (subclasses may return a snapshot).
+        """
+        return self.students.values()
+
+    def _discard_student(self, name):
+        """
+        Take a student out of storage (other storage backends override this).
+        """
+        student = self.students.pop(name)
+        student.gradebook = None
+        return student
+
+    def _grade_changed(self, student, subject, old_grade, new_grade):
+        """
+        Called by Student whenever one of its grades is set.
+        """
+        if self._snapshots:
+            self._keep_for_snapshots(student, subject, old_grade)
+        # The histogram goes first: it is the one that can refuse a grade, before anything else has changed
+        self.subject_histograms[subject].replace(old_grade, new_grade)
+        self.subject_stats[subject].replace(old_grade, new_grade)
+        self.class_stats.replace(old_grade, new_grade)
+
+        # Only the rankings that have been built need updating
+        if self.rank_indexes:
+            average_index = self.rank_indexes.get(None)
+            if average_index is not None:
+                average_index.update(student.name, student.calculate_average())
+            subject_index = self.rank_indexes.get(subject)
+            if subject_index is not None:
+                subject_index.update(student.name, new_grade)
+
+        if self.events is not None:
+            self.events.publish(GradeChanged(student.name, subject, old_grade, new_grade))
+
+    def search_student(self, name):
+        """
+        Search for a student by name and return their object.
+        """
+        try:
+            if not name or not name.strip():
+                raise EmptyNameError("Student name cannot be empty")
+
+            name = name.strip()
+
+            if name not in self.students:
+                raise StudentNotFoundError(f"Student '{name}' not found!")
+
+            return self.students[name]
+
+        except (EmptyNameError, StudentNotFoundError) as error:
+            print(f"Error: {error}")
+            return None
+        except Exception as error:
+            print(f"Unexpected error searching for student: {error}")
+            return None
+
+    def update_student_grade(self, name, subject, grade):
+        """
+        Update a grade for a specific student with full validation.
+        """
+        try:
+            student = self.search_student(name)
+            if not student:
+                return False
+
+            return student.add_grade(subject, grade)
+
+        except (InvalidSubjectError, InvalidGradeError) as error:
+            print(f"Error: {error}")
+            return False
+        except Exception as error:
+            print(f"Unexpected error updating grade: {error}")
+            return False
+
+    def update_grades_bulk(self, records, max_errors=100):
+        """
+        Update many grades at once from (name, subject, grade) records.
+        Every record is checked and applied in one pass, and the student is only
+        looked up again when the name changes (records for one student usually
+        come together). Bad records are skipped and collected in the returned
+        BulkUpdateReport instead of being printed one by one.
+        """
+        report = BulkUpdateReport(max_errors)
+        students = self.students
+        valid_subjects = self.subjects.active
+        last_name = None
+        student = None
+
+        for position, record in enumerate(records):
+            try:
+                name, subject, grade = record
+            except (TypeError, ValueError):
+                report.add_error(position, None, None, "Record must be (name, subject, grade)")
+                continue
+
+            if name != last_name:
+                last_name = name
+                try:
+                    student = students.get(name)
+                except TypeError:
+                    student = None  # Not a usable name (e.g. a list); reported below
+                if student is None and isinstance(name, str):
+                    student = students.get(name.strip())
+
+            if student is None:
+                report.add_error(position, name, subject, f"Student '{name}' not found!")
+            elif (isinstance(subject, str) and subject in valid_subjects
+                    and isinstance(grade, (int, float)) and not isinstance(grade, bool)
+                    and math.isfinite(grade) and not (grade < 0 or grade > 100)):
+                student._set_grade(subject, grade)
+                report.applied += 1
+            else:
+                # Only failures pay for building the exception and its message
+                try:
+                    validate_grade(subject, grade, self.subjects)
+                except (InvalidSubjectError, InvalidGradeError) as error:
+                    report.add_error(position, name, subject, str(error))
+
+        return report
+
+    def report_lines(self, start=0, limit=None):
+        """
+        Yield the lines of the all-students report, from student number start
+        (0 = first added) for at most limit students.
+        """
+        yield ""
+        yield "ALL STUDENTS"
+        stop = None if limit is None else start + limit
+        for student in islice(self._student_list(), start, stop):
+            yield from student.detail_lines()
+
+    def view_all_students(self, limit=None, start=0, sink=None):
+        """
+        Display all students with their details (or limit students from start).
+        The report is written in large chunks to sink (default: the screen).
+        """
+        try:
+            if not self.students:
+                print("No students in the gradebook.")
+                return
+
+            write_lines(self.report_lines(start, limit), sink)
+
+        except Exception as error:
+            print(f"Error displaying students: {error}")
+
+    def bubble_sort_students_by_average(self, limit=None):
+        """
+        Sort students by average using the gradebook's sort strategy.
+        The name is kept from the original bubble sort version; use
+        Gradebook(sort_strategy="bubble") to get the bubble sort back.
+        If limit is given only the top students are selected (heap based).
+        Returns sorted list of (average, student) tuples.
+        """
+        try:
+            if self._uses_rank_index(None, limit):
+                return self._read_rank_index(None, limit)
+
+            # Get students with grades only
+            students_with_grades = []
+            for student in self._student_list():
+                if student.has_grades():
+                    average = student.calculate_average()
+                    students_with_grades.append((average, student))
+
+            if not students_with_grades:
+                print("No students with grades to sort.")
+                return []
+
+            # Highest average first, ties stay in the order students were added
+            return sort_items(students_with_grades, key=itemgetter(0), descending=True,
+                              strategy=self.sort_strategy, limit=limit)
+
+        except Exception as error:
+            print(f"Error during sorting: {error}")
+            return []
+
+    def sort_by_average(self, limit=None):
+        """
+        Sort students by their average grade (highest to lowest).
+        """
+        try:
+            sorted_students = self.bubble_sort_students_by_average(limit)
+
+            if sorted_students:
+                print("\nSTUDENTS SORTED BY AVERAGE (Highest to Lowest)")
+                print(f"Using {self._algorithm_name(limit, self._uses_rank_index(None, limit))} Algorithm")
+                for average, student in sorted_students:
+                    print(f"{student.name}: {average:.1f}")
+
+            return sorted_students
+
+        except Exception as error:
+            print(f"Error sorting by average: {error}")
+            return []
+
+    def insertion_sort_students_by_subject(self, subject, limit=None):
+        """
+        Sort students by subject grade using the gradebook's sort strategy.
+        The name is kept from the original insertion sort version; use
+        Gradebook(sort_strategy="insertion") to get the insertion sort back.
+        Returns sorted list of (grade, student) tuples.
+        """
+        try:
+            self._check_subject(subject)
+
+            if self._uses_rank_index(subject, limit):
+                return self._read_rank_index(subject, limit)
+
+            # Get students with grades for this subject
+            students_with_grades = []
+            for student in self._student_list():
+                grade = student.grades.get(subject)
+                if grade is not None:
+                    students_with_grades.append((grade, student))
+
+            if not students_with_grades:
+                print(f"No students have grades for {subject} yet.")
+                return []
+
+            # Highest grade first, ties stay in the order students were added
+            return sort_items(students_with_grades, key=itemgetter(0), descending=True,
+                              strategy=self.sort_strategy, limit=limit)
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error during sorting: {error}")
+            return []
+
+    def sort_by_subject(self, subject, limit=None):
+        """
+        Sort students by grade in a specific subject (highest to lowest).
+        """
+        try:
+            sorted_students = self.insertion_sort_students_by_subject(subject, limit)
+
+            if sorted_students:
+                print(f"\nSTUDENTS SORTED BY {subject.upper()} (Highest to Lowest)")
+                print(f"Using {self._algorithm_name(limit, self._uses_rank_index(subject, limit))} Algorithm")
+                for grade, student in sorted_students:
+                    print(f"{student.name}: {grade}")
+
+            return sorted_students
+
+        except Exception as error:
+            print(f"Error sorting by subject: {error}")
+            return []
+
+    def sort_students_by_name(self):
+        """
+        NEW: Sort students by name alphabetically (A to Z) using the gradebook's sort strategy.
+        """
+        try:
+            if not self.students:
+                print("No students to sort.")
+                return []
+
+            # Convert dictionary to list for sorting
+            student_list = list(self._student_list())
+            student_list = sort_items(student_list, key=attrgetter("name"),
+                                      strategy=self.sort_strategy)
+
+            print("\nSTUDENTS SORTED BY NAME (A to Z)")
+            print(f"Using {self._algorithm_name()} Algorithm")
+            for student in student_list:
+                print(f"{student.name}")
+
+            return student_list
+
+        except Exception as error:
+            print(f"Error sorting by name: {error}")
+            return []
+
+    def _algorithm_name(self, limit=None, indexed=False):
+        """
+        Name of the algorithm used for a sort, for the report headings.
+        """
+        if indexed:
+            return "Rank Index"
+        if limit is not None:
+            return "Heap Top-K Selection"
+        return strategy_label(self.sort_strategy)
+
+    def _uses_rank_index(self, subject, limit):
+        """
+        True when only the first few students are wanted, a ranking for subject
+        (None = average) is already being kept and the default sort strategy is
+        selected, so the answer can be read off the ranking without sorting.
+        """
+        return (limit is not None and self.sort_strategy == DEFAULT_STRATEGY
+                and subject in self.rank_indexes)
+
+    def _rank_index(self, subject=None):
+        """
+        Get the ranking by average (subject None) or by one subject, building it if needed.
+        """
+        if subject is not None:
+            self._check_subject(subject)
+
+        rank_index = self.rank_indexes.get(subject)
+        if rank_index is None:
+            if subject is None:
+                scores = ((student.name, student.calculate_average())
+                          for student in self.students.values() if student.has_grades())
+            else:
+                scores = ((student.name, student.grades[subject])
+                          for student in self.students.values() if subject in student.grades)
+            rank_index = RankIndex(scores, order_of=self.name_index.added_number)
+            self.rank_indexes[subject] = rank_index
+        return rank_index
+
+    def _read_rank_index(self, subject, limit):
+        """
+        Sorted (score, student) tuples straight from a ranking, in the same form the sorts return.
+        """
+        rank_index = self.rank_indexes[subject]
+        if not len(rank_index):
+            if subject is None:
+                print("No students with grades to sort.")
+            else:
+                print(f"No students have grades for {subject} yet.")
+            return []
+        return [(score, self.students[name]) for score, name in rank_index.top(limit)]
+
+    def _ranked_student(self, name, subject):
+        """
+        Find a student and the ranking they are in, or print why they cannot be ranked.
+        Returns (student name, ranking) or (None, None).
+        """
+        student = self.search_student(name)
+        if not student:
+            return None, None
+
+        rank_index = self._rank_index(subject)
+        if student.name not in rank_index:
+            print(f"{student.name} has no {subject or 'grades'} to rank yet.")
+            return None, None
+        return student.name, rank_index
+
+    def rank_of(self, name, subject=None):
+        """
+        Position of a student in the ranking by average, or by one subject (1 = best).
+        Returns None if the student cannot be ranked.
+        """
+        try:
+            name, rank_index = self._ranked_student(name, subject)
+            return rank_index.rank(name) if rank_index else None
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return None
+        except Exception as error:
+            print(f"Error ranking student: {error}")
+            return None
+
+    def percentile_of(self, name, subject=None):
+        """
+        Percentage of ranked students scoring below this student (equal scores count half).
+        Returns None if the student cannot be ranked.
+        """
+        try:
+            name, rank_index = self._ranked_student(name, subject)
+            return rank_index.percentile(name) if rank_index else None
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return None
+        except Exception as error:
+            print(f"Error ranking student: {error}")
+            return None
+
+    def keep_ranking(self, subject=None):
+        """
+        Start keeping the ranking by average (subject None) or by one subject up
+        to date, so top_k(), bottom_k() and students_below() read it instead of
+        going through every student. Returns True if the ranking is kept.
+        """
+        try:
+            self._rank_index(subject)
+            return True
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return False
+
+    def _kept_ranking(self, subject):
+        """
+        The ranking for subject if one is already being kept, otherwise None.
+        """
+        return self.rank_indexes.get(subject)
+
+    def _scores(self, subject):
+        """
+        Yield (score, student) for every student with an average (subject None)
+        or a grade in subject, in the order students were added.
+        """
+        for student in self._student_list():
+            if subject is None:
+                if student.has_grades():
+                    yield student.calculate_average(), student
+            else:
+                grade = student.grades.get(subject)
+                if grade is not None:
+                    yield grade, student
+
+    def _lowest_scores(self, subject, limit=None, below=None):
+        """
+        (score, student) from the lowest score up, ties in the opposite order to
+        the top_k() ranking. A heap keeps only limit students while scanning.
+        """
+        numbered = ((score, -number, student)
+                    for number, (score, student) in enumerate(self._scores(subject))
+                    if below is None or score < below)
+        lowest = sort_items(numbered, key=itemgetter(0, 1), limit=limit)
+        return [(score, student) for score, _, student in lowest]
+
+    def top_k(self, count, subject=None):
+        """
+        The count best students by average (or by one subject) as (score, student), best first.
+        Reads the ranking if one is kept, otherwise selects with a heap in O(n log count).
+        """
+        try:
+            if subject is not None:
+                self._check_subject(subject)
+
+            ranking = self._kept_ranking(subject)
+            if ranking is None:
+                return sort_items(self._scores(subject), key=itemgetter(0), descending=True,
+                                  limit=count)
+            return [(score, self.students[name]) for score, name in ranking.top(count)]
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error getting top students: {error}")
+            return []
+
+    def bottom_k(self, count, subject=None):
+        """
+        The count lowest students by average (or by one subject) as (score, student), lowest first.
+        Reads the ranking if one is kept, otherwise selects with a heap in O(n log count).
+        """
+        try:
+            if subject is not None:
+                self._check_subject(subject)
+
+            ranking = self._kept_ranking(subject)
+            if ranking is None:
+                return self._lowest_scores(subject, max(count, 0))
+            return [(score, self.students[name]) for score, name in ranking.bottom(count)]
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error getting bottom students: {error}")
+            return []
+
+    def students_in_band(self, low, high, subject=None):
+        """
+        Students whose average (or subject grade) is from low to high inclusive, highest first.
+        """
+        try:
+            validate_score_bound(low, "Band bound")
+            validate_score_bound(high, "Band bound")
+            ranked = self._rank_index(subject).band(low, high)
+            return [(score, self.students[name]) for score, name in ranked]
+
+        except (InvalidSubjectError, InvalidGradeError) as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error getting students in grade band: {error}")
+            return []
+
+    def students_below(self, threshold=AT_RISK_THRESHOLD, subject=None, limit=None):
+        """
+        At-risk list: students whose average (or subject grade) is below threshold,
+        lowest first, as (score, student). limit keeps only the lowest few.
+        Reads the ranking if one is kept, otherwise goes through the students once.
+        """
+        try:
+            validate_score_bound(threshold)
+            if subject is not None:
+                self._check_subject(subject)
+
+            ranking = self._kept_ranking(subject)
+            if ranking is None:
+                return self._lowest_scores(subject, limit, below=threshold)
+            return [(score, self.students[name]) for score, name in ranking.below(threshold, limit)]
+
+        except (InvalidSubjectError, InvalidGradeError) as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error getting students below {threshold}: {error}")
+            return []
+
+    def view_subject_grades(self, subject):
+        """
+        View grades for a specific subject across all students.
+        """
+        try:
+            self._check_subject(subject)
+
+            print(f"\n{subject.upper()} GRADES")
+
+            for student in self._student_list():
+                grade = student.grades.get(subject)
+                if grade is not None:
+                    print(f"{student.name}: {grade}")
+                else:
+                    print(f"{student.name}: No grade yet")
+
+            # The statistics are kept up to date, so there is nothing to recalculate
+            write_lines(self._statistics_lines(subject))
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+        except Exception as error:
+            print(f"Error viewing subject grades: {error}")
+
+    def _statistics_lines(self, subject):
+        """
+        Yield the class statistics lines shown under a subject's grades.
+        """
+        stats = self.get_subject_statistics(subject)
+        if not stats["count"]:
+            yield "No grades available for this subject yet."
+            return
+
+        distribution = self.get_subject_distribution(subject)
+        yield ""
+        yield "Class Statistics:"
+        yield f"  Average: {stats['average']:.1f}"
+        yield f"  Median: {distribution['median']}"
+        yield f"  Highest: {stats['highest']}"
+        yield f"  Lowest: {stats['lowest']}"
+        yield f"  Total Students with Grades: {stats['count']}"
+        yield "  Bands: " + ", ".join(f"{letter} {count}" for letter, count in distribution["bands"].items())
+
+    def search_students_by_prefix(self, prefix, limit=None):
+        """
+        Find students whose name starts with prefix (A to Z), using the name index.
+        """
+        try:
+            if not prefix or not prefix.strip():
+                raise EmptyNameError("Search term cannot be empty")
+
+            names = self.name_index.prefix(prefix.strip(), limit)
+            return [self.students[name] for name in names]
+
+        except EmptyNameError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error searching students: {error}")
+            return []
+
+    def get_subject_statistics(self, subject):
+        """
+        Get the statistics for one subject without looking at every student.
+        Returns a dictionary with count, average, highest, lowest and std_dev.
+        """
+        try:
+            self._check_subject(subject)
+
+            return self.subject_stats[subject].summary()
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return None
+
+    def get_subject_distribution(self, subject):
+        """
+        Get the median, quartiles, 10th/90th percentiles and letter band counts
+        of one subject from its histogram, without sorting any grades.
+        Returns None for an invalid subject.
+        """
+        try:
+            self._check_subject(subject)
+
+            return self.subject_histograms[subject].summary()
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return None
+
+    def get_grade_percentile(self, subject, percent):
+        """
+        The grade that percent of the subject's grades are at or below (None if there are none).
+        """
+        try:
+            self._check_subject(subject)
+            if not 0 <= percent <= 100:
+                raise ValueError("Percent must be between 0 and 100")
+
+            return self.subject_histograms[subject].percentile(percent)
+
+        except (InvalidSubjectError, ValueError) as error:
+            print(f"Error: {error}")
+            return None
+
+    def get_class_average(self):
+        """
+        Get the average of every grade in the gradebook (0 if there are none).
+        """
+        return self.class_stats.mean()
+
+    def search_students_by_name(self, search_term, limit=None):
+        """
+        Search for students by name (partial match), using the name index.
+        Returns at most limit students if a limit is given.
+        """
+        try:
+            if not search_term or not search_term.strip():
+                raise EmptyNameError("Search term cannot be empty")
+
+            names = self.name_index.substring(search_term.strip(), limit)
+            return [self.students[name] for name in names]
+
+        except EmptyNameError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error searching students: {error}")
+            return []
+
+
+def run_comprehensive_tests():
+    """
+    COMPREHENSIVE TESTING DOCUMENTATION:
+
+    Tests Conducted:
+    1. Student creation with valid and invalid names
+    2. Grade validation (0-100 range, invalid subjects)
+    3. Custom exception handling
+    4. Sorting algorithms (every strategy in the sort engine)
+    5. Search functionality
+    6. Edge cases (empty data, boundary values)
+
+    Issues Found and Resolved:
+    - Empty names now properly handled with EmptyNameError
+    - Invalid grades rejected with clear error messages
+    - Sorting algorithms handle empty data gracefully
+    - All methods include try-except blocks for robustness
+    """
+    print("COMPREHENSIVE SYSTEM TESTING")
+
+    gradebook = Gradebook()
+
+    # Test 1: Student management with exception handling
+    print("\n1. TESTING STUDENT MANAGEMENT WITH EXCEPTIONS")
+    print("   Testing valid student creation")
+    gradebook.add_student("John")
+    gradebook.add_student("Sarah")
+
+    print("   Testing invalid student creation")
+    gradebook.add_student("")  # Should show EmptyNameError
+    gradebook.add_student("John")  # Should show duplicate error
+    gradebook.add_student("John123")  # Should show InvalidNameError
+
+    # Test 2: Grade management with exception handling
+    print("\n2. TESTING GRADE MANAGEMENT WITH EXCEPTIONS")
+    print("   Testing valid grade updates")
+    gradebook.update_student_grade("John", "Math", 85)
+    gradebook.update_student_grade("John", "English", 78)
+    gradebook.update_student_grade("Sarah", "Math", 95)
+
+    print("   Testing invalid grade updates")
+    gradebook.update_student_grade("John", "Math", 150)  # Should show InvalidGradeError
+    gradebook.update_student_grade("John", "History", 90)  # Should show InvalidSubjectError
+    gradebook.update_student_grade("Unknown", "Math", 90)  # Should show StudentNotFoundError
+    assert not gradebook.update_student_grade("John", "Math", float("nan")), "NaN grade was accepted"
+    assert not gradebook.update_student_grade("John", "Math", True), "True was accepted as a grade"
+    assert gradebook.get_subject_statistics("Math")["highest"] == 95, "Rejected grades changed the statistics"
+
+    # Test 3: Sorting algorithms
+    print("\n3. TESTING SORTING ALGORITHMS")
+    gradebook.add_student("David")
+    gradebook.update_student_grade("David", "Math", 78)
+    gradebook.update_student_grade("David", "English", 82)
+
+    print("   Testing sort by average")
+    gradebook.sort_by_average()
+
+    print("   Testing sort by subject")
+    gradebook.sort_by_subject("Math")
+
+    print("   Testing name sorting")
+    gradebook.sort_students_by_name()
+
+    print("   Testing that every sort strategy gives the same order")
+    expected = [student.name for average, student in gradebook.bubble_sort_students_by_average()]
+    for strategy in SORT_STRATEGIES:
+        gradebook.sort_strategy = strategy
+        names = [student.name for average, student in gradebook.bubble_sort_students_by_average()]
+        assert names == expected, f"{strategy} sort gave a different order"
+    gradebook.sort_strategy = DEFAULT_STRATEGY
+
+    print("   Testing running statistics")
+    math_grades = [student.grades["Math"] for student in gradebook.students.values()
+                   if "Math" in student.grades]
+    math_stats = gradebook.get_subject_statistics("Math")
+    assert math_stats["count"] == len(math_grades), "Math grade count is wrong"
+    assert math_stats["highest"] == max(math_grades), "Highest Math grade is wrong"
+    assert math_stats["lowest"] == min(math_grades), "Lowest Math grade is wrong"
+    assert abs(math_stats["average"] - sum(math_grades) / len(math_grades)) < 0.001, "Math average is wrong"
+
+    print("   Testing grade distributions")
+    distribution = gradebook.get_subject_distribution("Math")
+    assert distribution["median"] == sorted(math_grades)[(len(math_grades) - 1) // 2], "Math median is wrong"
+    assert sum(distribution["bands"].values()) == len(math_grades), "Band counts should cover every grade"
+    assert gradebook.get_grade_percentile("Math", 100) == max(math_grades), "100th percentile is wrong"
+    assert gradebook.get_grade_percentile("Math", 150) is None, "Percent above 100 was accepted"
+
+    print("   Testing rank index")
+    assert gradebook.rank_of("Sarah") == 1, "Sarah should have the best average"
+    assert gradebook.rank_of("David", "Math") == 3, "David should be last in Math"
+    assert gradebook.percentile_of("John", "Math") == 50.0, "John should be in the middle for Math"
+    assert [student.name for average, student in gradebook.students_in_band(80, 90)] == ["John", "David"], \
+        "Grade band query is wrong"
+    gradebook.update_student_grade("David", "Math", 100)  # The ranking must follow the change
+    assert [student.name for grade, student in gradebook.top_k(1, "Math")] == ["David"], "Top Math student is wrong"
+    assert gradebook.rank_of("David") == 2, "David's average rank should have moved up"
+    gradebook.update_student_grade("David", "Math", 78)
+
+    print("   Testing top-k and at-risk queries")
+    scanned = Gradebook()
+    for name, grades in (("Amy", (40, 70)), ("Ben", (90, 45)), ("Cal", (40, 55)), ("Dee", (65, 65))):
+        scanned._insert_student(name)
+        for subject, grade in zip(subjects, grades):
+            scanned.students[name]._set_grade(subject, grade)
+    queries = [lambda book: book.top_k(2), lambda book: book.bottom_k(3, "Math"),
+               lambda book: book.students_below(55), lambda book: book.students_below(50, "Math", 1),
+               lambda book: book.students_below(float("nan")), lambda book: book.students_in_band(float("nan"), 90)]
+    without_ranking = [[(score, student.name) for score, student in query(scanned)] for query in queries]
+    assert not scanned.rank_indexes, "Queries without a kept ranking should not build one"
+    assert without_ranking[1] == [(40, "Cal"), (40, "Amy"), (65, "Dee")], "Bottom-k order is wrong"
+    assert without_ranking[2] == [(47.5, "Cal")], "At-risk list is wrong"
+    assert without_ranking[4] == without_ranking[5] == [], "NaN threshold or bound was accepted"
+    assert scanned.keep_ranking() and scanned.keep_ranking("Math"), "Keeping a ranking failed"
+    with_ranking = [[(score, student.name) for score, student in query(scanned)] for query in queries]
+    assert with_ranking == without_ranking, "Kept rankings and heap selection disagree"
+    assert gradebook.students_below(50, "History") == [], "Unknown subject should give no students"
+
+    print("   Testing change events")
+    watched = Gradebook()
+    stream = watched.enable_events(capacity=4)
+    seen = []
+    stream.subscribe(seen.append)
+    cursor = stream.cursor()
+    watched._insert_student("Amy")
+    watched.students["Amy"]._set_grade("Math", 70)
+    watched.students["Amy"]._set_grade("Math", 75)
+    assert [event.type for event in seen] == ["student_added", "grade_changed", "grade_changed"], \
+        "Subscriber missed events"
+    assert seen[2].old_grade == 70 and seen[2].new_grade == 75, "Grade event is wrong"
+    assert cursor.poll() == seen and cursor.poll() == [], "Cursor should read each event once"
+    watched._delete_student("Amy")
+    watched._insert_student("Ben")
+    watched._insert_student("Cal")
+    watched._insert_student("Dee")
+    watched._insert_student("Eve")  # The capacity is 4, so the removal is overwritten
+    try:
+        cursor.poll()
+        assert False, "Overwritten events should be reported"
+    except EventsLostError:
+        assert cursor.lost == 1 and len(cursor.poll()) == 4, "Cursor should go on from the oldest kept event"
+
+    print("   Testing snapshots")
+    frozen = scanned.freeze()
+    report = list(frozen.report_lines())
+    ranking = [(average, student.name) for average, student in frozen.top_k(4)]
+    scanned.students["Amy"]._set_grade("Math", 99)
+    scanned._delete_student("Ben")
+    scanned._insert_student("Eve")
+    assert list(frozen.report_lines()) == report, "Snapshot should not see later changes"
+    assert [(average, student.name) for average, student in frozen.top_k(4)] == ranking, \
+        "Snapshot ranking changed"
+    assert "Ben" in frozen.students and "Eve" not in frozen.students, "Snapshot roster is wrong"
+    assert frozen.students["Amy"].get_grade("Math") == 40, "Snapshot should keep the old grade"
+    assert set(frozen.kept) == {"Amy", "Ben"}, "Only changed students should be copied"
+    assert not frozen.students["Cal"].add_grade("Math", 100), "Snapshot students should be read-only"
+    assert scanned.students["Cal"].grades["Math"] == 40, "Changing a snapshot student changed the gradebook"
+    assert frozen.get_subject_statistics("Math")["highest"] == 90, "Snapshot statistics are wrong"
+    held = {student.name: student for average, student in frozen.top_k(4)}["Cal"]
+    held_grades, held_average = dict(held.grades), held.calculate_average()
+    scanned.update_student_grade("Cal", "Math", 99)
+    assert held.grades == held_grades and held.calculate_average() == held_average, \
+        "A student taken from a snapshot should not see later changes"
+    assert frozen.students["Cal"].grades == held_grades, "Snapshot should keep the old grades"
+    assert frozen.students["Cal"].calculate_average() == held_average, "Snapshot average changed"
+
+    print("   Testing cached averages")
+    gradebook.bubble_sort_students_by_average()  # Works out any average not cached yet
+    Student.reset_cache_stats()
+    gradebook.bubble_sort_students_by_average()
+    assert Student.cache_stats()["misses"] == 0, "Sorting again should not recompute averages"
+    gradebook.update_student_grade("John", "English", 80)
+    assert gradebook.students["John"].calculate_average() == 82.5, "Average not updated after grade change"
+    assert gradebook.students["John"].calculate_total() == 165, "Total is wrong"
+    gradebook.update_student_grade("John", "English", 78)
+
+    print("   Testing subject catalogue")
+    assert gradebook.add_subject("Art"), "Adding a subject failed"
+    assert gradebook.update_student_grade("Sarah", "Art", 90), "Grade for a new subject was rejected"
+    assert gradebook.get_subject_statistics("Art")["count"] == 1, "New subject has no statistics"
+    assert gradebook.retire_subject("Art"), "Retiring a subject failed"
+    assert not gradebook.update_student_grade("Sarah", "Art", 80), "Retired subject accepted a grade"
+    assert gradebook.students["Sarah"].grades["Art"] == 90, "Retiring a subject lost a grade"
+    assert gradebook.subjects.id_of("Art") == 3, "Subject ids should be dense"
+    assert not gradebook.add_subject("  "), "Empty subject name was accepted"
+    gradebook.add_subject("Art")
+    gradebook.update_student_grade("Sarah", "Art", 95)
+
+    print("   Testing bulk grade updates")
+    report = gradebook.update_grades_bulk([("John", "Science", 70), ("John", "Math", 150),
+                                           ("Nobody", "Math", 50), ("Sarah", "History", 80),
+                                           (" Sarah ", "Science", 88), ("John",),
+                                           ("John", "Math", float("nan")), (["John"], "Math", 50)])
+    assert report.applied == 2 and report.failed == 6, "Bulk update counts are wrong"
+    assert [error[0] for error in report.errors] == [1, 2, 3, 5, 6, 7], "Bulk update errors are wrong"
+    assert gradebook.students["Sarah"].grades["Science"] == 88, "Bulk update did not store the grade"
+    assert gradebook.get_subject_statistics("Science")["count"] == 2, "Bulk update skipped the statistics"
+    report.print_report()
+
+    # Test 4: Search functionality
+    print("\n4. TESTING SEARCH FUNCTIONALITY")
+    print("   Testing name search")
+    results = gradebook.search_students_by_name("a")  # Should find Sarah and David
+    print(f"   Found {len(results)} students with 'a' in name")
+    assert [student.name for student in results] == ["Sarah", "David"], "Name search order is wrong"
+    results = gradebook.search_students_by_prefix("da")
+    assert [student.name for student in results] == ["David"], "Prefix search is wrong"
+
+    # Test 5: View all data
+    print("\n5. TESTING DATA DISPLAY")
+    gradebook.view_all_students()
+
+    print("   Testing report pages")
+    report = io.StringIO()
+    gradebook.view_all_students(limit=1, start=1, sink=report)
+    assert report.getvalue().splitlines()[:3] == ["", "ALL STUDENTS", ""], "Report heading is wrong"
+    assert "Student: Sarah" in report.getvalue() and "John" not in report.getvalue(), "Report page is wrong"
+
+    print("\nALL TESTS COMPLETED SUCCESSFULLY")
+    return gradebook
+
+
+def show_menu():
+    """
+    Display the main menu to the user.
+    """
+    print("\n")
+    print("GRADEBOOK MANAGEMENT SYSTEM")
+    print("1. Add student")
+    print("2. Remove student")
+    print("3. Update student grade")
+    print("4. View all students")
+    print("5. Search student by name")
+    print("6. Sort students by average")
+    print("7. Sort students by subject")
+    print("8. Sort students by name")
+    print("9. View subject grades")
+    print("10. Run comprehensive tests")
+    print("11. Exit")
+
+    choice = input("Enter your choice (1-11): ")
+    return choice
+
+
+def get_valid_grade(prompt):
+    """
+    Get a valid grade from user (0-100) with exception handling.
+    """
+    while True:
+        try:
+            grade = float(input(prompt))
+            if 0 <= grade <= 100:
+                return int(grade)
+            else:
+                raise InvalidGradeError("Grade must be between 0 and 100")
+        except ValueError:
+            print("Please enter a valid number.")
+        except InvalidGradeError as error:
+            print(f"Error: {error}")
+
+
+def main():
+    """
+    Main program that runs the enhanced gradebook system.
+    """
+    # Create a gradebook
+    gradebook = Gradebook()
+
+    # Add sample data for demonstration
+    try:
+        gradebook.add_student("John")
+        gradebook.update_student_grade("John", "Math", 85)
+        gradebook.update_student_grade("John", "English", 78)
+        gradebook.update_student_grade("John", "Science", 92)
+
+        gradebook.add_student("Sarah")
+        gradebook.update_student_grade("Sarah", "Math", 95)
+        gradebook.update_student_grade("Sarah", "English", 88)
+        gradebook.update_student_grade("Sarah", "Science", 85)
+
+        gradebook.add_student("David")
+        gradebook.update_student_grade("David", "Math", 78)
+        gradebook.update_student_grade("David", "English", 80)
+
+        # One student with no grades to demonstrate the system
+        gradebook.add_student("NewStudent")
+
+    except Exception as error:
+        print(f"Error setting up sample data: {error}")
+
+    print("ENHANCED OOP GRADING SYSTEM")
+    print("Now with comprehensive exception handling and sorting algorithms!")
+    print(f"System loaded with {len(gradebook.students)} students")
+
+    # Main program loop with enhanced error handling
+    while True:
+        try:
+            choice = show_menu()
+
+            if choice == '1':
+                name = input("Enter student name: ")
+                gradebook.add_student(name)
+
+            elif choice == '2':
+                name = input("Enter student name to remove: ")
+                gradebook.remove_student(name)
+
+            elif choice == '3':
+                name = input("Enter student name: ")
+                print("Available subjects:", ", ".join(gradebook.subjects))
+                subject = input("Enter subject: ")
+                grade = get_valid_grade(f"Enter grade for {subject}: ")
+                if gradebook.update_student_grade(name, subject, grade):
+                    print("Grade updated successfully!")
+
+            elif choice == '4':
+                gradebook.view_all_students()
+
+            elif choice == '5':
+                search_term = input("Enter student name to search: ")
+                found_students = gradebook.search_students_by_name(search_term)
+                if found_students:
+                    print(f"\nFound {len(found_students)} student(s):")
+                    for student in found_students:
+                        student.print_details()
+                else:
+                    print("No students found matching your search.")
+
+            elif choice == '6':
+                gradebook.sort_by_average()
+
+            elif choice == '7':
+                print("Available subjects:", ", ".join(gradebook.subjects))
+                subject = input("Enter subject to sort by: ")
+                gradebook.sort_by_subject(subject)
+
+            elif choice == '8':
+                gradebook.sort_students_by_name()
+
+            elif choice == '9':
+                print("Available subjects:", ", ".join(gradebook.subjects))
+                subject = input("Enter subject: ")
+                gradebook.view_subject_grades(subject)
+
+            elif choice == '10':
+                run_comprehensive_tests()
+
+            elif choice == '11':
+                print("Thank you for using the Enhanced Grading System!")
+                print("Goodbye!")
+                break
+
+            else:
+                print("Invalid choice! Please enter a number from 1 to 11.")
+
+        except KeyboardInterrupt:
+            print("\n\nProgram interrupted by user. Goodbye!")
+            break
+        except Exception as error:
+            print(f"Unexpected error: {error}")
+
+
+# Run the program (python nathane_lebogang_section_F.py --batch SCRIPT runs commands from a file)
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        from nathane_lebogang_batch import main as run_batch
+        sys.exit(run_batch(sys.argv[2:]))
     main()
\ No newline at end of file
@@ -0,0 +1,669 @@
+"""
+asyncio HTTP/JSON service for the Section F Gradebook.
+
+The menus in Sections D to F can only be used by one person at a keyboard.
+GradebookServer puts a Gradebook behind a small local HTTP/1.1 API so a
+school portal with many teachers can use it at the same time. Connections
+are kept open between requests (keep-alive), and POST /batch runs many
+operations in one request.
+
+Routes (all bodies and answers are JSON):
+
+    GET    /students?limit=N                  names in the order they were added
+    POST   /students          {"name"}        add a student
+    GET    /students/NAME                     grades and average of one student
+    DELETE /students/NAME                     remove a student
+    PUT    /students/NAME/grades/SUBJECT {"grade"}
+    POST   /grades            {"name", "subject", "grade"}
+    GET    /search?q=TEXT&limit=N             partial name search
+    GET    /search?prefix=TEXT&limit=N        names starting with TEXT
+    GET    /sorted/average?limit=N            students by average, highest first
+    GET    /sorted/subject/SUBJECT?limit=N    students by one subject
+    GET    /sorted/name                       students A to Z
+    GET    /below?threshold=T&subject=S       at-risk students under T (default 50), lowest first
+    GET    /stats                             class average and grade count
+    GET    /stats/SUBJECT                     count, average, highest, lowest, std_dev
+    GET    /stats/SUBJECT/distribution        median, quartiles, percentiles, letter bands
+    GET    /subjects                          subjects that accept grades
+    POST   /subjects          {"name"}        add a subject (or bring back a retired one)
+    DELETE /subjects/SUBJECT                  retire a subject (its grades are kept)
+    GET    /events?after=SEQ&limit=N          changes after event SEQ (410 if they were overwritten)
+    POST   /batch             {"requests": [{"method", "path", "body"}, ...]}
+
+Every answer has "ok" and either "result" or "error".
+
+Usage:
+    python nathane_lebogang_server.py [--port 8080]          run the server
+    python nathane_lebogang_server.py --load [--clients 50]  measure latency on localhost
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from nathane_lebogang_events import EventsLostError
+from nathane_lebogang_section_F import AT_RISK_THRESHOLD, Gradebook, subjects
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_REQUESTS = 1000
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 410: "Gone", 411: "Length Required",
+           413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented"}
+
+
+class RequestError(Exception):
+    """Raised for a request the server cannot answer (carries the HTTP status)"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _limit(query):
+    """
+    Read the optional ?limit=N parameter.
+    """
+    values = query.get("limit")
+    if not values:
+        return None
+    try:
+        limit = int(values[0])
+    except ValueError:
+        raise RequestError(400, "limit must be a whole number") from None
+    if limit < 0:
+        raise RequestError(400, "limit cannot be negative")
+    return limit
+
+
+def _finite_float(text):
+    """
+    parse_float for request bodies: numbers too large for a float (1e999) are refused.
+    """
+    value = float(text)
+    if not math.isfinite(value):
+        raise RequestError(400, f"Number out of range: {text}")
+    return value
+
+
+def _no_constant(text):
+    """
+    parse_constant for request bodies: NaN and Infinity are not valid JSON.
+    """
+    raise RequestError(400, f"{text} is not allowed in the request body")
+
+
+def _field(body, name):
+    """
+    Get a required field from a JSON request body.
+    """
+    if not isinstance(body, dict) or name not in body:
+        raise RequestError(400, f"Request body must contain '{name}'")
+    return body[name]
+
+
+def percentile(sorted_values, percent):
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order
+        percent (float): From 0 to 100
+
+    Returns:
+        float: The percentile, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))  # Ceiling division
+    return sorted_values[int(rank) - 1]
+
+
+class GradebookServer:
+    """
+    Serves one Gradebook over HTTP/1.1 with keep-alive.
+
+    Requests are handled one at a time on the event loop, so the Gradebook
+    itself needs no locking; the loop switches between connections while
+    they wait for the network.
+
+    Attributes:
+        gradebook (Gradebook): The gradebook being served
+        events (EventStream): The gradebook's change events
+        host (str): Address to listen on
+        port (int): Port to listen on (0 picks a free port, see .port after start())
+        requests_served (int): Requests answered so far
+    """
+
+    def __init__(self, gradebook=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.gradebook = gradebook if gradebook is not None else Gradebook()
+        self.events = self.gradebook.enable_events()  # Read by GET /events
+        self.host = host
+        self.port = port
+        self.requests_served = 0
+        self._server = None
+
+    async def start(self):
+        """
+        Start listening. Returns once the socket is open.
+        """
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        """
+        Start (if needed) and answer requests until cancelled.
+        """
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and wait for the server to shut down.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    # HTTP handling
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Answer requests on one connection until the client closes it.
+        """
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except RequestError as error:
+                    self._write_response(writer, error.status, {"ok": False, "error": str(error)},
+                                         keep_alive=False)
+                    break
+                if request is None:
+                    break  # Client closed the connection
+
+                method, target, version, headers, body = request
+                status, payload = self.handle(method, target, body)
+                keep_alive = self._keep_alive(version, headers)
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader):
+        """
+        Read one request. Returns None when the connection closes cleanly.
+        """
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise RequestError(400, "Incomplete request") from None
+            return None
+        except asyncio.LimitOverrunError:
+            raise RequestError(413, "Request headers are too large") from None
+        if len(head) > MAX_HEADER_BYTES:
+            raise RequestError(413, "Request headers are too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            raise RequestError(400, "Malformed request line") from None
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise RequestError(501, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise RequestError(400, "Content-Length must be a number") from None
+        if length < 0:
+            raise RequestError(400, "Content-Length cannot be negative")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, "Request body is too large")
+
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, version, headers, body
+
+    @staticmethod
+    def _keep_alive(version, headers):
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    def _write_response(writer, status, payload, keep_alive):
+        try:
+            body = json.dumps(payload, allow_nan=False).encode("utf-8")
+        except ValueError:
+            status = 500  # NaN or Infinity in an answer would not be valid JSON
+            payload = {"ok": False, "error": "Answer contains a number that is not valid JSON"}
+            body = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+
+    # Application
+
+    def handle(self, method, target, body=b""):
+        """
+        Answer one request without any networking (also used by /batch).
+
+        Args:
+            method (str): HTTP method
+            target (str): Path with optional query string
+            body (bytes or object): Raw JSON body, or an already decoded value
+
+        Returns:
+            tuple: (HTTP status, JSON-ready answer)
+        """
+        self.requests_served += 1
+        messages = io.StringIO()
+        try:
+            if isinstance(body, (bytes, str)):
+                try:
+                    body = (json.loads(body, parse_float=_finite_float, parse_constant=_no_constant)
+                            if body else None)
+                except ValueError:
+                    raise RequestError(400, "Request body is not valid JSON") from None
+
+            split = urlsplit(target)
+            parts = [unquote(part) for part in split.path.split("/") if part]
+            query = parse_qs(split.query)
+
+            # The Gradebook prints its messages; keep them for the error answers
+            with contextlib.redirect_stdout(messages):
+                status, result = self._route(method, parts, query, body)
+            return status, {"ok": True, "result": result}
+
+        except RequestError as error:
+            return error.status, {"ok": False, "error": str(error)}
+        except Exception as error:
+            return 500, {"ok": False, "error": f"Unexpected error: {error}"}
+
+    def _route(self, method, parts, query, body):
+        """
+        Pick the handler for a path. Returns (status, result).
+        """
+        gradebook = self.gradebook
+        resource = parts[0] if parts else ""
+
+        if resource == "students":
+            if len(parts) == 1:
+                if method == "GET":
+                    limit = _limit(query)
+                    names = list(gradebook.students)
+                    return 200, names if limit is None else names[:limit]
+                if method == "POST":
+                    return self._add_student(_field(body, "name"))
+            elif len(parts) == 2:
+                if method == "GET":
+                    return 200, self._student_details(parts[1])
+                if method == "DELETE":
+                    self._require_student(parts[1])
+                    gradebook.remove_student(parts[1])
+                    return 200, None
+            elif len(parts) == 4 and parts[2] == "grades" and method == "PUT":
+                return self._update_grade(parts[1], parts[3], _field(body, "grade"))
+
+        elif resource == "grades" and len(parts) == 1 and method == "POST":
+            return self._update_grade(_field(body, "name"), _field(body, "subject"),
+                                      _field(body, "grade"))
+
+        elif resource == "search" and len(parts) == 1 and method == "GET":
+            limit = _limit(query)
+            if "prefix" in query:
+                found = gradebook.search_students_by_prefix(query["prefix"][0], limit)
+            elif "q" in query:
+                found = gradebook.search_students_by_name(query["q"][0], limit)
+            else:
+                raise RequestError(400, "Use ?q=TEXT or ?prefix=TEXT")
+            return 200, [student.name for student in found]
+
+        elif resource == "sorted" and method == "GET":
+            return 200, self._sorted(parts[1:], _limit(query))
+
+        elif resource == "below" and len(parts) == 1 and method == "GET":
+            return 200, self._below(query)
+
+        elif resource == "stats" and method == "GET":
+            if len(parts) == 1:
+                return 200, {"class_average": gradebook.get_class_average(),
+                             "grade_count": gradebook.class_stats.count}
+            if len(parts) == 2:
+                self._require_subject(parts[1])
+                return 200, gradebook.get_subject_statistics(parts[1])
+            if len(parts) == 3 and parts[2] == "distribution":
+                self._require_subject(parts[1])
+                return 200, gradebook.get_subject_distribution(parts[1])
+
+        elif resource == "subjects":
+            if len(parts) == 1:
+                if method == "GET":
+                    return 200, list(gradebook.subjects)
+                if method == "POST":
+                    return self._add_subject(_field(body, "name"))
+            elif len(parts) == 2 and method == "DELETE":
+                if parts[1] not in gradebook.subjects:
+                    raise RequestError(404, f"'{parts[1]}' is not an active subject")
+                gradebook.retire_subject(parts[1])
+                return 200, None
+
+        elif resource == "events" and len(parts) == 1 and method == "GET":
+            return 200, self._events(query)
+
+        elif resource == "batch" and len(parts) == 1 and method == "POST":
+            return 200, self._batch(_field(body, "requests"))
+
+        else:
+            raise RequestError(404, f"No such resource: /{'/'.join(parts)}")
+
+        raise RequestError(405, f"{method} is not supported for /{'/'.join(parts)}")
+
+    def _require_student(self, name):
+        if name.strip() not in self.gradebook.students:
+            raise RequestError(404, f"Student '{name.strip()}' not found")
+
+    def _require_subject(self, subject):
+        if not self.gradebook.subjects.known(subject):
+            raise RequestError(400, f"'{subject}' is not a valid subject")
+
+    def _last_message(self):
+        """
+        The last line the Gradebook printed (its error message).
+        """
+        lines = sys.stdout.getvalue().strip().splitlines()
+        return lines[-1].replace("Error: ", "", 1) if lines else "Request failed"
+
+    def _add_student(self, name):
+        if not isinstance(name, str):
+            raise RequestError(400, "name must be text")
+        if name.strip() in self.gradebook.students:
+            raise RequestError(409, f"Student '{name.strip()}' already exists")
+        if not self.gradebook.add_student(name):
+            raise RequestError(400, self._last_message())
+        return 201, {"name": name.strip()}
+
+    def _add_subject(self, name):
+        if not isinstance(name, str):
+            raise RequestError(400, "name must be text")
+        if not self.gradebook.add_subject(name):
+            raise RequestError(400, self._last_message())
+        return 201, {"name": name.strip()}
+
+    def _update_grade(self, name, subject, grade):
+        if not isinstance(name, str):
+            raise RequestError(400, "name must be text")
+        if isinstance(grade, bool):
+            raise RequestError(400, "grade must be a number")
+        self._require_student(name)
+        if not self.gradebook.update_student_grade(name, subject, grade):
+            raise RequestError(400, self._last_message())
+        return 200, None
+
+    def _student_details(self, name):
+        self._require_student(name)
+        student = self.gradebook.students[name.strip()]
+        average = student.calculate_average() if student.has_grades() else None
+        return {"name": student.name, "grades": dict(student.grades), "average": average}
+
+    def _ranked(self, subject, limit):
+        """
+        Students by average (subject None) or by one subject, best first.
+        A limited list is read from the gradebook's rank index, which is
+        built on the first such request and kept up to date afterwards, so
+        repeated leaderboard requests do not scan every student.
+        """
+        if limit is not None:
+            self.gradebook.keep_ranking(subject)
+            return self.gradebook.top_k(limit, subject)
+        if subject is None:
+            return self.gradebook.bubble_sort_students_by_average()
+        return self.gradebook.insertion_sort_students_by_subject(subject)
+
+    def _below(self, query):
+        """
+        Students under ?threshold= (default AT_RISK_THRESHOLD) by average or by ?subject=.
+        """
+        try:
+            threshold = float(query["threshold"][0]) if "threshold" in query else AT_RISK_THRESHOLD
+        except ValueError:
+            raise RequestError(400, "threshold must be a number") from None
+        if not math.isfinite(threshold):  # float() accepts nan and inf
+            raise RequestError(400, "threshold must be a finite number")
+        subject = query["subject"][0] if "subject" in query else None
+        if subject is not None:
+            self._require_subject(subject)
+        found = self.gradebook.students_below(threshold, subject, _limit(query))
+        return [{"name": student.name, "score": score} for score, student in found]
+
+    def _events(self, query):
+        """
+        Changes after ?after= (default 0). A client keeps the "last" value of
+        each answer and passes it as after= on its next request; a 410 answer
+        means it fell too far behind and has to read the whole roster again.
+        """
+        try:
+            after = int(query["after"][0]) if "after" in query else 0
+        except ValueError:
+            raise RequestError(400, "after must be a whole number") from None
+        try:
+            events = self.events.read(after, _limit(query))
+        except EventsLostError as error:
+            raise RequestError(410, str(error)) from None
+        last = events[-1].sequence if events else after
+        return {"events": [event.to_dict() for event in events], "last": last}
+
+    def _sorted(self, parts, limit):
+        gradebook = self.gradebook
+        if parts == ["average"]:
+            ranked = self._ranked(None, limit)
+            return [{"name": student.name, "average": average} for average, student in ranked]
+        if len(parts) == 2 and parts[0] == "subject":
+            self._require_subject(parts[1])
+            ranked = self._ranked(parts[1], limit)
+            return [{"name": student.name, "grade": grade} for grade, student in ranked]
+        if parts == ["name"]:
+            names = [student.name for student in gradebook.sort_students_by_name()]
+            return names if limit is None else names[:limit]
+        raise RequestError(404, "Use /sorted/average, /sorted/subject/SUBJECT or /sorted/name")
+
+    def _batch(self, requests):
+        """
+        Run several requests in one go and return all their answers.
+        """
+        if not isinstance(requests, list):
+            raise RequestError(400, "requests must be a list")
+        if len(requests) > MAX_BATCH_REQUESTS:
+            raise RequestError(413, f"At most {MAX_BATCH_REQUESTS} requests per batch")
+
+        answers = []
+        for request in requests:
+            if not isinstance(request, dict) or "path" not in request:
+                answers.append({"status": 400, "ok": False, "error": "Each request needs a path"})
+                continue
+            method = request.get("method", "GET")
+            if not isinstance(request["path"], str) or not isinstance(method, str):
+                answers.append({"status": 400, "ok": False, "error": "path and method must be strings"})
+                continue
+            if request["path"].startswith("/batch"):
+                answers.append({"status": 400, "ok": False, "error": "Batches cannot be nested"})
+                continue
+            status, payload = self.handle(method.upper(), request["path"], request.get("body"))
+            answers.append({"status": status, **payload})
+        return answers
+
+
+async def _send(reader, writer, method, path, body=None):
+    """
+    Send one request on an open keep-alive connection and read the answer.
+    Returns (status, decoded JSON).
+    """
+    data = b"" if body is None else json.dumps(body).encode("utf-8")
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+                 .encode("latin-1") + data)
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def _load_client(host, port, names, requests, seed, latencies, failures):
+    """
+    One simulated teacher: a keep-alive connection sending a mix of requests.
+    """
+    generator = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            roll = generator.random()
+            name = generator.choice(names)
+            if roll < 0.40:
+                call = ("PUT", f"/students/{name.replace(' ', '%20')}/grades/{generator.choice(subjects)}",
+                        {"grade": generator.randint(0, 100)})
+            elif roll < 0.65:
+                call = ("GET", f"/students/{name.replace(' ', '%20')}", None)
+            elif roll < 0.80:
+                call = ("GET", f"/stats/{generator.choice(subjects)}", None)
+            elif roll < 0.90:
+                call = ("GET", "/sorted/average?limit=10", None)
+            else:
+                call = ("GET", f"/search?prefix={name[:3]}&limit=10", None)
+
+            start = time.perf_counter()
+            status, _ = await _send(reader, writer, *call)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                failures.append(status)
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+async def load_test(host, port, names, clients=50, requests_per_client=200, seed=1):
+    """
+    Measure the server with many concurrent keep-alive clients.
+
+    Args:
+        host (str): Server address
+        port (int): Server port
+        names (list): Existing student names to use in requests
+        clients (int): Concurrent connections
+        requests_per_client (int): Requests each connection sends
+        seed (int): Random seed for the request mix
+
+    Returns:
+        dict: requests, failures, seconds, requests_per_second, p50_ms, p99_ms, max_ms
+    """
+    latencies = []
+    failures = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_client(host, port, names, requests_per_client, seed + number,
+                                        latencies, failures)
+                           for number in range(clients)))
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "failures": len(failures),
+        "seconds": seconds,
+        "requests_per_second": len(latencies) / seconds if seconds else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
+
+
+def _sample_gradebook(num_students):
+    """
+    A gradebook filled with synthetic students for the load test.
+    """
+    from nathane_lebogang_benchmark import make_names
+
+    gradebook = Gradebook()
+    generator = random.Random(0)
+    names = make_names(num_students)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in names:
+            student = gradebook._insert_student(name)
+            for subject in subjects:
+                student._set_grade(subject, generator.randint(0, 100))
+    return gradebook, names
+
+
+async def _run_load_test(options):
+    gradebook, names = _sample_gradebook(options.students)
+    server = await GradebookServer(gradebook, options.host, 0).start()
+    try:
+        return await load_test(options.host, server.port, names, options.clients, options.requests)
+    finally:
+        await server.close()
+
+
+def main(arguments=None):
+    parser = argparse.ArgumentParser(description="Serve the Section F Gradebook over HTTP/JSON.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--load", action="store_true",
+                        help="start a server with synthetic students and measure it")
+    parser.add_argument("--students", type=int, default=10000, help="students for --load")
+    parser.add_argument("--clients", type=int, default=50, help="concurrent connections for --load")
+    parser.add_argument("--requests", type=int, default=200, help="requests per connection for --load")
+    options = parser.parse_args(arguments)
+
+    if options.load:
+        result = asyncio.run(_run_load_test(options))
+        print(f"{result['requests']:,} requests from {options.clients} keep-alive clients "
+              f"in {result['seconds']:.2f} s ({result['failures']} failed)")
+        print(f"Throughput: {result['requests_per_second']:,.0f} requests/sec")
+        print(f"Latency: p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms, "
+              f"max {result['max_ms']:.2f} ms")
+        return 0
+
+    server = GradebookServer(host=options.host, port=options.port)
+    print(f"Serving the gradebook on http://{options.host}:{options.port} (Ctrl+C to stop)")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
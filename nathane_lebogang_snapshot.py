@@ -0,0 +1,249 @@
+"""
+Copy-on-write snapshots of a Section F Gradebook for read-only reports.
+
+A long report (view_all_students, a full sort_by_average) walks the live
+students dictionary, so a student added or a grade changed half way
+through either shows up in half the report or stops it with "dictionary
+changed size during iteration". After
+
+    frozen = gradebook.freeze()
+    frozen.view_all_students()       # or sort_by_average(), view_subject_grades(), ...
+
+the report sees the gradebook exactly as it was when freeze() was called,
+while changes to the gradebook carry on. Taking a snapshot copies nothing:
+
+    roster      the snapshot keeps the gradebook's students dictionary; the
+                first add or remove after it gives the gradebook a new
+                dictionary (one copy of the name -> Student references, not
+                of the students) and leaves the old one to the snapshot
+    students    a student's grades are copied only when that student first
+                changes (or is removed) while the snapshot is open; every
+                other student is read from the live gradebook
+
+So the cost of a snapshot grows with the number of changes made while it
+is open, not with the number of students. Snapshots are forgotten as soon
+as nothing refers to them any more. Statistics and the name index of a
+snapshot are built from its students the first time they are asked for.
+The subject catalogue is shared with the gradebook, so a subject added
+later is listed (with no grades) in the snapshot's reports.
+"""
+
+from nathane_lebogang_histogram import GradeHistogram
+from nathane_lebogang_name_index import NameIndex
+from nathane_lebogang_running_stats import RunningStats
+from nathane_lebogang_section_F import BulkUpdateReport, Gradebook, Student
+
+READ_ONLY_MESSAGE = "Error: This is a read-only snapshot of the gradebook"
+
+
+class FrozenStudent(Student):
+    """
+    A student as it was when a snapshot was taken (its grades cannot be changed
+    through it). For a student that has not changed since, it is a read-only
+    copy of the live student's grades made when the snapshot reads it.
+    """
+
+    def __init__(self, name, grades, registry):
+        """
+        Args:
+            name (str): The student's name
+            grades (dict): subject -> grade at the time of the snapshot
+            registry (SubjectRegistry): The gradebook's subjects
+        """
+        self.name = name
+        self.grades = grades
+        self.gradebook = None
+        self.subjects = registry
+        self._totals = None
+
+    @classmethod
+    def view_of(cls, student, registry):
+        """
+        Read-only copy of a student that has not changed since the snapshot.
+        The grades are copied, so later changes to the live student do not
+        show up in a copy a report is still holding.
+
+        Args:
+            student (Student): The live student (any backend's Student)
+            registry (SubjectRegistry): The gradebook's subjects
+
+        Returns:
+            FrozenStudent: A copy of the student's grades as they are now
+        """
+        view = cls(student.name, dict(student.grades.items()), registry)
+        totals = getattr(student, "_totals", None)
+        if isinstance(totals, tuple):
+            view._totals = totals  # Worked out from the grades just copied
+        return view
+
+    def _registry(self):
+        return self.subjects
+
+    def _set_grade(self, subject, grade):
+        raise TypeError("Students in a snapshot are read-only")
+
+
+class FrozenRoster:
+    """
+    The snapshot's students dictionary (name -> Student), read-only.
+    """
+
+    def __init__(self, snapshot, names):
+        """
+        Args:
+            snapshot (FrozenGradebook): The snapshot the roster belongs to
+            names (dict): The gradebook's roster when the snapshot was taken (only the keys are used)
+        """
+        self.snapshot = snapshot
+        self.names = names
+
+    def __getitem__(self, name):
+        if name not in self.names:
+            raise KeyError(name)
+        return self.snapshot._student(name)
+
+    def get(self, name, default=None):
+        return self[name] if name in self.names else default
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        return self.names.keys()
+
+    def values(self):
+        return FrozenStudents(self)
+
+    def items(self):
+        return ((student.name, student) for student in self.values())
+
+
+class FrozenStudents:
+    """
+    roster.values() for a snapshot: students are looked up one at a time while iterating.
+    """
+
+    def __init__(self, roster):
+        self.roster = roster
+
+    def __iter__(self):
+        student = self.roster.snapshot._student
+        for name in self.roster.names:
+            yield student(name)
+
+    def __len__(self):
+        return len(self.roster)
+
+
+class FrozenGradebook(Gradebook):
+    """
+    Read-only view of a Gradebook at one moment (made by Gradebook.freeze()).
+    Every reading method of Gradebook works on it; changing methods print
+    an error and return False.
+
+    Attributes:
+        gradebook (Gradebook): The live gradebook
+        kept (dict): name -> FrozenStudent for students that changed since the snapshot
+    """
+
+    def __init__(self, gradebook):
+        """
+        Take a snapshot (use gradebook.freeze(), which also registers it for changes).
+
+        Args:
+            gradebook (Gradebook): The gradebook to freeze
+        """
+        self.gradebook = gradebook
+        self.sort_strategy = gradebook.sort_strategy
+        self.subjects = gradebook.subjects
+        self.kept = {}
+        self.students = FrozenRoster(self, gradebook._share_roster())
+        self.rank_indexes = {}  # Rankings are built from the snapshot's own students
+        self.events = None
+        self._statistics = None
+        self._name_index = None
+
+    def _student(self, name):
+        student = self.gradebook._snapshot_student(self, name)
+        if not isinstance(student, FrozenStudent):
+            student = FrozenStudent.view_of(student, self.subjects)  # Never hand out the live Student
+        return student
+
+    def _keep(self, student, subject=None, old_grade=None):
+        """
+        Called by the gradebook before a student is removed (subject None) or
+        after one of its grades changed from old_grade: remember the student's
+        state from before the change, the first time only.
+        """
+        name = student.name
+        if name in self.kept or name not in self.students.names:
+            return  # Already kept, or added after the snapshot
+        grades = dict(student.grades.items())
+        if subject is not None:
+            if old_grade is None:
+                grades.pop(subject, None)
+            else:
+                grades[subject] = old_grade
+        self.kept[name] = FrozenStudent(name, grades, self.subjects)
+
+    def freeze(self):
+        return self  # A snapshot never changes, so it can be shared
+
+    # Indexes and statistics, built from the snapshot's students when first needed
+
+    @property
+    def name_index(self):
+        if self._name_index is None:
+            name_index = NameIndex()
+            for name in self.students:
+                name_index.add(name)
+            self._name_index = name_index
+        return self._name_index
+
+    def _built_statistics(self):
+        """
+        (subject_stats, subject_histograms, class_stats) worked out from the snapshot's grades.
+        """
+        if self._statistics is None:
+            subject_names = list(self.subjects.names_by_id)
+            subject_stats = {subject: RunningStats() for subject in subject_names}
+            subject_histograms = {subject: GradeHistogram() for subject in subject_names}
+            class_stats = RunningStats()
+            for student in self.students.values():
+                for subject, grade in student.grades.items():
+                    subject_stats[subject].add(grade)
+                    subject_histograms[subject].add(grade)
+                    class_stats.add(grade)
+            self._statistics = (subject_stats, subject_histograms, class_stats)
+        return self._statistics
+
+    @property
+    def subject_stats(self):
+        return self._built_statistics()[0]
+
+    @property
+    def subject_histograms(self):
+        return self._built_statistics()[1]
+
+    @property
+    def class_stats(self):
+        return self._built_statistics()[2]
+
+    # Changes are not allowed
+
+    def _read_only(self, *arguments):
+        print(READ_ONLY_MESSAGE)
+        return False
+
+    add_student = remove_student = update_student_grade = _read_only
+    add_subject = retire_subject = enable_events = _read_only
+
+    def update_grades_bulk(self, records, max_errors=100):
+        print(READ_ONLY_MESSAGE)
+        return BulkUpdateReport(max_errors)
@@ -0,0 +1,302 @@
+"""
+Sort engine used by the Gradebook sorting methods.
+
+Every strategy takes a list of items and a key function and returns a NEW
+sorted list. All strategies are stable, so students with equal keys keep the
+order they were added to the gradebook in, which is the same tie-breaking the
+original bubble sort and insertion sort gave us.
+
+Strategies:
+    timsort   - Python's built-in sorted() (O(n log n), the default)
+    merge     - Manual bottom-up merge sort (O(n log n))
+    bubble    - The original bubble sort (O(n^2), kept for teaching)
+    insertion - The original insertion sort (O(n^2), kept for teaching)
+
+top_k() selects only the best (or worst) k items with a heap, which is
+O(n log k) and much faster than a full sort when only a few rows are needed.
+"""
+
+import heapq
+import random
+import time
+
+DEFAULT_STRATEGY = "timsort"
+
+
+def timsort(items, key, descending=False):
+    """
+    Sort using Python's built-in Timsort.
+
+    Args:
+        items (list): The items to sort
+        key (callable): Function that returns the value to compare
+        descending (bool): True for highest first
+
+    Returns:
+        list: A new sorted list
+    """
+    # sorted() stays stable even with reverse=True
+    return sorted(items, key=key, reverse=descending)
+
+
+def merge_sort(items, key, descending=False):
+    """
+    Sort using a bottom-up merge sort.
+
+    Args:
+        items (list): The items to sort
+        key (callable): Function that returns the value to compare
+        descending (bool): True for highest first
+
+    Returns:
+        list: A new sorted list
+    """
+    # Decorate once so the key function is only called n times
+    source = [(key(item), item) for item in items]
+    n = len(source)
+    target = [None] * n
+    width = 1
+
+    while width < n:
+        for low in range(0, n, 2 * width):
+            middle = min(low + width, n)
+            high = min(low + 2 * width, n)
+            i, j, k = low, middle, low
+
+            while i < middle and j < high:
+                # Take from the left run on ties so the sort stays stable
+                if descending:
+                    take_left = source[i][0] >= source[j][0]
+                else:
+                    take_left = source[i][0] <= source[j][0]
+
+                if take_left:
+                    target[k] = source[i]
+                    i += 1
+                else:
+                    target[k] = source[j]
+                    j += 1
+                k += 1
+
+            target[k:high] = source[i:middle] if i < middle else source[j:high]
+
+        source, target = target, source
+        width *= 2
+
+    return [item for value, item in source]
+
+
+def bubble_sort(items, key, descending=False):
+    """
+    Sort using the original bubble sort algorithm.
+
+    Args:
+        items (list): The items to sort
+        key (callable): Function that returns the value to compare
+        descending (bool): True for highest first
+
+    Returns:
+        list: A new sorted list
+    """
+    result = list(items)
+    n = len(result)
+    for i in range(n):
+        for j in range(0, n - i - 1):
+            # Only swap on a strict comparison so equal items keep their order
+            if descending:
+                out_of_order = key(result[j]) < key(result[j + 1])
+            else:
+                out_of_order = key(result[j]) > key(result[j + 1])
+
+            if out_of_order:
+                result[j], result[j + 1] = result[j + 1], result[j]
+
+    return result
+
+
+def insertion_sort(items, key, descending=False):
+    """
+    Sort using the original insertion sort algorithm.
+
+    Args:
+        items (list): The items to sort
+        key (callable): Function that returns the value to compare
+        descending (bool): True for highest first
+
+    Returns:
+        list: A new sorted list
+    """
+    result = list(items)
+    for i in range(1, len(result)):
+        current = result[i]
+        current_key = key(current)
+        j = i - 1
+
+        # Move elements that belong after the current item one position ahead
+        while j >= 0:
+            if descending:
+                should_move = key(result[j]) < current_key
+            else:
+                should_move = key(result[j]) > current_key
+            if not should_move:
+                break
+            result[j + 1] = result[j]
+            j -= 1
+        result[j + 1] = current
+
+    return result
+
+
+# Registry of available strategies: name -> (display label, sort function)
+SORT_STRATEGIES = {
+    "timsort": ("Timsort", timsort),
+    "merge": ("Merge Sort", merge_sort),
+    "bubble": ("Bubble Sort", bubble_sort),
+    "insertion": ("Insertion Sort", insertion_sort),
+}
+
+# Strategies that are too slow to run on large rosters
+QUADRATIC_STRATEGIES = {"bubble", "insertion"}
+
+
+def register_strategy(name, label, sort_function):
+    """
+    Add a new sorting strategy to the engine.
+
+    Args:
+        name (str): Short name used to select the strategy
+        label (str): Human readable name shown in reports
+        sort_function (callable): Function taking (items, key, descending)
+    """
+    SORT_STRATEGIES[name] = (label, sort_function)
+
+
+def get_strategy(name):
+    """
+    Look up a sorting strategy by name.
+
+    Args:
+        name (str): The strategy name
+
+    Returns:
+        callable: The sort function
+
+    Raises:
+        ValueError: If the strategy does not exist
+    """
+    if name not in SORT_STRATEGIES:
+        available = ", ".join(SORT_STRATEGIES)
+        raise ValueError(f"Unknown sort strategy '{name}'. Available: {available}")
+    return SORT_STRATEGIES[name][1]
+
+
+def strategy_label(name):
+    """
+    Get the display label for a strategy, e.g. "Bubble Sort".
+
+    Args:
+        name (str): The strategy name
+
+    Returns:
+        str: The display label
+    """
+    get_strategy(name)  # Validates the name
+    return SORT_STRATEGIES[name][0]
+
+
+def top_k(items, k, key, descending=True):
+    """
+    Select the best k items with a heap instead of sorting everything.
+
+    The result is exactly the same as sorting the items with a stable sort
+    and keeping the first k, including the order of ties.
+
+    Args:
+        items (iterable): The items to select from
+        k (int): How many items to return
+        key (callable): Function that returns the value to compare
+        descending (bool): True for the highest k, False for the lowest k
+
+    Returns:
+        list: Up to k items in sorted order
+    """
+    if k <= 0:
+        return []
+    if descending:
+        return heapq.nlargest(k, items, key=key)
+    return heapq.nsmallest(k, items, key=key)
+
+
+def sort_items(items, key, descending=False, strategy=DEFAULT_STRATEGY, limit=None):
+    """
+    Sort items with the chosen strategy, or select the top items if a limit is given.
+
+    Args:
+        items (list): The items to sort
+        key (callable): Function that returns the value to compare
+        descending (bool): True for highest first
+        strategy (str): Name of the sorting strategy
+        limit (int): Only return this many items (uses a heap)
+
+    Returns:
+        list: A new sorted list
+    """
+    sort_function = get_strategy(strategy)
+    if limit is not None:
+        return top_k(items, limit, key, descending)
+    return sort_function(items, key, descending)
+
+
+def benchmark_strategies(sizes=(1000, 10000, 100000), strategies=None, repeat=3,
+                         quadratic_limit=5000, seed=42):
+    """
+    Time every strategy on random grade data.
+
+    Quadratic strategies are skipped for sizes above quadratic_limit
+    because they would take minutes.
+
+    Args:
+        sizes (tuple): Number of items to sort in each run
+        strategies (list): Strategy names to time (default: all)
+        repeat (int): How many times to run each measurement (best is kept)
+        quadratic_limit (int): Largest size to run bubble/insertion sort on
+        seed (int): Random seed so results are repeatable
+
+    Returns:
+        dict: {size: {strategy: best time in seconds}}
+    """
+    strategies = strategies or list(SORT_STRATEGIES)
+    generator = random.Random(seed)
+    results = {}
+
+    for size in sizes:
+        # (average, position) pairs, with lots of ties like real grades
+        data = [(generator.randint(0, 100), position) for position in range(size)]
+        results[size] = {}
+
+        for name in strategies:
+            if name in QUADRATIC_STRATEGIES and size > quadratic_limit:
+                continue
+            sort_function = get_strategy(name)
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                sort_function(data, lambda pair: pair[0], True)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[size][name] = best
+
+        # Top 10 selection for comparison with a full sort
+        start = time.perf_counter()
+        top_k(data, 10, lambda pair: pair[0])
+        results[size]["top_k(10)"] = time.perf_counter() - start
+
+    return results
+
+
+if __name__ == "__main__":
+    print("SORT ENGINE BENCHMARK")
+    for size, timings in benchmark_strategies().items():
+        print(f"\n{size} items")
+        for name, seconds in timings.items():
+            print(f"  {name}: {seconds * 1000:.2f} ms")
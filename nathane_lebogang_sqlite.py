@@ -0,0 +1,792 @@
+"""
+SQLite storage engine for the Section F Gradebook.
+
+The normal Gradebook keeps every Student in memory, so the roster can only
+be as large as the computer's RAM. SQLiteGradebook keeps the students and
+their grades in a SQLite database file instead and answers the big queries
+inside SQLite, using its indexes:
+
+    sort_by_subject / top_k / rank_of   - grades(subject_id, grade) index, read in order
+    students_below                      - the same index, read from the lowest grade
+    view_subject_grades                 - one LEFT JOIN over the students
+    get_subject_statistics              - one aggregate over the subject's index entries
+    get_subject_distribution            - counts and OFFSET reads on the same index
+    search_students_by_name / _prefix   - students(name_key) (lowercase names)
+
+Student objects are only created for the students a query returns and read
+their grades from the database when asked, so a report over a million
+students never has a million Student objects in memory at once.
+
+Schema (normalized, one row per grade):
+
+    subjects(id, name, active)                    id = the SubjectRegistry id
+    students(id, name, name_key)                  id grows in the order students are added
+    grades(student_id, subject_id, grade)         primary key (student_id, subject_id)
+
+Changes are committed every commit_every changes and by commit() / close(),
+so a program that stops without closing loses at most the last few changes.
+Averages are added up in subject order, so an average of non-whole grades
+can differ in the last binary digit from the one a normal Student works out.
+
+Run python nathane_lebogang_sqlite.py grades.db 100000 to fill a database
+with synthetic students and time the indexed queries.
+"""
+
+import math
+import sqlite3
+import sys
+import time
+from collections.abc import Mapping, MutableMapping
+
+from nathane_lebogang_events import GradeChanged, StudentAdded, StudentRemoved, SubjectAdded
+from nathane_lebogang_histogram import GRADE_BANDS, GradeHistogram
+from nathane_lebogang_report import write_lines
+from nathane_lebogang_section_F import (
+    EmptyNameError, Gradebook, InvalidSubjectError, Student, student_detail_lines,
+)
+from nathane_lebogang_sort_engine import DEFAULT_STRATEGY
+from nathane_lebogang_subjects import SubjectRegistry
+
+DEFAULT_COMMIT_EVERY = 1000  # Changes between commits
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subjects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    active INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS students (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    name_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS grades (
+    student_id INTEGER NOT NULL REFERENCES students(id),
+    subject_id INTEGER NOT NULL REFERENCES subjects(id),
+    grade NOT NULL,
+    PRIMARY KEY (student_id, subject_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS students_by_key ON students(name_key, name);
+CREATE INDEX IF NOT EXISTS grades_by_subject ON grades(subject_id, grade DESC, student_id);
+"""
+# The grade column has no type, so whole grades come back as int and others as float
+
+AVERAGE_SCORES = ("SELECT student_id, SUM(grade) * 1.0 / COUNT(*) AS score "
+                  "FROM grades GROUP BY student_id")
+SUBJECT_SCORES = "SELECT student_id, grade AS score FROM grades WHERE subject_id = ?"
+NO_LIMIT = -1  # LIMIT -1 means no limit in SQLite
+
+
+class SQLGrades(MutableMapping):
+    """
+    One student's grades as a dictionary (subject -> grade), read from the database.
+    Setting or deleting through the view does not notify the gradebook,
+    just like changing a normal Student's grades dictionary directly.
+    """
+
+    __slots__ = ("gradebook", "student_id")
+
+    def __init__(self, gradebook, student_id):
+        self.gradebook = gradebook
+        self.student_id = student_id
+
+    def __getitem__(self, subject):
+        subject_id = self.gradebook._subject_id(subject)
+        row = None
+        if subject_id is not None:
+            row = self.gradebook.connection.execute(
+                "SELECT grade FROM grades WHERE student_id = ? AND subject_id = ?",
+                (self.student_id, subject_id)).fetchone()
+        if row is None:
+            raise KeyError(subject)
+        return row[0]
+
+    def __setitem__(self, subject, grade):
+        self.gradebook._store_grade(self.student_id, subject, grade)
+
+    def __delitem__(self, subject):
+        subject_id = self.gradebook._subject_id(subject)
+        if subject_id is None:
+            raise KeyError(subject)
+        cursor = self.gradebook.connection.execute(
+            "DELETE FROM grades WHERE student_id = ? AND subject_id = ?", (self.student_id, subject_id))
+        if not cursor.rowcount:
+            raise KeyError(subject)
+
+    def items(self):
+        names = self.gradebook.subjects.names_by_id
+        rows = self.gradebook.connection.execute(
+            "SELECT subject_id, grade FROM grades WHERE student_id = ? ORDER BY subject_id",
+            (self.student_id,))
+        return [(names[subject_id], grade) for subject_id, grade in rows]
+
+    def values(self):
+        return [grade for _, grade in self.items()]
+
+    def __iter__(self):
+        return iter([subject for subject, _ in self.items()])
+
+    def __len__(self):
+        return self.gradebook.connection.execute(
+            "SELECT COUNT(*) FROM grades WHERE student_id = ?", (self.student_id,)).fetchone()[0]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class SQLStudent(Student):
+    """
+    A Student whose grades live in the database.
+
+    Like the columnar StudentView it holds no grades itself, so it can be
+    created for a query result and thrown away again.
+    """
+
+    def __init__(self, name, student_id, gradebook):
+        """
+        Create a view of a student that already has a row.
+        The name was validated when the student was added.
+        """
+        self.name = name
+        self.student_id = student_id
+        self.gradebook = gradebook
+
+    @property
+    def grades(self):
+        """
+        The student's grades as a dictionary-like view.
+        """
+        return SQLGrades(self.gradebook, self.student_id)
+
+    def _set_grade(self, subject, grade):
+        """
+        Store an already validated grade and tell the gradebook about the change.
+        """
+        old_grade = self.grades.get(subject)
+        self.gradebook._store_grade(self.student_id, subject, grade)
+        self.gradebook._grade_changed(self, subject, old_grade, grade)
+
+    def _grade_totals(self):
+        """
+        Work out (total, count, average) in the database every time
+        (another view of the same student may have changed the grades).
+        """
+        Student.cache_misses += 1
+        total, count = self.gradebook.connection.execute(
+            "SELECT SUM(grade), COUNT(*) FROM grades WHERE student_id = ?",
+            (self.student_id,)).fetchone()
+        if not count:
+            return 0, 0, 0
+        return total, count, total / count
+
+    def has_grades(self):
+        """
+        Check if student has any grades.
+        """
+        return self.gradebook.connection.execute(
+            "SELECT EXISTS (SELECT 1 FROM grades WHERE student_id = ?)",
+            (self.student_id,)).fetchone()[0] == 1
+
+    def detail_lines(self):
+        """
+        Same lines as Student.detail_lines(), reading the grades with one query.
+        """
+        grades = dict(self.grades.items())
+        average = sum(grades.values()) / len(grades) if grades else None
+        return student_detail_lines(self.name, grades, average,
+                                    self.gradebook.subjects.shown_for(grades))
+
+
+class SQLStudentTable(Mapping):
+    """
+    The gradebook's students dictionary (name -> Student) for the SQLite backend.
+    Student views are created on request instead of being stored.
+    """
+
+    def __init__(self, gradebook):
+        self.gradebook = gradebook
+
+    def _id_of(self, name):
+        try:
+            row = self.gradebook.connection.execute(
+                "SELECT id FROM students WHERE name = ?", (name,)).fetchone()
+        except (sqlite3.InterfaceError, sqlite3.ProgrammingError):  # Not something SQLite can look up
+            return None
+        return None if row is None else row[0]
+
+    def __getitem__(self, name):
+        student_id = self._id_of(name)
+        if student_id is None:
+            raise KeyError(name)
+        return SQLStudent(name, student_id, self.gradebook)
+
+    def __contains__(self, name):
+        return self._id_of(name) is not None
+
+    def __iter__(self):
+        for (name,) in self.gradebook.connection.execute("SELECT name FROM students ORDER BY id"):
+            yield name
+
+    def __len__(self):
+        return self.gradebook.connection.execute("SELECT COUNT(*) FROM students").fetchone()[0]
+
+    def values(self):
+        return SQLStudentViews(self.gradebook)
+
+
+class SQLStudentViews:
+    """
+    students.values() for the SQLite backend: views are made one row at a time
+    while iterating, in the order students were added.
+    """
+
+    def __init__(self, gradebook):
+        self.gradebook = gradebook
+
+    def __iter__(self):
+        gradebook = self.gradebook
+        for student_id, name in gradebook.connection.execute("SELECT id, name FROM students ORDER BY id"):
+            yield SQLStudent(name, student_id, gradebook)
+
+    def __len__(self):
+        return len(self.gradebook.students)
+
+
+class SQLStats:
+    """
+    Statistics of one subject (or of every grade, subject None) read from the database.
+    Gives the same summary() as RunningStats without keeping any grades in memory.
+    """
+
+    def __init__(self, gradebook, subject=None):
+        self.gradebook = gradebook
+        self.subject = subject
+
+    def _totals(self):
+        """
+        (count, total, sum of squares, highest, lowest) in one query.
+        """
+        if self.subject is None:
+            query, parameters = "FROM grades", ()
+        else:
+            query, parameters = "FROM grades WHERE subject_id = ?", (self.gradebook.subjects.id_of(self.subject),)
+        return self.gradebook.connection.execute(
+            f"SELECT COUNT(*), TOTAL(grade), TOTAL(grade * grade), MAX(grade), MIN(grade) {query}",
+            parameters).fetchone()
+
+    @property
+    def count(self):
+        return self._totals()[0]
+
+    @property
+    def total(self):
+        count, total = self._totals()[:2]
+        return total if count else 0
+
+    def mean(self):
+        count, total = self._totals()[:2]
+        return total / count if count else 0
+
+    def summary(self):
+        """
+        Returns:
+            dict: count, average, highest, lowest and std_dev
+        """
+        count, total, sum_of_squares, highest, lowest = self._totals()
+        if not count:
+            return {"count": 0, "average": 0, "highest": None, "lowest": None, "std_dev": 0.0}
+        average = total / count
+        variance = max(sum_of_squares / count - average * average, 0)
+        return {"count": count, "average": average, "highest": highest, "lowest": lowest,
+                "std_dev": variance ** 0.5}
+
+
+class SQLHistogram(GradeHistogram):
+    """
+    Grade distribution of one subject read from the grades_by_subject index.
+    Same methods as GradeHistogram, but percentiles are the exact grades.
+    """
+
+    def __init__(self, gradebook, subject, bands=GRADE_BANDS):
+        self.gradebook = gradebook
+        self.subject = subject
+        self.bands = bands
+
+    def _select(self, select, rest="", parameters=()):
+        return self.gradebook.connection.execute(
+            f"SELECT {select} FROM grades WHERE subject_id = ? {rest}",
+            (self.gradebook.subjects.id_of(self.subject),) + tuple(parameters)).fetchone()
+
+    @property
+    def count(self):
+        return self._select("COUNT(*)")[0]
+
+    def percentile(self, percent):
+        count = self.count
+        if not count:
+            return None
+        rank = min(max(1, math.ceil(count * percent / 100)), count)
+        return self._select("grade", "ORDER BY grade LIMIT 1 OFFSET ?", (rank - 1,))[0]
+
+    def count_below(self, grade):
+        return self._select("COUNT(*)", "AND grade < ?", (grade,))[0]
+
+
+class SQLRanking:
+    """
+    Ranking of students by average (subject None) or by one subject, highest
+    first with ties in the order students were added. It has the same methods
+    as RankIndex but every answer is an ORDER BY ... LIMIT query, so nothing is
+    built or kept in memory.
+    """
+
+    def __init__(self, gradebook, subject=None):
+        self.gradebook = gradebook
+        if subject is None:
+            self.scores, self.parameters = AVERAGE_SCORES, ()
+        else:
+            self.scores, self.parameters = SUBJECT_SCORES, (gradebook.subjects.id_of(subject),)
+
+    def _query(self, select, rest="", parameters=()):
+        return self.gradebook.connection.execute(
+            f"SELECT {select} FROM ({self.scores}) AS ranked {rest}", self.parameters + tuple(parameters))
+
+    def _key(self, name):
+        """
+        (student id, score) of a ranked student, or None.
+        """
+        student_id = self.gradebook.students._id_of(name)
+        if student_id is None:
+            return None
+        return self._query("student_id, score", "WHERE student_id = ?", (student_id,)).fetchone()
+
+    def __len__(self):
+        return self._query("COUNT(*)").fetchone()[0]
+
+    def __contains__(self, name):
+        return self._key(name) is not None
+
+    def score_of(self, name):
+        return self._key(name)[1]
+
+    def rank(self, name):
+        student_id, score = self._key(name)
+        ahead = self._query("COUNT(*)", "WHERE score > ? OR (score = ? AND student_id < ?)",
+                            (score, score, student_id)).fetchone()[0]
+        return ahead + 1
+
+    def percentile(self, name):
+        score = self._key(name)[1]
+        below = self._query("COUNT(*)", "WHERE score < ?", (score,)).fetchone()[0]
+        equal = self._query("COUNT(*)", "WHERE score = ?", (score,)).fetchone()[0]
+        return 100 * (below + 0.5 * equal) / len(self)
+
+    def students(self, order="score DESC, ranked.student_id", where="", parameters=(), limit=None):
+        """
+        (score, SQLStudent) pairs in the given order, read straight from the index.
+        """
+        gradebook = self.gradebook
+        rows = self._query("ranked.student_id, students.name, score",
+                           f"JOIN students ON students.id = ranked.student_id {where} "
+                           f"ORDER BY {order} LIMIT ?",
+                           tuple(parameters) + (NO_LIMIT if limit is None else limit,))
+        return [(score, SQLStudent(name, student_id, gradebook)) for student_id, name, score in rows]
+
+    def top(self, count):
+        return [(score, student.name) for score, student in self.students(limit=count)]
+
+    def bottom(self, count):
+        return [(score, student.name) for score, student in
+                self.students("score, ranked.student_id DESC", limit=count)]
+
+    def band(self, low, high):
+        return [(score, student.name) for score, student in
+                self.students(where="WHERE score BETWEEN ? AND ?", parameters=(low, high))]
+
+    def below(self, score, limit=None):
+        return [(low_score, student.name) for low_score, student in
+                self.students("score, ranked.student_id DESC", "WHERE score < ?", (score,), limit)]
+
+    def ranked(self):
+        for score, student in self.students():
+            yield score, student.name
+
+
+class SQLiteGradebook(Gradebook):
+    """
+    Gradebook that keeps students and grades in a SQLite database.
+    Every public method of Gradebook works the same way.
+
+    Attributes:
+        path (str): The database file (":memory:" for a temporary database)
+        connection (sqlite3.Connection): The open database
+        commit_every (int): Commit after this many changes (0 = only on commit() and close())
+    """
+
+    def __init__(self, path=":memory:", sort_strategy=DEFAULT_STRATEGY, subject_names=None,
+                 commit_every=DEFAULT_COMMIT_EVERY):
+        """
+        Open (or create) a gradebook database. subject_names are the starting
+        subjects of a new database; an existing one keeps its own subjects.
+        """
+        super().__init__(sort_strategy, subject_names)
+        self.path = path
+        self.commit_every = commit_every
+        self.changes_since_commit = 0
+        self.connection = sqlite3.connect(path)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode = WAL")
+            self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(SCHEMA)
+        self._load_subjects()
+
+        self.students = SQLStudentTable(self)
+        self.class_stats = SQLStats(self)
+        self.name_index = None  # Names are searched in SQL
+
+    def _load_subjects(self):
+        """
+        Use the subjects stored in the database, or store the starting ones in a new database.
+        """
+        rows = self.connection.execute("SELECT id, name, active FROM subjects ORDER BY id").fetchall()
+        if rows:
+            self.subjects = SubjectRegistry(name for _, name, _ in rows)
+            for _, name, active in rows:
+                if not active:
+                    self.subjects.retire(name)
+        else:
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT INTO subjects (id, name, active) VALUES (?, ?, 1)",
+                    enumerate(self.subjects.names_by_id))
+        self.subject_stats = {subject: SQLStats(self, subject) for subject in self.subjects.names_by_id}
+        self.subject_histograms = {subject: SQLHistogram(self, subject) for subject in self.subjects.names_by_id}
+
+    def _subject_id(self, subject):
+        """
+        The database id of a subject, or None if it was never added.
+        """
+        try:
+            return self.subjects.ids.get(subject)
+        except TypeError:
+            return None
+
+    def _changed(self):
+        """
+        Count one change and commit when enough have been made.
+        """
+        self.changes_since_commit += 1
+        if self.commit_every and self.changes_since_commit >= self.commit_every:
+            self.commit()
+
+    def commit(self):
+        """
+        Write every change so far to the database file.
+        """
+        self.connection.commit()
+        self.changes_since_commit = 0
+
+    def close(self):
+        """
+        Commit and close the database. The data can be opened again later.
+        """
+        if self.connection is not None:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Storage
+
+    def _insert_subject(self, name):
+        subject_id = self.subjects.add(name)
+        subject = self.subjects.name_of(subject_id)
+        self.connection.execute(
+            "INSERT INTO subjects (id, name, active) VALUES (?, ?, 1) "
+            "ON CONFLICT (id) DO UPDATE SET active = 1", (subject_id, subject))
+        self.subject_stats.setdefault(subject, SQLStats(self, subject))
+        self.subject_histograms.setdefault(subject, SQLHistogram(self, subject))
+        self._changed()
+        if self.events is not None:
+            self.events.publish(SubjectAdded(subject))
+        return subject
+
+    def _retire_subject(self, name):
+        super()._retire_subject(name)
+        self.connection.execute("UPDATE subjects SET active = 0 WHERE name = ?", (name,))
+        self._changed()
+
+    def _share_roster(self):
+        # The students table keeps changing, so a snapshot gets its own copy of the names
+        return dict.fromkeys(self.students)
+
+    def _unshare_roster(self):
+        pass
+
+    def _insert_student(self, name):
+        cursor = self.connection.execute(
+            "INSERT INTO students (name, name_key) VALUES (?, ?)", (name, name.lower()))
+        self._changed()
+        if self.events is not None:
+            self.events.publish(StudentAdded(name))
+        return SQLStudent(name, cursor.lastrowid, self)
+
+    def _delete_student(self, name):
+        """
+        Delete a student and their grades. Returns a detached Student holding the old grades.
+        """
+        view = self.students[name]
+        if self._snapshots:
+            self._keep_for_snapshots(view)
+        removed = Student(name)
+        removed.grades = dict(view.grades.items())
+        self.connection.execute("DELETE FROM grades WHERE student_id = ?", (view.student_id,))
+        self.connection.execute("DELETE FROM students WHERE id = ?", (view.student_id,))
+        self._changed()
+        if self.events is not None:
+            self.events.publish(StudentRemoved(name))
+        return removed
+
+    def _store_grade(self, student_id, subject, grade):
+        """
+        Insert or replace one grade row (a subject that was never added is added first).
+        """
+        subject_id = self._subject_id(subject)
+        if subject_id is None:
+            subject_id = self.subjects.id_of(self._insert_subject(subject))
+        self.connection.execute(
+            "INSERT INTO grades (student_id, subject_id, grade) VALUES (?, ?, ?) "
+            "ON CONFLICT (student_id, subject_id) DO UPDATE SET grade = excluded.grade",
+            (student_id, subject_id, grade))
+
+    def _grade_changed(self, student, subject, old_grade, new_grade):
+        # Statistics and rankings are read from the database, so only the commit count changes
+        self._changed()
+        if self._snapshots:
+            self._keep_for_snapshots(student, subject, old_grade)
+        if self.events is not None:
+            self.events.publish(GradeChanged(student.name, subject, old_grade, new_grade))
+
+    def _rank_index(self, subject=None):
+        if subject is not None:
+            self._check_subject(subject)
+        return SQLRanking(self, subject)
+
+    def _kept_ranking(self, subject):
+        return SQLRanking(self, subject)  # The grades_by_subject index is always kept
+
+    def _algorithm_name(self, limit=None, indexed=False):
+        return "SQLite Index"
+
+    # Queries answered in SQL
+
+    def report_lines(self, start=0, limit=None):
+        """
+        Yield the all-students report, reading the students and grades in one query.
+        """
+        yield ""
+        yield "ALL STUDENTS"
+        names = self.subjects.names_by_id
+        rows = self.connection.execute(
+            "SELECT page.id, page.name, grades.subject_id, grades.grade "
+            "FROM (SELECT id, name FROM students ORDER BY id LIMIT ? OFFSET ?) AS page "
+            "LEFT JOIN grades ON grades.student_id = page.id "
+            "ORDER BY page.id, grades.subject_id",
+            (NO_LIMIT if limit is None else limit, start))
+
+        current_id = name = None
+        grades = {}
+        for student_id, student_name, subject_id, grade in rows:
+            if student_id != current_id:
+                if current_id is not None:
+                    yield from self._detail_lines(name, grades)
+                current_id, name, grades = student_id, student_name, {}
+            if subject_id is not None:
+                grades[names[subject_id]] = grade
+        if current_id is not None:
+            yield from self._detail_lines(name, grades)
+
+    def _detail_lines(self, name, grades):
+        average = sum(grades.values()) / len(grades) if grades else None
+        return student_detail_lines(name, grades, average, self.subjects.shown_for(grades))
+
+    def bubble_sort_students_by_average(self, limit=None):
+        """
+        Students with grades by average, highest first, as (average, student) tuples.
+        """
+        try:
+            ranked = SQLRanking(self).students(limit=limit)
+            if not ranked:
+                print("No students with grades to sort.")
+            return ranked
+
+        except Exception as error:
+            print(f"Error during sorting: {error}")
+            return []
+
+    def insertion_sort_students_by_subject(self, subject, limit=None):
+        """
+        Students with a grade in subject, highest first, as (grade, student) tuples.
+        Read in order from the grades_by_subject index, so a limit stops the scan early.
+        """
+        try:
+            self._check_subject(subject)
+
+            ranked = SQLRanking(self, subject).students(limit=limit)
+            if not ranked:
+                print(f"No students have grades for {subject} yet.")
+            return ranked
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error during sorting: {error}")
+            return []
+
+    def sort_students_by_name(self):
+        """
+        Sort students by name alphabetically (A to Z) using the name index.
+        """
+        try:
+            rows = self.connection.execute("SELECT id, name FROM students ORDER BY name").fetchall()
+            if not rows:
+                print("No students to sort.")
+                return []
+
+            student_list = [SQLStudent(name, student_id, self) for student_id, name in rows]
+            print("\nSTUDENTS SORTED BY NAME (A to Z)")
+            print(f"Using {self._algorithm_name()} Algorithm")
+            write_lines(student.name for student in student_list)
+            return student_list
+
+        except Exception as error:
+            print(f"Error sorting by name: {error}")
+            return []
+
+    def view_subject_grades(self, subject):
+        """
+        View grades for a specific subject across all students (one LEFT JOIN).
+        """
+        try:
+            self._check_subject(subject)
+
+            print(f"\n{subject.upper()} GRADES")
+            rows = self.connection.execute(
+                "SELECT students.name, grades.grade FROM students "
+                "LEFT JOIN grades ON grades.student_id = students.id AND grades.subject_id = ? "
+                "ORDER BY students.id", (self.subjects.id_of(subject),))
+            write_lines(f"{name}: {'No grade yet' if grade is None else grade}" for name, grade in rows)
+
+            write_lines(self._statistics_lines(subject))
+
+        except InvalidSubjectError as error:
+            print(f"Error: {error}")
+        except Exception as error:
+            print(f"Error viewing subject grades: {error}")
+
+    def _matching_students(self, condition, parameters, order, limit):
+        rows = self.connection.execute(
+            f"SELECT id, name FROM students WHERE {condition} ORDER BY {order} LIMIT ?",
+            tuple(parameters) + (NO_LIMIT if limit is None else limit,))
+        return [SQLStudent(name, student_id, self) for student_id, name in rows]
+
+    def search_students_by_prefix(self, prefix, limit=None):
+        """
+        Find students whose name starts with prefix (A to Z), using the students_by_key index.
+        """
+        try:
+            if not prefix or not prefix.strip():
+                raise EmptyNameError("Search term cannot be empty")
+
+            key = prefix.strip().lower()
+            return self._matching_students("name_key >= ? AND name_key < ?",
+                                           (key, key + "\U0010ffff"), "name_key, name", limit)
+
+        except EmptyNameError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error searching students: {error}")
+            return []
+
+    def search_students_by_name(self, search_term, limit=None):
+        """
+        Search for students by name (partial match, case-insensitive) in the order
+        they were added. A limit stops the scan as soon as enough are found.
+        """
+        try:
+            if not search_term or not search_term.strip():
+                raise EmptyNameError("Search term cannot be empty")
+
+            return self._matching_students("instr(name_key, ?) > 0", (search_term.strip().lower(),),
+                                           "id", limit)
+
+        except EmptyNameError as error:
+            print(f"Error: {error}")
+            return []
+        except Exception as error:
+            print(f"Error searching students: {error}")
+            return []
+
+
+def time_queries(path, num_students=0, seed=1):
+    """
+    Optionally fill a database with synthetic students, then time the indexed queries.
+
+    Args:
+        path (str): The database file
+        num_students (int): Synthetic students to add first (0 = use the database as it is)
+        seed (int): Random seed for the grades
+
+    Returns:
+        dict: query label -> seconds
+    """
+    import contextlib
+    import io
+    import random
+
+    from nathane_lebogang_benchmark import make_names
+
+    generator = random.Random(seed)
+    timings = {}
+    with SQLiteGradebook(path, commit_every=0) as gradebook, contextlib.redirect_stdout(io.StringIO()):
+        if num_students:
+            start = time.perf_counter()
+            for name in make_names(num_students, seed):
+                if name not in gradebook.students:
+                    student = gradebook._insert_student(name)
+                    for subject in gradebook.subjects:
+                        student._set_grade(subject, generator.randint(0, 100))
+            gradebook.commit()
+            timings["fill"] = time.perf_counter() - start
+
+        subject = next(iter(gradebook.subjects))
+        queries = {
+            f"top 10 in {subject}": lambda: gradebook.sort_by_subject(subject, 10),
+            "top 10 by average": lambda: gradebook.sort_by_average(10),
+            f"{subject} statistics": lambda: gradebook.get_subject_statistics(subject),
+            "search 'ab' (limit 10)": lambda: gradebook.search_students_by_name("ab", 10),
+            "prefix 'st' (limit 10)": lambda: gradebook.search_students_by_prefix("st", 10),
+            "class average": gradebook.get_class_average,
+        }
+        for label, query in queries.items():
+            start = time.perf_counter()
+            query()
+            timings[label] = time.perf_counter() - start
+    return timings
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python nathane_lebogang_sqlite.py DATABASE [STUDENTS_TO_ADD]")
+        sys.exit(1)
+
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    for label, seconds in time_queries(sys.argv[1], count).items():
+        print(f"{label:<28}{seconds * 1000:>10.2f} ms")
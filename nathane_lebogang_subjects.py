@@ -0,0 +1,151 @@
+"""
+The subject catalogue of a gradebook.
+
+Section F used to check subjects against the module-level list
+subjects = ["Math", "English", "Science"], which can never change and is
+searched from the start on every check. A SubjectRegistry belongs to one
+Gradebook and lets subjects be added and retired while the program runs:
+
+    registry = SubjectRegistry(["Math", "English", "Science"])
+    registry.add("History")        # gets the next id, 3
+    "History" in registry          # True - a dictionary lookup, not a list scan
+    registry.retire("Science")     # no new Science grades; id 2 stays reserved
+
+Every subject ever added gets a dense id (0, 1, 2, ...) that never changes
+and is never reused, so array-backed storage can use it as a position.
+Students only make room for a new subject when they get a grade for it.
+A retired subject keeps the grades already given and can be added again.
+"""
+
+
+class SubjectRegistry:
+    """
+    Subjects of one gradebook with dense ids.
+
+    Attributes:
+        ids (dict): subject -> id for every subject ever added (retired included)
+        names_by_id (list): id -> subject
+        active (dict): subject -> id for the subjects that accept grades, in id order
+    """
+
+    def __init__(self, names=()):
+        """
+        Create a registry with the given subjects active.
+
+        Args:
+            names (iterable): Subject names
+        """
+        self.ids = {}
+        self.names_by_id = []
+        self.active = {}
+        for name in names:
+            self.add(name)
+
+    @staticmethod
+    def _clean(name):
+        """
+        Check a subject name and return it without surrounding spaces.
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise ValueError("Subject name cannot be empty")
+        return name.strip()
+
+    def add(self, name):
+        """
+        Add a subject, or make a retired one active again.
+
+        Args:
+            name (str): The subject name
+
+        Returns:
+            int: The subject's id
+
+        Raises:
+            ValueError: If the name is empty
+        """
+        name = self._clean(name)
+        subject_id = self.ids.get(name)
+        if subject_id is None:
+            subject_id = len(self.names_by_id)
+            self.names_by_id.append(name)
+            self.ids[name] = subject_id
+            self.active[name] = subject_id
+        elif name not in self.active:
+            # Rebuild so the active subjects stay in id order (adding is rare)
+            self.active = {subject: number for number, subject in enumerate(self.names_by_id)
+                           if subject in self.active or number == subject_id}
+        return subject_id
+
+    def retire(self, name):
+        """
+        Stop accepting grades for a subject. Its id and existing grades are kept.
+
+        Args:
+            name (str): The subject name
+
+        Raises:
+            KeyError: If the subject is not active
+        """
+        del self.active[name]
+
+    def __contains__(self, name):
+        """
+        True if the subject is active (accepts new grades).
+        """
+        try:
+            return name in self.active
+        except TypeError:  # Unhashable values are never subjects
+            return False
+
+    def known(self, name):
+        """
+        True if the subject was ever added, even if it is retired now.
+        """
+        try:
+            return name in self.ids
+        except TypeError:
+            return False
+
+    def id_of(self, name):
+        """
+        The dense id of a subject (raises KeyError for an unknown subject).
+        """
+        return self.ids[name]
+
+    def name_of(self, subject_id):
+        """
+        The subject with this id.
+        """
+        return self.names_by_id[subject_id]
+
+    def shown_for(self, grades):
+        """
+        Subjects to list for one student: the active ones, plus retired ones
+        the student still has a grade in, in id order.
+
+        Args:
+            grades (dict): The student's grades
+
+        Returns:
+            list: Subject names
+        """
+        if len(self.active) == len(self.names_by_id):
+            return self.names_by_id  # Nothing retired (the usual case)
+        return [subject for subject in self.names_by_id
+                if subject in self.active or subject in grades]
+
+    @property
+    def size(self):
+        """
+        Number of ids handed out so far (the length array storage needs).
+        """
+        return len(self.names_by_id)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def __len__(self):
+        return len(self.active)
+
+    def __repr__(self):
+        return f"SubjectRegistry({list(self.active)})"